@@ -1,36 +1,85 @@
+import threading
 from flask import Flask, jsonify
-from dotenv import load_dotenv
-import os
 from flask_cors import CORS
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Import extensions and config
-from app.extensions import db, jwt, migrate
+# Import extensions and config (app.config also loads the .env file)
+from app.extensions import db, jwt, init_migrate
 from app.config import Config
 
-def create_app():
+def create_app(config_class=Config):
     """
     Factory function to create and configure the Flask application.
+    Pass a Config subclass to override settings (e.g. a separate database for benchmarks).
     """
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_class)
 
     # --- CORRECT CORS CONFIGURATION ---
     origins = [
         "http://localhost:3000",
         "http://127.0.0.1:3000",
     ]
-    CORS(app, resources={r"/api/*": {"origins": origins}}, supports_credentials=True)
+    CORS(
+        app,
+        resources={r"/api/*": {"origins": origins}},
+        supports_credentials=True,
+        # Let the browser read the pagination cursors and the read-your-writes pin
+        expose_headers=["Link", "X-Next-Cursor", "X-Prev-Cursor", "X-Page-Limit", app.config['REPLICA_PIN_HEADER']],
+    )
     # --- END OF CORS CONFIGURATION ---
 
     # Initialize extensions with the app
+    from app.utils.engine_profiles import configure_engine, init_engine_profile
+    from app.utils.replicas import configure_replicas, init_replicas
+    configure_engine(app)
+    configure_replicas(app)
     db.init_app(app)
+    init_engine_profile(app)
+    init_replicas(app)
     jwt.init_app(app)
-    migrate.init_app(app, db)
+    init_migrate(app)
+
+    from app.utils.query_counter import init_query_counter
+    init_query_counter(app)
+
+    from app.utils.metrics import init_metrics
+    init_metrics(app)
+
+    from app.utils.cache import init_response_cache, init_approval_cache
+    init_response_cache(app)
+    init_approval_cache(app)
+
+    from app.utils.facets import init_category_registry
+    init_category_registry(app)
+
+    from app.utils.password_hashing import init_password_hasher
+    init_password_hasher(app)
+
+    from app.utils.upload_queue import init_uploads
+    init_uploads(app)
+
+    from app.utils.sendgrid_helpers import init_email
+    init_email(app)
+
+    from app.commands import register_commands
+    register_commands(app)
+
+    if app.config.get('LAZY_BLUEPRINTS'):
+        _register_blueprints_on_first_request(app)
+    else:
+        register_blueprints(app)
 
-    # Register Blueprints
+    # --- HEALTH CHECK ENDPOINT ---
+    @app.route('/health', methods=['GET'])
+    def health_check():
+        return jsonify({"status": "ok", "message": "Service is healthy!"}), 200
+    # --- END OF HEALTH CHECK ENDPOINT ---
+
+    return app
+
+
+def register_blueprints(app):
+    """Imports the route modules (and the schemas they build) and registers their blueprints."""
     from app.routes.auth_routes import auth_bp
     from app.routes.user_routes import user_bp
     from app.routes.admin_routes import admin_bp
@@ -44,10 +93,45 @@ def create_app():
     app.register_blueprint(ngo_bp, url_prefix='/api/ngo')
     app.register_blueprint(donor_bp, url_prefix='/api/donors')
     app.register_blueprint(cause_bp, url_prefix='/api/causes') # 2. Register it
-    # --- HEALTH CHECK ENDPOINT ---
-    @app.route('/health', methods=['GET'])
-    def health_check():
-        return jsonify({"status": "ok", "message": "Service is healthy!"}), 200
-    # --- END OF HEALTH CHECK ENDPOINT ---
 
-    return app
+
+def _register_blueprints_on_first_request(app):
+    """
+    LAZY_BLUEPRINTS: defers importing the route modules until the first request, for
+    processes that may never serve one (queue workers, CLI commands). Note that
+    `flask routes` then only lists the routes registered by create_app itself.
+    """
+    wsgi_app = app.wsgi_app
+    lock = threading.Lock()
+
+    def load_then_dispatch(environ, start_response):
+        if app.wsgi_app is load_then_dispatch:
+            with lock:
+                if app.wsgi_app is load_then_dispatch:
+                    register_blueprints(app)
+                    app.wsgi_app = wsgi_app
+        return wsgi_app(environ, start_response)
+
+    app.wsgi_app = load_then_dispatch
+
+
+def warm_up(app):
+    """
+    Does the one-time work a process would otherwise pay on its first requests:
+    configures the ORM mappers and compiles the URL map. Call it before forking
+    workers (gunicorn preload_app) so they share the result copy-on-write.
+    """
+    from sqlalchemy.orm import configure_mappers
+
+    configure_mappers()
+    app.url_map.update()
+
+
+def after_fork(app):
+    """
+    Call in each worker forked from a preloaded app: drops the parent's pooled
+    database connections, which must never be shared between processes.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -0,0 +1,295 @@
+import csv
+import importlib
+import json
+import os
+import time
+import click
+from flask.cli import AppGroup
+from app.extensions import db
+
+class LazyCommand(click.Command):
+    """
+    Stands in for a command or group whose module is only imported when it is run
+    (or its own --help is shown), so loading the app for other commands stays cheap.
+    `load` is a callable returning the real command, or a 'module:attribute' path.
+    """
+    def __init__(self, name, load, help=None):
+        super().__init__(name, help=help)
+        self._load = load
+        self._command = None
+
+    def load(self):
+        if self._command is None:
+            if callable(self._load):
+                self._command = self._load()
+            else:
+                module, attribute = self._load.split(':')
+                self._command = getattr(importlib.import_module(module), attribute)
+        return self._command
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        # The context belongs to the real command, so click invokes that one
+        return self.load().make_context(info_name, args, parent=parent, **extra)
+
+
+stats_cli = AppGroup('stats', help='Maintain the admin dashboard counters and the cause rollups.')
+donations_cli = AppGroup('donations', help='Bulk donation maintenance.')
+search_cli = AppGroup('search', help='Maintain the cause full-text search index.')
+uploads_cli = AppGroup('uploads', help='Process and inspect the image upload queue.')
+emails_cli = AppGroup('emails', help='Send and inspect queued notification emails.')
+replicas_cli = AppGroup('replicas', help='Inspect read replicas and refresh local SQLite ones.')
+analytics_cli = AppGroup('analytics', help='Maintain the time-bucketed donation analytics.')
+
+
+@stats_cli.command('rebuild')
+@click.option('--dry-run', is_flag=True, help='Only report drift; do not write the recomputed values.')
+def rebuild_stats_command(dry_run):
+    """Recomputes the dashboard counters from scratch and reports any drift."""
+    from app.utils.stats_helpers import rebuild_stats
+
+    drift = rebuild_stats()
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+
+    if not drift:
+        click.echo('Dashboard stats are consistent.')
+        return
+    for name, (stored, actual) in sorted(drift.items()):
+        click.echo(f'{name}: stored={stored} actual={actual}')
+    click.echo('Drift found; ' + ('no changes written (dry run).' if dry_run else 'counters rebuilt.'))
+
+
+@stats_cli.command('rollups')
+def rebuild_rollups_command():
+    """Recomputes the per-cause daily rollups behind the NGO dashboard from the donations."""
+    from app.utils.rollup_helpers import rebuild_cause_rollups
+
+    counts = rebuild_cause_rollups()
+    db.session.commit()
+    click.echo(f"Rebuilt {counts['cause_daily_stats']} daily cause rows and {counts['cause_donors']} cause donors.")
+
+
+def _read_donation_rows(path):
+    """Yields donation dicts from a .csv, .ndjson/.jsonl or .json (list) file."""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8') as handle:
+        if extension == '.csv':
+            yield from csv.DictReader(handle)
+        elif extension in ('.ndjson', '.jsonl'):
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        elif extension == '.json':
+            data = json.load(handle)
+            yield from (data.get('donations', []) if isinstance(data, dict) else data)
+        else:
+            raise click.BadParameter('Use a .csv, .ndjson/.jsonl or .json file.', param_hint='FILE')
+
+
+@donations_cli.command('ingest')
+@click.argument('path', metavar='FILE', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=5000, show_default=True, help='Rows validated and committed together.')
+@click.option('--report', type=click.Path(dir_okay=False, writable=True),
+              help='Write the per-row results to this NDJSON file.')
+def ingest_donations_command(path, batch_size, report):
+    """Ingests donations (offline drives, gateway settlement files) from FILE in batches."""
+    from app.utils.donation_helpers import ingest_donations
+
+    report_file = open(report, 'w', encoding='utf-8') if report else None
+    accepted = rejected = 0
+    offset = 0
+
+    def flush(batch):
+        nonlocal accepted, rejected
+        results = ingest_donations(batch)
+        db.session.commit()
+        for result in results:
+            result['row'] += offset
+            if result['status'] == 'accepted':
+                accepted += 1
+            else:
+                rejected += 1
+            if report_file:
+                report_file.write(json.dumps(result) + '\n')
+
+    try:
+        batch = []
+        for row in _read_donation_rows(path):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                flush(batch)
+                offset += len(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        if report_file:
+            report_file.close()
+
+    click.echo(f'Ingested {path}: {accepted} accepted, {rejected} rejected.')
+
+
+@search_cli.command('rebuild')
+def rebuild_search():
+    """Rebuilds the cause search index from the donation_requests table."""
+    from app.utils.search import rebuild_search_index, SearchUnavailable
+
+    try:
+        indexed = rebuild_search_index()
+    except SearchUnavailable:
+        raise click.ClickException('Full-text search needs SQLite (FTS5) or Postgres.')
+    db.session.commit()
+    click.echo(f'Indexed {indexed} causes.')
+
+
+@uploads_cli.command('work')
+@click.option('--workers', default=2, show_default=True, help='Upload threads.')
+@click.option('--once', is_flag=True, help='Process the jobs that are due now, then exit.')
+def work_uploads(workers, once):
+    """Processes queued image uploads (for deployments that run with UPLOAD_WORKERS=0)."""
+    from flask import current_app
+    from app.utils.upload_queue import run_due_jobs, UploadWorkerPool
+
+    if once:
+        click.echo(f'Processed {run_due_jobs()} upload jobs.')
+        return
+    pool = UploadWorkerPool(current_app._get_current_object(), workers,
+                            current_app.config.get('UPLOAD_POLL_INTERVAL', 5))
+    pool.ensure_started()
+    click.echo(f'Processing uploads with {workers} workers; Ctrl+C to stop.')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        click.echo('Stopping after the current uploads...')
+        pool.stop()
+
+
+@uploads_cli.command('status')
+def uploads_status():
+    """Counts upload jobs by status and shows the oldest job still waiting."""
+    from sqlalchemy import func
+    from app.models.upload import UploadJob
+
+    counts = db.session.query(UploadJob.status, func.count()).group_by(UploadJob.status).all()
+    for status, count in sorted(counts):
+        click.echo(f'{status}: {count}')
+    oldest = db.session.query(func.min(UploadJob.created_at)).filter(UploadJob.status == 'Queued').scalar()
+    if oldest:
+        click.echo(f'Oldest queued job: {oldest.isoformat()}')
+
+
+@emails_cli.command('send')
+@click.option('--workers', default=1, show_default=True, help='Sender threads.')
+@click.option('--once', is_flag=True, help='Send the emails that are due now, then exit.')
+def send_emails(workers, once):
+    """Drains the email outbox (for deployments that run with EMAIL_SENDER_WORKERS=0)."""
+    from flask import current_app
+    from app.utils.sendgrid_helpers import send_all_due, EmailSenderPool
+
+    if once:
+        click.echo(f'Handled {send_all_due()} outbox emails.')
+        return
+    pool = EmailSenderPool(current_app._get_current_object(), workers,
+                           current_app.config.get('EMAIL_POLL_INTERVAL', 10))
+    pool.ensure_started()
+    click.echo(f'Sending emails with {workers} workers; Ctrl+C to stop.')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        click.echo('Stopping after the current batch...')
+        pool.stop()
+
+
+@emails_cli.command('status')
+def emails_status():
+    """Counts outbox emails by status and shows the oldest one still pending."""
+    from sqlalchemy import func
+    from app.models.outbox import OutboxEmail
+
+    counts = db.session.query(OutboxEmail.status, func.count()).group_by(OutboxEmail.status).all()
+    for status, count in sorted(counts):
+        click.echo(f'{status}: {count}')
+    oldest = db.session.query(func.min(OutboxEmail.created_at)).filter(OutboxEmail.status == 'Pending').scalar()
+    if oldest:
+        click.echo(f'Oldest pending email: {oldest.isoformat()}')
+
+
+@emails_cli.command('purge')
+@click.option('--days', default=30, show_default=True, help='Delete sent emails older than this.')
+def purge_emails(days):
+    """Deletes old sent emails from the outbox."""
+    from app.utils.sendgrid_helpers import purge_sent
+
+    deleted = purge_sent(days)
+    db.session.commit()
+    click.echo(f'Deleted {deleted} sent emails.')
+
+
+@replicas_cli.command('sync')
+def sync_replicas():
+    """Copies the primary SQLite database over each SQLite replica (local stand-in for replication)."""
+    from flask import current_app
+    from app.utils.replicas import sync_sqlite_replicas
+
+    try:
+        refreshed = sync_sqlite_replicas(current_app._get_current_object())
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    if not refreshed:
+        click.echo('No SQLite replicas configured (DATABASE_REPLICA_URLS).')
+    for path in refreshed:
+        click.echo(f'Refreshed {path}')
+
+
+@replicas_cli.command('status')
+def replicas_status():
+    """Shows how far each replica is behind the primary, by its newest donation."""
+    from sqlalchemy import func, select
+    from app.models.donation import Donation
+    from app.utils.replicas import replica_engines
+
+    newest = select(func.max(Donation.created_at), func.count(Donation.id))
+    primary_newest, primary_count = db.session.execute(newest).one()
+    click.echo(f'primary: {primary_count} donations, newest {primary_newest}')
+    for engine in replica_engines():
+        with engine.connect() as connection:
+            replica_newest, replica_count = connection.execute(newest).one()
+        click.echo(f'{engine.url.render_as_string(hide_password=True)}: {replica_count} donations '
+                   f'({primary_count - replica_count} behind), newest {replica_newest}')
+
+
+@analytics_cli.command('backfill')
+@click.option('--start', help='First day to recompute (YYYY-MM-DD); defaults to the first donation.')
+@click.option('--end', help='Last day to recompute (YYYY-MM-DD); defaults to the last donation.')
+def backfill_analytics_command(start, end):
+    """Recomputes the day/week/month donation buckets overlapping a date range from the donations."""
+    from app.utils.analytics_helpers import backfill_buckets, parse_day, AnalyticsError
+
+    try:
+        start, end = parse_day(start, 'start'), parse_day(end, 'end')
+    except AnalyticsError as e:
+        raise click.BadParameter(str(e))
+    started = time.perf_counter()
+    written = backfill_buckets(start, end)
+    db.session.commit()
+    span = f"{start or 'the beginning'} to {end or 'now'}"
+    click.echo(f'Backfilled {written} donation buckets from {span} in {time.perf_counter() - started:.1f}s.')
+
+
+def register_commands(app):
+    """
+    Attaches the maintenance CLI groups to the app
+    (`flask stats ...`, `flask donations ...`, `flask search ...`, `flask uploads ...`,
+    `flask emails ...`, `flask replicas ...`, `flask analytics ...`).
+    """
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(donations_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(uploads_cli)
+    app.cli.add_command(emails_cli)
+    app.cli.add_command(replicas_cli)
+    app.cli.add_command(analytics_cli)
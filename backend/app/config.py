@@ -1,12 +1,64 @@
 import os
 from dotenv import load_dotenv
 
+# A DATABASE_URL exported in the shell (as opposed to one only in .env) is always honored
+_ENV_DATABASE_URL = os.environ.get('DATABASE_URL')
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Get the base directory of the project
 basedir = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 
+# Named database engine profiles, selected with DB_ENGINE_PROFILE (by default from
+# the database URL). 'engine_options' become SQLALCHEMY_ENGINE_OPTIONS, 'pragmas'
+# run on every new SQLite connection, and the Postgres timeouts (milliseconds, 0 =
+# none) are set per session on connect.
+ENGINE_PROFILES = {
+    # Development/single-host SQLite. WAL lets readers run while a donation commits;
+    # synchronous=NORMAL is durable across application crashes (not power loss).
+    'sqlite-wal': {
+        'pragmas': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            'cache_size': -32000, # KiB, i.e. 32 MB per connection
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+        },
+    },
+    # SQLite as it was before profiles existed (rollback journal); kept for comparison
+    'sqlite-default': {},
+    # Web processes on Postgres: a bounded pool per process, dead connections
+    # detected before use, and runaway statements cut off.
+    'postgres-web': {
+        'engine_options': {
+            'pool_size': 10,
+            'max_overflow': 10,
+            'pool_timeout': 10,
+            'pool_recycle': 1800,
+            'pool_pre_ping': True,
+        },
+        'connect_timeout': 5,
+        'statement_timeout': 15000,
+        'lock_timeout': 5000,
+        'idle_in_transaction_session_timeout': 60000,
+    },
+    # CLI and batch jobs (seeding, backfills, exports): few connections, no statement limit
+    'postgres-batch': {
+        'engine_options': {
+            'pool_size': 2,
+            'max_overflow': 2,
+            'pool_recycle': 1800,
+            'pool_pre_ping': True,
+        },
+        'connect_timeout': 5,
+        'statement_timeout': 0,
+        'lock_timeout': 30000,
+        'idle_in_transaction_session_timeout': 600000,
+    },
+}
+
 class Config:
     """
     Base configuration class. Contains default configuration settings.
@@ -16,21 +68,147 @@ class Config:
     
     # --- THIS IS THE KEY CHANGE ---
     # Force SQLite for local development to avoid conflicts with local .env files.
-    # Use the production DATABASE_URL only when FLASK_ENV is 'production'.
-    if os.environ.get('FLASK_ENV') == 'production':
+    # Use the production DATABASE_URL only when FLASK_ENV is 'production', or when
+    # DATABASE_URL is set in the environment itself (e.g. to run `flask db upgrade`
+    # or a script against a scratch database instead of the checked-in app.db).
+    if os.environ.get('FLASK_ENV') == 'production' or _ENV_DATABASE_URL:
         SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     else:
         SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'app.db')
     # -----------------------------
         
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # One of ENGINE_PROFILES; empty picks 'sqlite-wal' or 'postgres-web' from the URL.
+    # The DB_* settings below override the chosen profile when set.
+    DB_ENGINE_PROFILE = os.environ.get('DB_ENGINE_PROFILE', '')
+    DB_POOL_SIZE = os.environ.get('DB_POOL_SIZE')
+    DB_MAX_OVERFLOW = os.environ.get('DB_MAX_OVERFLOW')
+    DB_POOL_RECYCLE = os.environ.get('DB_POOL_RECYCLE') # seconds
+    DB_STATEMENT_TIMEOUT = os.environ.get('DB_STATEMENT_TIMEOUT') # milliseconds (Postgres)
+
+    # Read replicas (comma-separated URLs). Views marked @use_replica read from one of
+    # them; writes always go to the primary. On views that opt in, a client that wrote
+    # in the last REPLICA_READ_YOUR_WRITES_SECONDS keeps reading from the primary.
+    # Locally, point these at SQLite files and refresh them with `flask replicas sync`.
+    SQLALCHEMY_REPLICA_URIS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+    REPLICA_READ_YOUR_WRITES_SECONDS = float(os.environ.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10))
+    REPLICA_PIN_COOKIE = os.environ.get('REPLICA_PIN_COOKIE', 'db_pin')
+    # The pin also travels in this header for cross-site clients, which send no cookies
+    REPLICA_PIN_HEADER = os.environ.get('REPLICA_PIN_HEADER', 'X-DB-Pin')
+
+    # Defer importing the route modules (and their schemas) until the first request.
+    # For processes that rarely or never serve HTTP, e.g. `flask emails send`.
+    LAZY_BLUEPRINTS = os.environ.get('LAZY_BLUEPRINTS', '').lower() in ('1', 'true', 'yes')
+
+    # Cursor pagination for list endpoints
+    PAGINATION_DEFAULT_LIMIT = int(os.environ.get('PAGINATION_DEFAULT_LIMIT', 20))
+    PAGINATION_MAX_LIMIT = int(os.environ.get('PAGINATION_MAX_LIMIT', 100))
+
+    # Per-endpoint latency/SQL/serialization metrics on /metrics (Prometheus text format)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    # Who may read /metrics: requests bearing METRICS_TOKEN ("Authorization: Bearer <token>")
+    # or coming from one of METRICS_ALLOWED_IPS (comma-separated; loopback by default).
+    # Behind a reverse proxy every request appears to come from the proxy, so set a token.
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    METRICS_ALLOWED_IPS = [ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()]
+
+    # Adds an X-Query-Count header to every response (for spotting N+1 queries)
+    QUERY_COUNTER_ENABLED = os.environ.get('QUERY_COUNTER_ENABLED', '').lower() in ('1', 'true', 'yes')
+
+    # In-process response cache for the public /api/causes endpoints
+    RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 512))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 30)) # seconds
+
+    # Per-worker cache of NGO approval flags checked by approved_ngo_required
+    NGO_APPROVAL_CACHE_MAX_ENTRIES = int(os.environ.get('NGO_APPROVAL_CACHE_MAX_ENTRIES', 4096))
+    NGO_APPROVAL_CACHE_TTL = int(os.environ.get('NGO_APPROVAL_CACHE_TTL', 60)) # seconds
+
+    # Serialize read-only list responses straight from column rows instead of marshmallow
+    FAST_SERIALIZER_ENABLED = os.environ.get('FAST_SERIALIZER_ENABLED', '').lower() in ('1', 'true', 'yes')
+
+    # Rows fetched per round trip by the streaming admin exports
+    EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 1000))
+
+    # Most time buckets (days, weeks or months) one admin analytics query may return
+    ANALYTICS_MAX_BUCKETS = int(os.environ.get('ANALYTICS_MAX_BUCKETS', 1000))
+
+    # Rows each dashboard counter and donation bucket is split across. Every write adds
+    # to a random one, so concurrent donations rarely queue on the same row lock; reads sum them.
+    COUNTER_SHARDS = int(os.environ.get('COUNTER_SHARDS', 8))
+
+    # Seconds before a worker reloads its in-memory category name -> id registry
+    CATEGORY_REGISTRY_TTL = int(os.environ.get('CATEGORY_REGISTRY_TTL', 300))
+
+    # Matches ranked per search query; broader queries rank only the newest this many (0 = rank all)
+    SEARCH_MAX_CANDIDATES = int(os.environ.get('SEARCH_MAX_CANDIDATES', 5000))
+
+    # Largest batch accepted by the bulk donation ingestion endpoint
+    BULK_INGEST_MAX_ROWS = int(os.environ.get('BULK_INGEST_MAX_ROWS', 10000))
+
+    # Password hashing cost profile (a werkzeug method string, e.g. 'pbkdf2:sha256:600000'
+    # or 'scrypt:32768:8:1'). Hashes made with any other profile are upgraded on next login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    # At most this many hashes run at once (default: one per core), each in the request's
+    # own thread; beyond PASSWORD_HASH_MAX_PENDING running or waiting, requests get 503.
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 64))
     
     # Cloudinary configuration (if you use it)
     CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME')
     CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY')
     CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET')
 
+    # Cause image uploads are queued (upload_jobs table + staged file) and pushed by
+    # background workers. UPLOAD_BACKEND is 'cloudinary' or 'local' (a directory
+    # served at LOCAL_UPLOAD_URL); it defaults to Cloudinary when it is configured.
+    UPLOAD_BACKEND = os.environ.get('UPLOAD_BACKEND') or ('cloudinary' if CLOUDINARY_CLOUD_NAME else 'local')
+    UPLOAD_STAGING_DIR = os.environ.get('UPLOAD_STAGING_DIR') or os.path.join(basedir, 'instance', 'upload_staging')
+    LOCAL_UPLOAD_DIR = os.environ.get('LOCAL_UPLOAD_DIR') or os.path.join(basedir, 'instance', 'uploads')
+    LOCAL_UPLOAD_URL = os.environ.get('LOCAL_UPLOAD_URL', '/uploads')
+    UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES', 5 * 1024 * 1024))
+    # Worker threads per process (0 = only `flask uploads work` processes the queue)
+    UPLOAD_WORKERS = int(os.environ.get('UPLOAD_WORKERS', 2))
+    UPLOAD_POLL_INTERVAL = float(os.environ.get('UPLOAD_POLL_INTERVAL', 5)) # seconds
+    UPLOAD_TIMEOUT = int(os.environ.get('UPLOAD_TIMEOUT', 60)) # seconds per upload attempt
+    # A job still Running this long after it was claimed is presumed orphaned and retried
+    UPLOAD_JOB_LEASE = int(os.environ.get('UPLOAD_JOB_LEASE', 300)) # seconds
+    # Failed attempts are retried after UPLOAD_RETRY_BACKOFF * 2^(attempt-1) seconds (jittered, capped)
+    UPLOAD_MAX_ATTEMPTS = int(os.environ.get('UPLOAD_MAX_ATTEMPTS', 5))
+    UPLOAD_RETRY_BACKOFF = float(os.environ.get('UPLOAD_RETRY_BACKOFF', 2))
+    UPLOAD_RETRY_BACKOFF_MAX = float(os.environ.get('UPLOAD_RETRY_BACKOFF_MAX', 300))
+
     # SendGrid configuration (if you use it)
     SENDGRID_API_KEY = os.environ.get('SENDGRID_API_KEY')
     SENDGRID_DEFAULT_FROM = os.environ.get('SENDGRID_DEFAULT_FROM')
 
+    # Notification emails (receipts, NGO decisions, funded causes) are written to the
+    # email_outbox table in the triggering transaction and sent by background senders.
+    # EMAIL_TRANSPORT is 'sendgrid', 'smtp' or 'file' (.eml files in EMAIL_FILE_DIR);
+    # it defaults to SendGrid when an API key is configured.
+    EMAIL_NOTIFICATIONS_ENABLED = os.environ.get('EMAIL_NOTIFICATIONS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    EMAIL_TRANSPORT = os.environ.get('EMAIL_TRANSPORT') or ('sendgrid' if SENDGRID_API_KEY else 'file')
+    EMAIL_FROM = os.environ.get('EMAIL_FROM') or SENDGRID_DEFAULT_FROM or 'no-reply@localhost'
+    EMAIL_FILE_DIR = os.environ.get('EMAIL_FILE_DIR') or os.path.join(basedir, 'instance', 'sent_emails')
+    SMTP_HOST = os.environ.get('SMTP_HOST', 'localhost')
+    SMTP_PORT = int(os.environ.get('SMTP_PORT', 25))
+    SMTP_USERNAME = os.environ.get('SMTP_USERNAME')
+    SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD')
+    SMTP_USE_TLS = os.environ.get('SMTP_USE_TLS', '').lower() in ('1', 'true', 'yes')
+    # Sender threads per process (0 = only `flask emails send` drains the outbox)
+    EMAIL_SENDER_WORKERS = int(os.environ.get('EMAIL_SENDER_WORKERS', 1))
+    EMAIL_POLL_INTERVAL = float(os.environ.get('EMAIL_POLL_INTERVAL', 10)) # seconds
+    EMAIL_BATCH_SIZE = int(os.environ.get('EMAIL_BATCH_SIZE', 100))
+    # New emails wait this long so a burst to one recipient is combined into one message
+    EMAIL_COALESCE_SECONDS = float(os.environ.get('EMAIL_COALESCE_SECONDS', 30))
+    # Sends per second per process (token bucket; 0 = unlimited)
+    EMAIL_RATE_LIMIT = float(os.environ.get('EMAIL_RATE_LIMIT', 10))
+    EMAIL_RATE_BURST = int(os.environ.get('EMAIL_RATE_BURST', 20))
+    EMAIL_SEND_TIMEOUT = int(os.environ.get('EMAIL_SEND_TIMEOUT', 10)) # seconds
+    EMAIL_LEASE = int(os.environ.get('EMAIL_LEASE', 300)) # seconds before a claimed batch is retried
+    # Failed sends are retried after EMAIL_RETRY_BACKOFF * 2^(attempt-1) seconds (jittered, capped)
+    EMAIL_MAX_ATTEMPTS = int(os.environ.get('EMAIL_MAX_ATTEMPTS', 8))
+    EMAIL_RETRY_BACKOFF = float(os.environ.get('EMAIL_RETRY_BACKOFF', 30))
+    EMAIL_RETRY_BACKOFF_MAX = float(os.environ.get('EMAIL_RETRY_BACKOFF_MAX', 3600))
+
@@ -1,8 +1,23 @@
 # backend/app/extensions.py
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
+from app.utils.replicas import RoutingSession
 
-db = SQLAlchemy()
+# RoutingSession sends the reads of @use_replica views to a read replica
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
-migrate = Migrate()
\ No newline at end of file
+
+
+def init_migrate(app):
+    """
+    Registers the `flask db` commands without importing Flask-Migrate (and Alembic,
+    the largest import in the app) in processes that never run a migration.
+    """
+    from app.commands import LazyCommand
+
+    def load():
+        from flask_migrate import Migrate
+        Migrate(app, db)
+        return app.cli.commands['db']
+
+    app.cli.add_command(LazyCommand('db', load, help='Perform database migrations.'))
\ No newline at end of file
@@ -5,4 +5,8 @@ from .ngo import NGOProfile
 from .donor import DonorProfile
 from .cause import Category 
 from .donation import Donation 
-
+from .stats import DashboardStat
+from .upload import UploadJob
+from .outbox import OutboxEmail
+from .cause_stats import CauseDailyStat, CauseDonor
+from .analytics import DonationBucket
@@ -0,0 +1,29 @@
+from app.extensions import db
+
+class DonationBucket(db.Model):
+    """
+    Donation volume and count for one time bucket (a UTC day, an ISO week starting
+    Monday, or a calendar month) and one (category, NGO) pair.
+
+    Every donation is added to its day, week and month buckets in the same
+    transaction that records it, so the admin analytics answer any date range from
+    a few bucket rows instead of grouping the donations table. Buckets follow each
+    cause's current category: editing it moves the cause's donations to the new
+    category's buckets, and deleting a cause takes its donations back out.
+
+    Like the dashboard counters, a bucket is split across up to COUNTER_SHARDS
+    rows that readers sum, so concurrent donations to the same day, category and
+    NGO don't all wait on one row. Backfills write everything to shard 0.
+    """
+    __tablename__ = 'donation_buckets'
+
+    granularity = db.Column(db.String(5), primary_key=True) # 'day', 'week', 'month'
+    bucket_start = db.Column(db.Date, primary_key=True)
+    category_id = db.Column(db.String(36), db.ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True)
+    ngo_id = db.Column(db.String(36), db.ForeignKey('ngo_profiles.id', ondelete='CASCADE'), primary_key=True)
+    shard = db.Column(db.Integer, primary_key=True, default=0, server_default='0')
+    total_donated = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    gift_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<DonationBucket {self.granularity} {self.bucket_start} {self.total_donated}>'
@@ -0,0 +1,37 @@
+from app.extensions import db
+
+class CauseDailyStat(db.Model):
+    """
+    One day of donations to one cause: the amount given, the number of gifts and
+    the number of donors giving to the cause for the first time that day.
+    Rows are upserted in the same transaction as the donations they count, so the
+    NGO dashboard reads one row per active day instead of every donation.
+    """
+    __tablename__ = 'cause_daily_stats'
+
+    donation_request_id = db.Column(db.String(36), db.ForeignKey('donation_requests.id', ondelete='CASCADE'),
+                                    primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    total_donated = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    gift_count = db.Column(db.Integer, nullable=False, default=0)
+    new_donor_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<CauseDailyStat {self.donation_request_id} {self.day} {self.total_donated}>'
+
+
+class CauseDonor(db.Model):
+    """
+    A donor who has given to a cause at least once. Inserting this row is how a
+    donation is known to come from a new donor, which keeps the unique donor
+    count exact without a COUNT(DISTINCT) over the cause's donations.
+    """
+    __tablename__ = 'cause_donors'
+
+    donation_request_id = db.Column(db.String(36), db.ForeignKey('donation_requests.id', ondelete='CASCADE'),
+                                    primary_key=True)
+    donor_id = db.Column(db.String(36), db.ForeignKey('donor_profiles.id', ondelete='CASCADE'), primary_key=True)
+    first_gift_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f'<CauseDonor {self.donor_id} -> {self.donation_request_id}>'
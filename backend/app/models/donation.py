@@ -7,6 +7,16 @@ class DonationRequest(db.Model):
     DonationRequest model representing a request for donations made by an NGO.
     """
     __tablename__ = 'donation_requests'
+    __table_args__ = (
+        # Public/donor listings: WHERE status = ? ORDER BY created_at, id
+        db.Index('ix_donation_requests_status_created_at', 'status', 'created_at', 'id'),
+        # Donor category filter: WHERE category_id = ? AND status = ? ORDER BY created_at, id
+        db.Index('ix_donation_requests_category_status_created_at', 'category_id', 'status', 'created_at', 'id'),
+        # NGO's own causes: WHERE ngo_id = ? ORDER BY created_at, id
+        db.Index('ix_donation_requests_ngo_created_at', 'ngo_id', 'created_at', 'id'),
+        # Admin listing of every request: ORDER BY created_at, id
+        db.Index('ix_donation_requests_created_at', 'created_at', 'id'),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     ngo_id = db.Column(db.String(36), db.ForeignKey('ngo_profiles.id'), nullable=False)
@@ -42,6 +52,16 @@ class Donation(db.Model):
     Donation model representing an individual donation transaction.
     """
     __tablename__ = 'donations'
+    __table_args__ = (
+        # Donor history: WHERE donor_id = ? ORDER BY created_at, id
+        db.Index('ix_donations_donor_created_at', 'donor_id', 'created_at', 'id'),
+        # Donations of a request (joins, cascades, per-cause totals)
+        db.Index('ix_donations_donation_request_id', 'donation_request_id'),
+        # Date-range exports and reports: WHERE created_at BETWEEN ? AND ? ORDER BY created_at, id
+        db.Index('ix_donations_created_at', 'created_at', 'id'),
+        # Gateway transaction ids are unique so settlement files can be re-ingested safely
+        db.Index('uq_donations_transaction_id', 'transaction_id', unique=True),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     donor_id = db.Column(db.String(36), db.ForeignKey('donor_profiles.id'), nullable=False)
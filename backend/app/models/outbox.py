@@ -0,0 +1,43 @@
+from datetime import datetime
+from app.extensions import db
+
+class OutboxEmail(db.Model):
+    """
+    A notification email waiting to be sent (transactional outbox). Rows are
+    inserted in the same transaction as the change that triggers them, so an
+    email is queued if and only if that change commits; the sender drains the
+    table in batches afterwards.
+
+    `kind` names the template ('donation_receipt', 'ngo_approved', 'ngo_rejected',
+    'cause_completed') and `object_id` the row it is about; the text is rendered
+    at send time. `context` holds whatever the template needs that may no longer
+    exist by then (e.g. the name of a rejected, deleted NGO).
+
+    Status goes 'Pending' -> 'Sending' -> 'Sent', or back to 'Pending' with a
+    later next_attempt_at after a failed send, until max attempts ends it as
+    'Failed'. A 'Sending' row whose lease (locked_until) ran out is claimed again.
+    """
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        # Sender's claim query: WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at
+        db.Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.String(40), nullable=False)
+    recipient = db.Column(db.String(120), nullable=False)
+    object_id = db.Column(db.String(36), nullable=True)
+    context = db.Column(db.JSON, nullable=True)
+
+    status = db.Column(db.String(20), nullable=False, default='Pending') # 'Pending', 'Sending', 'Sent', 'Failed'
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    claim_token = db.Column(db.String(36), nullable=True) # Identifies the sender batch holding the row
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<OutboxEmail {self.id} {self.kind} {self.status}>'
@@ -0,0 +1,23 @@
+from datetime import datetime
+from app.extensions import db
+
+class DashboardStat(db.Model):
+    """
+    A named running total shown on the admin dashboard (e.g. total_ngos).
+    Rows are adjusted in the same transaction as the change they count,
+    so reading the dashboard never has to scan users or donations.
+
+    Each total is split across up to COUNTER_SHARDS rows (one per shard) and
+    is the sum of them; writers pick a shard at random so they seldom wait on
+    one another's row lock.
+    """
+    __tablename__ = 'dashboard_stats'
+
+    name = db.Column(db.String(50), primary_key=True)
+    shard = db.Column(db.Integer, primary_key=True, default=0, server_default='0')
+    value = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<DashboardStat {self.name}[{self.shard}]={self.value}>'
@@ -0,0 +1,41 @@
+import uuid
+from datetime import datetime
+from app.extensions import db
+
+class UploadJob(db.Model):
+    """
+    A queued image upload for a donation request. The request thread only stages
+    the file on local disk and inserts this row; upload workers claim due jobs,
+    push the file to the configured uploader and set DonationRequest.image_url.
+
+    Status goes 'Queued' -> 'Running' -> 'Succeeded', or back to 'Queued' with a
+    later next_attempt_at after a failure, until max_attempts ends it as 'Failed'.
+    A 'Running' job whose lease (locked_until) ran out belonged to a worker that
+    died, and is claimed again.
+    """
+    __tablename__ = 'upload_jobs'
+    __table_args__ = (
+        # Workers' claim query: WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at
+        db.Index('ix_upload_jobs_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    donation_request_id = db.Column(db.String(36), db.ForeignKey('donation_requests.id', ondelete='CASCADE'),
+                                    nullable=False, index=True)
+
+    status = db.Column(db.String(20), nullable=False, default='Queued') # 'Queued', 'Running', 'Succeeded', 'Failed'
+    staged_path = db.Column(db.String(500), nullable=False) # Local copy of the file until it is uploaded
+    filename = db.Column(db.String(255), nullable=True) # Name the client sent
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_until = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    result_url = db.Column(db.String(255), nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<UploadJob {self.id} {self.status}>'
@@ -1,18 +1,22 @@
 import uuid
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from app.extensions import db
+from app.utils.password_hashing import get_password_hasher
 
 class User(db.Model):
     """
     User model representing all users (Admin, NGO, Donor) in the system.
     """
     __tablename__ = 'users'
+    __table_args__ = (
+        # Admin NGO queue and stats: WHERE role = ? AND is_approved = ? ORDER BY created_at, id
+        db.Index('ix_users_role_approved_created_at', 'role', 'is_approved', 'created_at', 'id'),
+    )
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False) # scrypt/sha512 hashes exceed 128 chars
     role = db.Column(db.String(20), nullable=False, default='Donor') # 'Admin', 'NGO', 'Donor'
     is_approved = db.Column(db.Boolean, default=True) # For NGO approval by Admin
     two_fa_secret = db.Column(db.String(32), nullable=True) # For 2-Step Authentication
@@ -27,12 +31,16 @@ class User(db.Model):
     donor_profile = db.relationship('DonorProfile', backref='user', uselist=False, lazy=True, cascade="all, delete-orphan")
 
     def set_password(self, password):
-        """Hashes the password and stores it."""
-        self.password_hash = generate_password_hash(password)
+        """Hashes the password with the configured cost profile and stores it."""
+        self.password_hash = get_password_hasher().hash(password)
 
     def check_password(self, password):
         """Checks if the provided password matches the hashed password."""
-        return check_password_hash(self.password_hash, password)
+        return get_password_hasher().verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        """True if the stored hash predates the configured PASSWORD_HASH_METHOD."""
+        return get_password_hasher().needs_rehash(self.password_hash)
 
     def __repr__(self):
         return f'<User {self.username} ({self.role})>'
\ No newline at end of file
@@ -1,14 +1,31 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
 from app.extensions import db
 from app.models.user import User
+from app.models.ngo import NGOProfile
+from app.models.donor import DonorProfile
 from app.models.cause import Category
 from app.models.donation import DonationRequest, Donation
 from app.schemas.cause_schema import CategorySchema
-from app.schemas.donation_schema import DonationRequestSchema
+from app.schemas.donation_schema import DonationRequestSchema, DonationTimeSeriesSchema
+from app.schemas.fast_serializers import RowSerializer
 from app.utils.decorators import admin_required
-from datetime import datetime
-from sqlalchemy import func
+from app.utils.pagination import keyset_paginate, paginated_response
+from app.utils.query_shaping import shape_query
+from app.utils.cache import get_response_cache, invalidate_cause, invalidate_all_causes, invalidate_responses, get_approval_cache, invalidate_ngo_approval
+from app.utils.search import remove_causes
+from app.utils.upload_queue import cancel_uploads
+from app.utils.sendgrid_helpers import queue_email
+from app.utils.facets import invalidate_category_registry
+from app.utils.donation_helpers import ingest_donations, remove_cause_donations
+from app.utils.export_helpers import export_response, parse_date_bound, ExportError
+from app.utils.analytics_helpers import donation_time_series, parse_day, AnalyticsError
+from app.utils.rollup_helpers import remove_cause_rollups
+from app.utils.replicas import use_replica
+from app.utils.stats_helpers import bump_stat, get_stats, TOTAL_NGOS, PENDING_APPROVALS, TOTAL_DONATIONS
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 
 admin_bp = Blueprint('admin_bp', __name__, url_prefix='/api/admin')
 
@@ -16,58 +33,122 @@ category_schema = CategorySchema()
 categories_schema = CategorySchema(many=True)
 donation_request_schema = DonationRequestSchema()
 donation_requests_schema = DonationRequestSchema(many=True)
+fast_donation_requests = RowSerializer(donation_requests_schema, DonationRequest)
+donation_time_series_schema = DonationTimeSeriesSchema()
 
 @admin_bp.route('/stats', methods=['GET'])
 @jwt_required()
 @admin_required
+@use_replica(read_your_writes=True)
 def get_dashboard_stats():
     try:
-        total_ngos = User.query.filter_by(role='NGO').count()
-        pending_approvals = User.query.filter_by(role='NGO', is_approved=False).count()
-        total_donations = db.session.query(func.sum(Donation.amount_donated)).scalar() or 0
-
+        # Counters are maintained incrementally, so this is a constant-time read
+        values = get_stats()
         stats = {
-            "totalNgos": total_ngos,
-            "pendingApprovals": pending_approvals,
-            "totalDonations": float(total_donations)
+            "totalNgos": int(values[TOTAL_NGOS]),
+            "pendingApprovals": int(values[PENDING_APPROVALS]),
+            "totalDonations": float(values[TOTAL_DONATIONS])
         }
         return jsonify(stats), 200
     except Exception as e:
         return jsonify({"message": "Failed to retrieve stats", "error": str(e)}), 500
 
+@admin_bp.route('/analytics/donations', methods=['GET'])
+@jwt_required()
+@admin_required
+@use_replica()
+def get_donation_analytics():
+    """
+    Donation volume and count over time, from the pre-aggregated donation buckets.
+    Query args: start/end (YYYY-MM-DD, inclusive, UTC; default the last 30 days),
+    granularity=day|week|month, group_by=category,ngo (either or both),
+    category_id and ngo_id filters.
+    """
+    try:
+        end = parse_day(request.args.get('end'), 'end') or datetime.utcnow().date()
+        start = parse_day(request.args.get('start'), 'start') or end - timedelta(days=29)
+        group_by = [key for key in request.args.get('group_by', '').split(',') if key]
+        series = donation_time_series(
+            start, end, request.args.get('granularity', 'day'), group_by,
+            category_id=request.args.get('category_id'), ngo_id=request.args.get('ngo_id'),
+            max_buckets=current_app.config['ANALYTICS_MAX_BUCKETS'])
+    except AnalyticsError as e:
+        return jsonify({"message": str(e)}), 400
+    return jsonify(donation_time_series_schema.dump(series)), 200
+
 @admin_bp.route('/ngos/pending', methods=['GET'])
 @jwt_required()
 @admin_required
+@use_replica(read_your_writes=True)
 def get_pending_ngos():
-    pending_ngos = User.query.filter_by(role='NGO', is_approved=False).all()
+    query = User.query.filter_by(role='NGO', is_approved=False)
+    page = keyset_paginate(query, (User.created_at, User.id))
     output = []
-    for ngo in pending_ngos:
+    for ngo in page.items:
         output.append({
             'id': ngo.id,
             'name': ngo.username,
             'email': ngo.email,
             'date_joined': ngo.created_at.strftime('%Y-%m-%d')
         })
-    return jsonify(output), 200
+    return paginated_response(output, page), 200
 
 @admin_bp.route('/ngos/<string:ngo_id>/approve', methods=['POST'])
 @jwt_required()
 @admin_required
 def approve_ngo(ngo_id):
+    # Only the request whose UPDATE flips the flag counts the approval and sends the
+    # notice, so concurrent approvals cannot decrement pending_approvals twice
+    approved = db.session.execute(
+        update(User)
+        .where(User.id == ngo_id, User.role == 'NGO', User.is_approved.is_(False))
+        .values(is_approved=True, updated_at=datetime.utcnow())
+        .returning(User.email, User.username)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if approved:
+        bump_stat(PENDING_APPROVALS, -1)
+        queue_email('ngo_approved', approved.email, ngo_id, {'name': approved.username})
+        invalidate_ngo_approval(ngo_id)
+        db.session.commit()
+        return jsonify({"message": f"NGO {approved.username} has been approved."}), 200
     ngo = User.query.get(ngo_id)
     if not ngo or ngo.role != 'NGO':
         return jsonify({"message": "NGO not found"}), 404
-    ngo.is_approved = True
-    db.session.commit()
     return jsonify({"message": f"NGO {ngo.username} has been approved."}), 200
 
 @admin_bp.route('/ngos/<string:ngo_id>/reject', methods=['POST'])
 @jwt_required()
 @admin_required
 def reject_ngo(ngo_id):
-    ngo = User.query.get(ngo_id)
-    if not ngo or ngo.role != 'NGO':
+    # A no-op UPDATE locks the row and reads its approval state in one statement; a
+    # concurrent rejection waits on the lock and then finds the row gone
+    was_approved = db.session.execute(
+        update(User)
+        .where(User.id == ngo_id, User.role == 'NGO')
+        .values(is_approved=User.is_approved)
+        .returning(User.is_approved)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if was_approved is None:
         return jsonify({"message": "NGO not found"}), 404
+    ngo = User.query.get(ngo_id)
+    bump_stat(TOTAL_NGOS, -1)
+    if not was_approved.is_approved:
+        bump_stat(PENDING_APPROVALS, -1)
+    # Deleting the NGO cascades to its causes
+    invalidate_all_causes()
+    invalidate_ngo_approval(ngo.id)
+    if ngo.ngo_profile:
+        cause_ids = db.session.scalars(
+            select(DonationRequest.id).where(DonationRequest.ngo_id == ngo.ngo_profile.id)).all()
+        remove_cause_donations(cause_ids)
+        remove_causes(ngo_id=ngo.ngo_profile.id)
+        cancel_uploads(ngo_id=ngo.ngo_profile.id)
+        # Rollup rows reference the causes, but SQLite does not enforce ON DELETE CASCADE
+        remove_cause_rollups(cause_ids)
+    # The address is copied into the outbox row, so the notice survives the delete
+    queue_email('ngo_rejected', ngo.email, ngo.id, {'name': ngo.username})
     db.session.delete(ngo)
     db.session.commit()
     return jsonify({"message": f"NGO {ngo.username} has been rejected and removed."}), 200
@@ -75,9 +156,15 @@ def reject_ngo(ngo_id):
 @admin_bp.route('/donation-requests', methods=['GET'])
 @jwt_required()
 @admin_required
+@use_replica(read_your_writes=True)
 def get_all_donation_requests():
-    donation_requests = DonationRequest.query.order_by(DonationRequest.created_at.desc()).all()
-    return jsonify(donation_requests_schema.dump(donation_requests)), 200
+    if current_app.config['FAST_SERIALIZER_ENABLED']:
+        page = keyset_paginate(fast_donation_requests.query(), (DonationRequest.created_at, DonationRequest.id))
+        return paginated_response(fast_donation_requests.dump(page.items), page), 200
+
+    query = shape_query(DonationRequest.query, DonationRequest, donation_requests_schema)
+    page = keyset_paginate(query, (DonationRequest.created_at, DonationRequest.id))
+    return paginated_response(donation_requests_schema.dump(page.items), page), 200
 
 @admin_bp.route('/donation-requests/<string:request_id>/approve', methods=['POST'])
 @jwt_required()
@@ -91,6 +178,7 @@ def approve_donation_request(request_id):
         return jsonify({"message": f"Request is already '{donation_request.status}'."}), 400
 
     donation_request.status = 'Approved'
+    invalidate_cause(donation_request.id)
     db.session.commit()
     return jsonify({"message": "Donation request approved successfully"}), 200
 
@@ -106,6 +194,7 @@ def reject_donation_request(request_id):
         return jsonify({"message": f"Request is already '{donation_request.status}'."}), 400
 
     donation_request.status = 'Rejected'
+    invalidate_cause(donation_request.id)
     db.session.commit()
     return jsonify({"message": "Donation request rejected successfully"}), 200
 
@@ -117,12 +206,152 @@ def create_category():
     validated_data = category_schema.load(data)
     new_category = Category(**validated_data)
     db.session.add(new_category)
+    invalidate_responses('categories')
+    # Facet counts list every category
+    invalidate_responses('causes')
+    invalidate_category_registry()
     db.session.commit()
     return jsonify(category_schema.dump(new_category)), 201
 
 @admin_bp.route('/categories', methods=['GET'])
 @jwt_required()
 @admin_required
+@use_replica(read_your_writes=True)
 def get_categories():
     categories = Category.query.all()
     return jsonify(categories_schema.dump(categories)), 200
+
+@admin_bp.route('/cache/stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_cache_stats():
+    """
+    Returns hit/miss counters for this worker's public response cache, for sizing it,
+    plus the NGO approval cache under "ngoApprovals".
+    """
+    cache = get_response_cache()
+    stats = dict(cache.stats(), enabled=True) if cache is not None else {"enabled": False}
+    stats["ngoApprovals"] = get_approval_cache().stats()
+    return jsonify(stats), 200
+
+def _export_filters(created_at_column, status_column):
+    """Builds the WHERE clauses shared by the export endpoints from start/end/status query args."""
+    filters = []
+    start = parse_date_bound(request.args.get('start'))
+    end = parse_date_bound(request.args.get('end'), end=True)
+    if start:
+        filters.append(created_at_column >= start)
+    if end:
+        filters.append(created_at_column < end)
+    statuses = [s for s in request.args.get('status', '').split(',') if s]
+    if statuses:
+        filters.append(status_column.in_(statuses))
+    return filters
+
+@admin_bp.route('/export/donations', methods=['GET'])
+@jwt_required()
+@admin_required
+@use_replica()
+def export_donations():
+    """
+    Streams every donation with its donor, cause, NGO and category names as CSV or NDJSON.
+    Query args: format=csv|ndjson, start/end (dates, inclusive), status (cause status, comma-separated).
+    """
+    try:
+        filters = _export_filters(Donation.created_at, DonationRequest.status)
+        stmt = (
+            select(
+                Donation.id.label('donation_id'),
+                Donation.created_at.label('donated_at'),
+                Donation.amount_donated,
+                Donation.transaction_id,
+                DonorProfile.id.label('donor_id'),
+                DonorProfile.first_name.label('donor_first_name'),
+                DonorProfile.last_name.label('donor_last_name'),
+                DonationRequest.id.label('donation_request_id'),
+                DonationRequest.title.label('donation_request_title'),
+                DonationRequest.status.label('donation_request_status'),
+                NGOProfile.organization_name.label('ngo_name'),
+                Category.name.label('category_name'),
+            )
+            .select_from(Donation)
+            .join(DonorProfile, Donation.donor_id == DonorProfile.id)
+            .join(DonationRequest, Donation.donation_request_id == DonationRequest.id)
+            .join(NGOProfile, DonationRequest.ngo_id == NGOProfile.id)
+            .join(Category, DonationRequest.category_id == Category.id)
+            .where(*filters)
+            .order_by(Donation.created_at, Donation.id)
+        )
+        return export_response(stmt, request.args.get('format', 'csv'), 'donations')
+    except ExportError as e:
+        return jsonify({"message": str(e)}), 400
+
+@admin_bp.route('/export/donation-requests', methods=['GET'])
+@jwt_required()
+@admin_required
+@use_replica()
+def export_donation_requests():
+    """
+    Streams every donation request with its NGO and category names as CSV or NDJSON.
+    Query args: format=csv|ndjson, start/end (creation dates, inclusive), status (comma-separated).
+    """
+    try:
+        filters = _export_filters(DonationRequest.created_at, DonationRequest.status)
+        stmt = (
+            select(
+                DonationRequest.id.label('donation_request_id'),
+                DonationRequest.title,
+                DonationRequest.status,
+                DonationRequest.amount_needed,
+                DonationRequest.amount_received,
+                DonationRequest.created_at,
+                DonationRequest.approval_date,
+                NGOProfile.id.label('ngo_id'),
+                NGOProfile.organization_name.label('ngo_name'),
+                Category.name.label('category_name'),
+            )
+            .select_from(DonationRequest)
+            .join(NGOProfile, DonationRequest.ngo_id == NGOProfile.id)
+            .join(Category, DonationRequest.category_id == Category.id)
+            .where(*filters)
+            .order_by(DonationRequest.created_at, DonationRequest.id)
+        )
+        return export_response(stmt, request.args.get('format', 'csv'), 'donation_requests')
+    except ExportError as e:
+        return jsonify({"message": str(e)}), 400
+
+@admin_bp.route('/donations/bulk', methods=['POST'])
+@jwt_required()
+@admin_required
+def bulk_ingest_donations():
+    """
+    Records a batch of donations from an offline drive or a gateway settlement file.
+    Body: {"donations": [{"donor_id", "donation_request_id", "amount_donated", "transaction_id", "created_at"?}, ...]}
+    Returns a per-row report; rows with an already-recorded transaction_id are rejected.
+    """
+    data = request.get_json(silent=True)
+    rows = data.get('donations') if isinstance(data, dict) else data
+    if not isinstance(rows, list) or not rows:
+        return jsonify({"message": "Provide a non-empty 'donations' list"}), 400
+    max_rows = current_app.config['BULK_INGEST_MAX_ROWS']
+    if len(rows) > max_rows:
+        return jsonify({"message": f"Too many rows; send at most {max_rows} per request"}), 413
+
+    try:
+        results = ingest_donations(rows)
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent batch recorded one of these transaction ids first
+        db.session.rollback()
+        return jsonify({"message": "Duplicate transaction_id recorded concurrently; retry the batch"}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": "An error occurred during bulk ingestion", "error": str(e)}), 500
+
+    accepted = [r for r in results if r['status'] == 'accepted']
+    summary = {
+        "received": len(results),
+        "accepted": len(accepted),
+        "rejected": len(results) - len(accepted),
+    }
+    return jsonify({"summary": summary, "results": results}), 200
@@ -4,6 +4,8 @@ from app.models.donor import DonorProfile
 from app.models.ngo import NGOProfile
 from app.extensions import db
 from flask_jwt_extended import create_access_token
+from app.utils.stats_helpers import bump_stat, TOTAL_NGOS, PENDING_APPROVALS
+from app.utils.identity import identity_claims
 
 auth_bp = Blueprint('auth_bp', __name__, url_prefix='/api/auth')
 
@@ -53,6 +55,8 @@ def register():
                 address=""              # Provide empty string
             )
             db.session.add(ngo_profile)
+            bump_stat(TOTAL_NGOS, 1)
+            bump_stat(PENDING_APPROVALS, 1)
         
         db.session.commit()
         return jsonify({"message": "User registered successfully"}), 201
@@ -74,10 +78,13 @@ def login():
         if user.role == 'NGO' and not user.is_approved:
             return jsonify({"message": "Your NGO account is pending admin approval."}), 403
 
-        additional_claims = {
-            "role": user.role,
-            "username": user.username 
-        }
+        # Transparently upgrade hashes made with an older cost profile
+        if user.password_needs_rehash():
+            user.set_password(password)
+            db.session.commit()
+
+        # role and profile_id let routes skip the per-request profile lookup
+        additional_claims = identity_claims(user)
         access_token = create_access_token(
             identity={"id": user.id}, 
             additional_claims=additional_claims
@@ -1,8 +1,16 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app, request
+from sqlalchemy import false
 from app.models.donation import DonationRequest
 from app.models.cause import Category
 from app.schemas.donation_schema import DonationRequestSchema
 from app.schemas.cause_schema import CategorySchema
+from app.schemas.fast_serializers import RowSerializer
+from app.utils.pagination import keyset_paginate, paginated_response
+from app.utils.query_shaping import shape_query
+from app.utils.cache import cached_response
+from app.utils.replicas import use_replica
+from app.utils.search import search_subquery, SearchUnavailable
+from app.utils.facets import cause_filter_args, approved_cause_filters, cause_facets
 
 cause_bp = Blueprint('cause_bp', __name__, url_prefix='/api/causes')
 
@@ -10,28 +18,115 @@ cause_bp = Blueprint('cause_bp', __name__, url_prefix='/api/causes')
 donation_request_schema = DonationRequestSchema()
 donation_requests_schema = DonationRequestSchema(many=True)
 categories_schema = CategorySchema(many=True)
+fast_donation_requests = RowSerializer(donation_requests_schema, DonationRequest)
+fast_categories = RowSerializer(categories_schema, Category)
 
 @cause_bp.route('/approved', methods=['GET'])
+@cached_response('causes')
+@use_replica()
 def get_approved_donation_requests():
     """
-    Returns a list of all approved donation requests. Publicly accessible.
+    Returns a page of approved donation requests, newest first. Publicly accessible.
+    Takes optional ?category=<name> and ?funding=<bucket> filters (see /facets).
+    Use the cursor from the X-Next-Cursor/X-Prev-Cursor headers to page through the rest.
     """
-    approved_requests = DonationRequest.query.filter_by(status='Approved').all()
-    return jsonify(donation_requests_schema.dump(approved_requests)), 200
+    selection, error = cause_filter_args()
+    if error:
+        return error
+    filters = approved_cause_filters(*selection)
+
+    if current_app.config['FAST_SERIALIZER_ENABLED']:
+        query = fast_donation_requests.query().filter(*filters)
+        page = keyset_paginate(query, (DonationRequest.created_at, DonationRequest.id))
+        return paginated_response(fast_donation_requests.dump(page.items), page), 200
+
+    query = shape_query(DonationRequest.query.filter(*filters), DonationRequest, donation_requests_schema)
+    page = keyset_paginate(query, (DonationRequest.created_at, DonationRequest.id))
+    return paginated_response(donation_requests_schema.dump(page.items), page), 200
+
+@cause_bp.route('/search', methods=['GET'])
+@cached_response('causes')
+@use_replica()
+def search_approved_donation_requests():
+    """
+    Full-text search over approved causes (title, description and NGO name), best match first.
+    Takes ?q=<terms> and the optional ?category=<name> and ?funding=<bucket> filters;
+    paged with cursors like the other lists.
+    """
+    terms = request.args.get('q', '').strip()
+    if not terms:
+        return jsonify({"message": "Missing search query 'q'"}), 400
+    selection, error = cause_filter_args()
+    if error:
+        return error
+    filters = approved_cause_filters(*selection)
+    try:
+        search = search_subquery(terms, current_app.config['SEARCH_MAX_CANDIDATES'], filters)
+    except SearchUnavailable:
+        return jsonify({"message": "Search is not available on this database"}), 501
+    if search is None:
+        return jsonify([]), 200
+
+    sort_columns = (search.c.search_score, DonationRequest.id)
+
+    if current_app.config['FAST_SERIALIZER_ENABLED']:
+        query = fast_donation_requests.query().join(search, search.c.request_id == DonationRequest.id) \
+            .add_columns(search.c.search_score).filter(*filters)
+        page = keyset_paginate(query, sort_columns, key=lambda row: [row.search_score, row.id])
+        return paginated_response(fast_donation_requests.dump(page.items), page), 200
+
+    query = shape_query(DonationRequest.query, DonationRequest, donation_requests_schema) \
+        .join(search, search.c.request_id == DonationRequest.id).add_columns(search.c.search_score).filter(*filters)
+    page = keyset_paginate(query, sort_columns, key=lambda row: [row.search_score, row.DonationRequest.id])
+    return paginated_response(donation_requests_schema.dump([row.DonationRequest for row in page.items]), page), 200
+
+@cause_bp.route('/facets', methods=['GET'])
+@cached_response('causes')
+@use_replica()
+def get_cause_facets():
+    """
+    Returns approved-cause counts per category and per funding bucket for the current
+    ?category=, ?funding= and optional ?q= search filters, from one grouped query.
+    Each facet's counts ignore its own selection, so they show what picking a value would return.
+    """
+    selection, error = cause_filter_args()
+    if error:
+        return error
+    query = DonationRequest.query.filter(DonationRequest.status == 'Approved')
+
+    terms = request.args.get('q', '').strip()
+    if terms:
+        try:
+            # Counting matches needs no ranking, so every match is counted, whatever the facets select
+            search = search_subquery(terms, ranked=False)
+        except SearchUnavailable:
+            return jsonify({"message": "Search is not available on this database"}), 501
+        # Terms without any words match nothing, as in /search
+        query = query.join(search, search.c.request_id == DonationRequest.id) if search is not None else query.filter(false())
+
+    return jsonify(cause_facets(query, *selection)), 200
 
 @cause_bp.route('/categories', methods=['GET'])
+@cached_response('categories')
+@use_replica()
 def get_all_categories():
     """
     Returns a list of all categories. Publicly accessible.
     """
+    if current_app.config['FAST_SERIALIZER_ENABLED']:
+        return jsonify(fast_categories.dump(fast_categories.query().all())), 200
+
     categories = Category.query.all()
     return jsonify(categories_schema.dump(categories)), 200
 
 # --- NEW ROUTE TO GET A SINGLE CAUSE ---
 @cause_bp.route('/<string:request_id>', methods=['GET'])
+@cached_response('cause', key_arg='request_id')
+@use_replica(read_your_writes=True)
 def get_single_approved_request(request_id):
     """
     Returns the details of a single approved donation request. Publicly accessible.
     """
-    donation_request = DonationRequest.query.filter_by(id=request_id, status='Approved').first_or_404()
+    query = shape_query(DonationRequest.query, DonationRequest, donation_request_schema)
+    donation_request = query.filter_by(id=request_id, status='Approved').first_or_404()
     return jsonify(donation_request_schema.dump(donation_request)), 200
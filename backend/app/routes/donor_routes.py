@@ -1,11 +1,17 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
 from app.extensions import db
-from app.models.donor import DonorProfile
 from app.models.donation import DonationRequest, Donation
-from app.models.cause import Category
-from app.schemas.donation_schema import DonationRequestSchema, DonationSchema
+from app.schemas.donation_schema import DonationRequestSchema, DonationSchema, GivingSummarySchema
+from app.schemas.fast_serializers import RowSerializer
 from app.utils.decorators import donor_required
+from app.utils.pagination import keyset_paginate, paginated_response
+from app.utils.query_shaping import shape_query
+from app.utils.donation_helpers import record_donation, DonationRejected
+from app.utils.giving_helpers import donor_giving_summary
+from app.utils.identity import current_identity
+from app.utils.facets import cause_filter_args, approved_cause_filters
+from app.utils.replicas import use_replica
 from decimal import Decimal
 
 donor_bp = Blueprint('donor_bp', __name__, url_prefix='/api/donors')
@@ -15,36 +21,43 @@ donation_request_schema = DonationRequestSchema()
 donation_requests_schema = DonationRequestSchema(many=True)
 donation_schema = DonationSchema()
 donations_schema = DonationSchema(many=True)
+giving_summary_schema = GivingSummarySchema()
+fast_donation_requests = RowSerializer(donation_requests_schema, DonationRequest)
+fast_donations = RowSerializer(donations_schema, Donation)
 
 @donor_bp.route('/approved-requests', methods=['GET'])
 @jwt_required()
 @donor_required
+@use_replica()
 def get_approved_donation_requests():
     """
     Retrieves a list of all approved donation requests.
-    Supports filtering by category name.
+    Supports filtering by category name and funding bucket (see /api/causes/facets).
     """
-    category_name = request.args.get('category')
-    query = DonationRequest.query.filter_by(status='Approved')
+    selection, error = cause_filter_args()
+    if error:
+        return error
+    filters = approved_cause_filters(*selection)
 
-    if category_name:
-        category = Category.query.filter_by(name=category_name).first()
-        if category:
-            query = query.filter_by(category_id=category.id)
-        else:
-            return jsonify({"message": "Category not found"}), 404
+    if current_app.config['FAST_SERIALIZER_ENABLED']:
+        query = fast_donation_requests.query().filter(*filters)
+        page = keyset_paginate(query, (DonationRequest.created_at, DonationRequest.id))
+        return paginated_response(fast_donation_requests.dump(page.items), page), 200
 
-    donation_requests = query.all()
-    return jsonify(donation_requests_schema.dump(donation_requests)), 200
+    query = shape_query(DonationRequest.query, DonationRequest, donation_requests_schema).filter(*filters)
+    page = keyset_paginate(query, (DonationRequest.created_at, DonationRequest.id))
+    return paginated_response(donation_requests_schema.dump(page.items), page), 200
 
 @donor_bp.route('/approved-requests/<request_id>', methods=['GET'])
 @jwt_required()
 @donor_required
+@use_replica(read_your_writes=True)
 def get_single_approved_donation_request(request_id):
     """
     Retrieves details of a single approved donation request.
     """
-    donation_request = DonationRequest.query.filter_by(id=request_id, status='Approved').first()
+    query = shape_query(DonationRequest.query, DonationRequest, donation_request_schema)
+    donation_request = query.filter_by(id=request_id, status='Approved').first()
     if not donation_request:
         return jsonify({"message": "Approved donation request not found"}), 404
     return jsonify(donation_request_schema.dump(donation_request)), 200
@@ -56,45 +69,29 @@ def make_donation(request_id):
     """
     Allows a donor to make a donation to an approved request.
     """
-    claims = get_jwt()
-    user_id = claims.get('sub', {}).get('id')
-
-    donor_profile = DonorProfile.query.filter_by(user_id=user_id).first()
-    if not donor_profile:
+    donor_profile_id = current_identity().profile_id
+    if not donor_profile_id:
         return jsonify({"message": "Donor profile not found. Please complete your donor profile first."}), 404
 
-    donation_request = DonationRequest.query.filter_by(id=request_id, status='Approved').first()
-    if not donation_request:
-        return jsonify({"message": "Donation request not found or not approved"}), 404
-
     data = request.get_json()
     if not data:
         return jsonify({"message": "Invalid JSON"}), 400
 
     try:
-        amount_donated = Decimal(data.get('amount_donated'))
+        amount_donated = Decimal(str(data.get('amount_donated'))).quantize(Decimal('0.01'))
         if amount_donated <= 0:
             return jsonify({"message": "Amount donated must be a positive number"}), 400
-        if amount_donated > (donation_request.amount_needed - donation_request.amount_received):
-            return jsonify({"message": "Donation amount exceeds remaining amount needed"}), 400
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, ArithmeticError):
         return jsonify({"message": "Invalid amount_donated format"}), 400
 
-    new_donation = Donation(
-        donor_id=donor_profile.id,
-        donation_request_id=donation_request.id,
-        amount_donated=amount_donated
-    )
-
-    donation_request.amount_received += amount_donated
-
-    if donation_request.amount_received >= donation_request.amount_needed:
-        donation_request.status = 'Completed'
-
     try:
-        db.session.add(new_donation)
+        # The remaining-amount check, increment and completion happen in one UPDATE
+        new_donation = record_donation(donor_profile_id, request_id, amount_donated)
         db.session.commit()
         return jsonify({"message": "Donation successful", "donation": donation_schema.dump(new_donation)}), 201
+    except DonationRejected as e:
+        db.session.rollback()
+        return jsonify({"message": e.message}), e.status_code
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": "An error occurred during donation", "error": str(e)}), 500
@@ -102,16 +99,41 @@ def make_donation(request_id):
 @donor_bp.route('/my-donations', methods=['GET'])
 @jwt_required()
 @donor_required
+@use_replica(read_your_writes=True)
 def get_my_donations():
     """
-    Retrieves the donation history for the authenticated donor.
+    Retrieves a page of the donation history for the authenticated donor, newest first.
+    Pass ?cause_id= to list only the gifts to one cause (see /my-donations/summary).
     """
-    claims = get_jwt()
-    user_id = claims.get('sub', {}).get('id')
+    donor_profile_id = current_identity().profile_id
+    if not donor_profile_id:
+        return jsonify({"message": "Donor profile not found."}), 404
 
-    donor_profile = DonorProfile.query.filter_by(user_id=user_id).first()
-    if not donor_profile:
+    filters = [Donation.donor_id == donor_profile_id]
+    cause_id = request.args.get('cause_id')
+    if cause_id:
+        filters.append(Donation.donation_request_id == cause_id)
+
+    if current_app.config['FAST_SERIALIZER_ENABLED']:
+        query = fast_donations.query().filter(*filters)
+        page = keyset_paginate(query, (Donation.created_at, Donation.id))
+        return paginated_response(fast_donations.dump(page.items), page), 200
+
+    query = shape_query(Donation.query, Donation, donations_schema).filter(*filters)
+    page = keyset_paginate(query, (Donation.created_at, Donation.id))
+    return paginated_response(donations_schema.dump(page.items), page), 200
+
+@donor_bp.route('/my-donations/summary', methods=['GET'])
+@jwt_required()
+@donor_required
+@use_replica(read_your_writes=True)
+def get_my_giving_summary():
+    """
+    Retrieves the authenticated donor's giving totals per cause (total given, gift
+    count, last gift date) and per calendar year, from one grouped query.
+    """
+    donor_profile_id = current_identity().profile_id
+    if not donor_profile_id:
         return jsonify({"message": "Donor profile not found."}), 404
 
-    donations = Donation.query.filter_by(donor_id=donor_profile.id).all()
-    return jsonify(donations_schema.dump(donations)), 200
+    return jsonify(giving_summary_schema.dump(donor_giving_summary(donor_profile_id))), 200
@@ -1,11 +1,23 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt
+from flask import Blueprint, request, jsonify, current_app, url_for
+from flask_jwt_extended import jwt_required
 from app.extensions import db
-from app.models.ngo import NGOProfile
 from app.models.cause import Category
 from app.models.donation import DonationRequest
-from app.schemas.donation_schema import DonationRequestSchema
+from app.models.upload import UploadJob
+from app.schemas.donation_schema import DonationRequestSchema, NGODashboardSchema
+from app.schemas.fast_serializers import RowSerializer
+from app.schemas.upload_schema import UploadJobSchema
 from app.utils.decorators import approved_ngo_required
+from app.utils.pagination import keyset_paginate, paginated_response
+from app.utils.query_shaping import shape_query
+from app.utils.cache import invalidate_cause
+from app.utils.donation_helpers import remove_cause_donations
+from app.utils.analytics_helpers import move_cause_buckets
+from app.utils.identity import current_identity
+from app.utils.replicas import use_replica
+from app.utils.rollup_helpers import ngo_cause_performance, remove_cause_rollups
+from app.utils.search import index_causes, remove_causes
+from app.utils.upload_queue import enqueue_image_upload, cancel_uploads, remove_staged, UploadRejected
 from decimal import Decimal
 from marshmallow import ValidationError
 
@@ -14,15 +26,16 @@ ngo_bp = Blueprint('ngo_bp', __name__, url_prefix='/api/ngo')
 # Initialize Marshmallow schemas
 donation_request_schema = DonationRequestSchema()
 donation_requests_schema = DonationRequestSchema(many=True)
+fast_donation_requests = RowSerializer(donation_requests_schema, DonationRequest)
+upload_job_schema = UploadJobSchema()
+ngo_dashboard_schema = NGODashboardSchema()
 
 @ngo_bp.route('/causes', methods=['POST'])
 @jwt_required()
 @approved_ngo_required
 def create_donation_request():
-    claims = get_jwt()
-    user_id = claims.get('sub', {}).get('id')
-    ngo_profile = NGOProfile.query.filter_by(user_id=user_id).first()
-    if not ngo_profile:
+    ngo_profile_id = current_identity().profile_id
+    if not ngo_profile_id:
         return jsonify({"message": "NGO profile not found."}), 404
 
     data = request.get_json()
@@ -31,13 +44,15 @@ def create_donation_request():
         validated_data = donation_request_schema.load(data)
         
         new_request = DonationRequest(
-            ngo_id=ngo_profile.id,
+            ngo_id=ngo_profile_id,
             category_id=validated_data['category_id'],
             title=validated_data['title'],
             description=validated_data['description'],
             amount_needed=Decimal(validated_data['amount_needed'])
         )
         db.session.add(new_request)
+        db.session.flush()
+        index_causes([new_request.id])
         db.session.commit()
         return jsonify(donation_request_schema.dump(new_request)), 201
     except ValidationError as err:
@@ -49,27 +64,49 @@ def create_donation_request():
 @ngo_bp.route('/causes', methods=['GET'])
 @jwt_required()
 @approved_ngo_required
+@use_replica(read_your_writes=True)
 def get_my_donation_requests():
-    claims = get_jwt()
-    user_id = claims.get('sub', {}).get('id')
-    ngo_profile = NGOProfile.query.filter_by(user_id=user_id).first()
-    if not ngo_profile:
+    ngo_profile_id = current_identity().profile_id
+    if not ngo_profile_id:
         return jsonify({"message": "NGO profile not found."}), 404
 
-    donation_requests = DonationRequest.query.filter_by(ngo_id=ngo_profile.id).all()
-    return jsonify(donation_requests_schema.dump(donation_requests)), 200
+    if current_app.config['FAST_SERIALIZER_ENABLED']:
+        query = fast_donation_requests.query().filter(DonationRequest.ngo_id == ngo_profile_id)
+        page = keyset_paginate(query, (DonationRequest.created_at, DonationRequest.id))
+        return paginated_response(fast_donation_requests.dump(page.items), page), 200
+
+    query = shape_query(DonationRequest.query, DonationRequest, donation_requests_schema).filter_by(ngo_id=ngo_profile_id)
+    page = keyset_paginate(query, (DonationRequest.created_at, DonationRequest.id))
+    return paginated_response(donation_requests_schema.dump(page.items), page), 200
+
+@ngo_bp.route('/dashboard', methods=['GET'])
+@jwt_required()
+@approved_ngo_required
+@use_replica()
+def get_cause_dashboard():
+    """
+    Per-cause donation totals, unique donors and average gift, plus a daily
+    funding curve, read from the cause rollups rather than the donations.
+    Pass ?cause_id= for one cause.
+    """
+    ngo_profile_id = current_identity().profile_id
+    if not ngo_profile_id:
+        return jsonify({"message": "NGO profile not found."}), 404
+
+    dashboard = ngo_cause_performance(ngo_profile_id, request.args.get('cause_id'))
+    if request.args.get('cause_id') and not dashboard['causes']:
+        return jsonify({"message": "Donation request not found or you do not have permission to view it."}), 404
+    return jsonify(ngo_dashboard_schema.dump(dashboard)), 200
 
 @ngo_bp.route('/causes/<string:request_id>', methods=['PUT'])
 @jwt_required()
 @approved_ngo_required
 def update_donation_request(request_id):
-    claims = get_jwt()
-    user_id = claims.get('sub', {}).get('id')
-    ngo_profile = NGOProfile.query.filter_by(user_id=user_id).first()
-    if not ngo_profile:
+    ngo_profile_id = current_identity().profile_id
+    if not ngo_profile_id:
         return jsonify({"message": "NGO profile not found."}), 404
 
-    donation_request = DonationRequest.query.filter_by(id=request_id, ngo_id=ngo_profile.id).first()
+    donation_request = DonationRequest.query.filter_by(id=request_id, ngo_id=ngo_profile_id).first()
     if not donation_request:
         return jsonify({"message": "Donation request not found or you do not have permission to edit it."}), 404
 
@@ -78,7 +115,13 @@ def update_donation_request(request_id):
     donation_request.description = data.get('description', donation_request.description)
     if 'amount_needed' in data:
         donation_request.amount_needed = Decimal(data.get('amount_needed'))
+    old_category_id = donation_request.category_id
     donation_request.category_id = data.get('category_id', donation_request.category_id)
+    if donation_request.category_id != old_category_id:
+        db.session.flush()
+        move_cause_buckets(donation_request.id, old_category_id)
+    index_causes([donation_request.id])
+    invalidate_cause(donation_request.id)
     
     db.session.commit()
     return jsonify(donation_request_schema.dump(donation_request)), 200
@@ -87,16 +130,60 @@ def update_donation_request(request_id):
 @jwt_required()
 @approved_ngo_required
 def delete_donation_request(request_id):
-    claims = get_jwt()
-    user_id = claims.get('sub', {}).get('id')
-    ngo_profile = NGOProfile.query.filter_by(user_id=user_id).first()
-    if not ngo_profile:
+    ngo_profile_id = current_identity().profile_id
+    if not ngo_profile_id:
         return jsonify({"message": "NGO profile not found."}), 404
 
-    donation_request = DonationRequest.query.filter_by(id=request_id, ngo_id=ngo_profile.id).first()
+    donation_request = DonationRequest.query.filter_by(id=request_id, ngo_id=ngo_profile_id).first()
     if not donation_request:
         return jsonify({"message": "Donation request not found or you do not have permission to delete it."}), 404
 
+    invalidate_cause(donation_request.id)
+    remove_causes([donation_request.id])
+    cancel_uploads([donation_request.id])
+    remove_cause_donations([donation_request.id])
+    remove_cause_rollups([donation_request.id])
     db.session.delete(donation_request)
     db.session.commit()
     return jsonify({"message": "Donation request deleted successfully."}), 200
+
+@ngo_bp.route('/causes/<string:request_id>/image', methods=['POST'])
+@jwt_required()
+@approved_ngo_required
+def upload_donation_request_image(request_id):
+    """
+    Queues an image (multipart field 'image') for one of the NGO's causes and returns
+    202 at once; image_url is set when the upload job completes. Poll the job at the
+    URL in the Location header.
+    """
+    ngo_profile_id = current_identity().profile_id
+    if not ngo_profile_id:
+        return jsonify({"message": "NGO profile not found."}), 404
+
+    exists = db.session.query(DonationRequest.id).filter_by(id=request_id, ngo_id=ngo_profile_id).first()
+    if not exists:
+        return jsonify({"message": "Donation request not found or you do not have permission to edit it."}), 404
+
+    try:
+        job = enqueue_image_upload(request_id, request.files.get('image'))
+    except UploadRejected as e:
+        return jsonify({"message": e.message}), e.status
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        remove_staged(job.staged_path)
+        raise
+    return jsonify(upload_job_schema.dump(job)), 202, {'Location': url_for('ngo_bp.get_upload_job', job_id=job.id)}
+
+@ngo_bp.route('/uploads/<string:job_id>', methods=['GET'])
+@jwt_required()
+@approved_ngo_required
+def get_upload_job(job_id):
+    """Returns the status of one of the NGO's image upload jobs."""
+    ngo_profile_id = current_identity().profile_id
+    job = UploadJob.query.join(DonationRequest, DonationRequest.id == UploadJob.donation_request_id) \
+        .filter(UploadJob.id == job_id, DonationRequest.ngo_id == ngo_profile_id).first()
+    if not job:
+        return jsonify({"message": "Upload job not found."}), 404
+    return jsonify(upload_job_schema.dump(job)), 200
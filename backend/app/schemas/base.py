@@ -0,0 +1,9 @@
+from marshmallow import Schema
+from app.utils.metrics import serialization_timer
+
+
+class BaseSchema(Schema):
+    """Base for the app's schemas: dump() time is reported as request serialization time."""
+    def dump(self, obj, *, many=None):
+        with serialization_timer():
+            return super().dump(obj, many=many)
@@ -1,6 +1,7 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import fields, validate
+from app.schemas.base import BaseSchema
 
-class CategorySchema(Schema):
+class CategorySchema(BaseSchema):
     """Schema for serializing/deserializing Category model data."""
     id = fields.String(dump_only=True) # Read-only for existing categories
     name = fields.String(required=True, validate=validate.Length(min=3, max=100))
@@ -1,9 +1,10 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import fields, validate
+from app.schemas.base import BaseSchema
 from app.schemas.user_schema import NGOProfileSchema
 from app.schemas.cause_schema import CategorySchema
 from decimal import Decimal
 
-class DonationRequestSummarySchema(Schema):
+class DonationRequestSummarySchema(BaseSchema):
     """A simplified schema for nesting inside other schemas."""
     id = fields.String(dump_only=True)
     title = fields.String(dump_only=True)
@@ -12,7 +13,7 @@ class DonationRequestSummarySchema(Schema):
     class Meta:
         fields = ("id", "title", "ngo")
 
-class DonationSchema(Schema):
+class DonationSchema(BaseSchema):
     """Schema for serializing individual Donation model data."""
     id = fields.String(dump_only=True)
     amount_donated = fields.Float(dump_only=True)
@@ -22,7 +23,7 @@ class DonationSchema(Schema):
     class Meta:
         fields = ("id", "amount_donated", "created_at", "donation_request")
 
-class DonationRequestSchema(Schema):
+class DonationRequestSchema(BaseSchema):
     """Full schema for validating and serializing DonationRequest model data."""
     id = fields.String(dump_only=True)
     ngo_id = fields.String(required=True, load_only=True)
@@ -45,3 +46,83 @@ class DonationRequestSchema(Schema):
     ngo = fields.Nested(NGOProfileSchema, dump_only=True)
     category = fields.Nested(CategorySchema, dump_only=True)
 
+
+
+class CauseGivingSchema(BaseSchema):
+    """A donor's giving to one cause (see utils.giving_helpers.donor_giving_summary)."""
+    cause_id = fields.String(dump_only=True)
+    title = fields.String(dump_only=True)
+    status = fields.String(dump_only=True)
+    organization_name = fields.String(dump_only=True)
+    total_given = fields.Float(dump_only=True)
+    gift_count = fields.Integer(dump_only=True)
+    last_gift_at = fields.DateTime(dump_only=True)
+
+
+class YearGivingSchema(BaseSchema):
+    """A donor's giving in one calendar year."""
+    year = fields.Integer(dump_only=True)
+    total_given = fields.Float(dump_only=True)
+    gift_count = fields.Integer(dump_only=True)
+    cause_count = fields.Integer(dump_only=True)
+
+
+class GivingSummarySchema(BaseSchema):
+    """A donor's giving totals, per cause and per year."""
+    total_given = fields.Float(dump_only=True)
+    gift_count = fields.Integer(dump_only=True)
+    causes = fields.List(fields.Nested(CauseGivingSchema), dump_only=True)
+    years = fields.List(fields.Nested(YearGivingSchema), dump_only=True)
+
+
+class CausePerformanceSchema(BaseSchema):
+    """One cause on the NGO dashboard (see utils.rollup_helpers.ngo_cause_performance)."""
+    cause_id = fields.String(dump_only=True)
+    title = fields.String(dump_only=True)
+    status = fields.String(dump_only=True)
+    amount_needed = fields.Float(dump_only=True)
+    amount_received = fields.Float(dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+    total_donated = fields.Float(dump_only=True)
+    gift_count = fields.Integer(dump_only=True)
+    donor_count = fields.Integer(dump_only=True)
+    average_gift = fields.Float(dump_only=True)
+    first_gift_day = fields.Date(dump_only=True, allow_none=True)
+    last_gift_day = fields.Date(dump_only=True, allow_none=True)
+
+
+class FundingPointSchema(BaseSchema):
+    """One day of the NGO dashboard's funding curve."""
+    day = fields.Date(dump_only=True)
+    total_donated = fields.Float(dump_only=True)
+    gift_count = fields.Integer(dump_only=True)
+    new_donor_count = fields.Integer(dump_only=True)
+    cumulative_donated = fields.Float(dump_only=True)
+
+
+class NGODashboardSchema(BaseSchema):
+    """The NGO cause performance dashboard."""
+    causes = fields.List(fields.Nested(CausePerformanceSchema), dump_only=True)
+    funding = fields.List(fields.Nested(FundingPointSchema), dump_only=True)
+
+
+class DonationBucketSchema(BaseSchema):
+    """One point of the admin donation time series; the group fields appear only when grouped by them."""
+    bucket = fields.Date(dump_only=True)
+    category_id = fields.String(dump_only=True)
+    category_name = fields.String(dump_only=True, allow_none=True)
+    ngo_id = fields.String(dump_only=True)
+    organization_name = fields.String(dump_only=True, allow_none=True)
+    total_donated = fields.Float(dump_only=True)
+    gift_count = fields.Integer(dump_only=True)
+
+
+class DonationTimeSeriesSchema(BaseSchema):
+    """The admin donation analytics (see utils.analytics_helpers.donation_time_series)."""
+    granularity = fields.String(dump_only=True)
+    start = fields.Date(dump_only=True)
+    end = fields.Date(dump_only=True)
+    group_by = fields.List(fields.String(), dump_only=True)
+    total_donated = fields.Float(dump_only=True)
+    gift_count = fields.Integer(dump_only=True)
+    series = fields.List(fields.Nested(DonationBucketSchema), dump_only=True)
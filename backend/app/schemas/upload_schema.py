@@ -0,0 +1,16 @@
+from marshmallow import fields
+from app.schemas.base import BaseSchema
+
+class UploadJobSchema(BaseSchema):
+    """Schema for serializing UploadJob status (read-only)."""
+    id = fields.String(dump_only=True)
+    donation_request_id = fields.String(dump_only=True)
+    status = fields.String(dump_only=True)
+    filename = fields.String(dump_only=True)
+    attempts = fields.Integer(dump_only=True)
+    max_attempts = fields.Integer(dump_only=True)
+    next_attempt_at = fields.DateTime(dump_only=True)
+    last_error = fields.String(dump_only=True)
+    image_url = fields.String(attribute='result_url', dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+    finished_at = fields.DateTime(dump_only=True)
@@ -1,6 +1,7 @@
-from marshmallow import Schema, fields, validate
+from marshmallow import fields, validate
+from app.schemas.base import BaseSchema
 
-class UserSchema(Schema):
+class UserSchema(BaseSchema):
     """Schema for serializing User model data."""
     id = fields.String(dump_only=True)
     username = fields.String(required=True, validate=validate.Length(min=3, max=80))
@@ -10,7 +11,7 @@ class UserSchema(Schema):
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
-class NGOProfileSchema(Schema):
+class NGOProfileSchema(BaseSchema):
     """Schema for serializing/deserializing NGOProfile model data."""
     id = fields.String(dump_only=True)
     user_id = fields.String(dump_only=True) # User ID is derived from auth
@@ -24,7 +25,7 @@ class NGOProfileSchema(Schema):
     created_at = fields.DateTime(dump_only=True)
     updated_at = fields.DateTime(dump_only=True)
 
-class DonorProfileSchema(Schema):
+class DonorProfileSchema(BaseSchema):
     """Schema for serializing/deserializing DonorProfile model data."""
     id = fields.String(dump_only=True)
     user_id = fields.String(dump_only=True) # User ID is derived from auth
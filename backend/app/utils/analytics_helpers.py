@@ -0,0 +1,299 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from sqlalchemy import select, insert, delete, func, literal, and_, or_, tuple_
+from app.extensions import db
+from app.models.analytics import DonationBucket
+from app.models.cause import Category
+from app.models.donation import DonationRequest, Donation
+from app.models.ngo import NGOProfile
+from app.utils.rollup_helpers import upsert_insert
+from app.utils.stats_helpers import pick_shard
+
+GRANULARITIES = ('day', 'week', 'month')
+GROUP_BY_COLUMNS = {'category': DonationBucket.category_id, 'ngo': DonationBucket.ngo_id}
+
+_IN_CHUNK = 500
+
+
+class AnalyticsError(ValueError):
+    """Raised for invalid analytics parameters (dates, granularity, grouping)."""
+
+
+def period_start(granularity, day):
+    """The first day of the bucket holding `day`: itself, its ISO week's Monday, or the 1st of its month."""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_period(granularity, start):
+    """The first day of the bucket after the one starting on `start`."""
+    if granularity == 'week':
+        return start + timedelta(days=7)
+    if granularity == 'month':
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+# --- Upkeep ---
+
+def _cause_keys(request_ids):
+    """{request id: (category_id, ngo_id)} for the given causes."""
+    causes = {}
+    request_ids = list(request_ids)
+    for i in range(0, len(request_ids), _IN_CHUNK):
+        stmt = select(DonationRequest.id, DonationRequest.category_id, DonationRequest.ngo_id) \
+            .where(DonationRequest.id.in_(request_ids[i:i + _IN_CHUNK]))
+        causes.update((request_id, (category_id, ngo_id)) for request_id, category_id, ngo_id in db.session.execute(stmt))
+    return causes
+
+
+def _bucket_totals(donations, causes, sign=1):
+    """Sums donations into {(granularity, bucket_start, category_id, ngo_id): [total, gifts]}."""
+    buckets = {}
+    for donation in donations:
+        category_id, ngo_id = causes[donation['donation_request_id']]
+        day = donation['created_at'].date()
+        for granularity in GRANULARITIES:
+            bucket = buckets.setdefault((granularity, period_start(granularity, day), category_id, ngo_id),
+                                        [Decimal('0'), 0])
+            bucket[0] += sign * Decimal(str(donation['amount_donated']))
+            bucket[1] += sign
+    return buckets
+
+
+def record_in_buckets(donations):
+    """
+    Adds newly recorded donations to their day, week and month buckets inside the
+    current transaction, with one upsert per touched bucket (into one random shard
+    of each). `donations` is a list of dicts with the inserted Donation column values.
+    """
+    causes = _cause_keys({d['donation_request_id'] for d in donations})
+    _apply_to_buckets(_bucket_totals(donations, causes))
+
+
+def remove_from_buckets(donations, causes=None):
+    """
+    Takes deleted donations back out of their buckets inside the current
+    transaction and drops the buckets left empty (every shard of them), so the
+    summed buckets stay what backfill_buckets() would write. `causes` overrides
+    the (category_id, ngo_id) looked up per request id; it must be given once the
+    causes are gone.
+    """
+    causes = causes or _cause_keys({d['donation_request_id'] for d in donations})
+    buckets = _bucket_totals(donations, causes, sign=-1)
+    _apply_to_buckets(buckets)
+    keys = list(buckets)
+    key_columns = (DonationBucket.granularity, DonationBucket.bucket_start, DonationBucket.category_id,
+                   DonationBucket.ngo_id)
+    for i in range(0, len(keys), _IN_CHUNK):
+        # The subtraction landed on one shard, so emptiness is judged on the shards' sum
+        empty = select(*key_columns).where(tuple_(*key_columns).in_(keys[i:i + _IN_CHUNK])) \
+            .group_by(*key_columns).having(func.sum(DonationBucket.gift_count) <= 0)
+        db.session.execute(delete(DonationBucket).where(tuple_(*key_columns).in_(empty)))
+
+
+def move_cause_buckets(request_id, old_category_id):
+    """
+    Moves a cause's donations from its old category's buckets to its current
+    one's after the category was edited; the buckets follow the cause's current
+    category, like a backfill would. Call after flushing the new category_id.
+    """
+    donations = [dict(row._mapping) for row in db.session.execute(
+        select(Donation.donation_request_id, Donation.amount_donated, Donation.created_at)
+        .where(Donation.donation_request_id == request_id))]
+    if not donations:
+        return
+    causes = _cause_keys([request_id])
+    remove_from_buckets(donations, {request_id: (old_category_id, causes[request_id][1])})
+    _apply_to_buckets(_bucket_totals(donations, causes))
+
+
+def _apply_to_buckets(buckets):
+    """
+    Adds each bucket's [total, gifts] delta with one upsert per bucket. The whole
+    batch goes to one random shard, so two writers only contend on a bucket row
+    when they also picked the same shard.
+    """
+    if not buckets:
+        return
+    shard = pick_shard()
+    stmt = upsert_insert(DonationBucket)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['granularity', 'bucket_start', 'category_id', 'ngo_id', 'shard'],
+        set_={
+            'total_donated': DonationBucket.total_donated + stmt.excluded.total_donated,
+            'gift_count': DonationBucket.gift_count + stmt.excluded.gift_count,
+        },
+    )
+    db.session.execute(stmt, [
+        {'granularity': granularity, 'bucket_start': start, 'category_id': category_id, 'ngo_id': ngo_id,
+         'shard': shard, 'total_donated': total, 'gift_count': gifts}
+        for (granularity, start, category_id, ngo_id), (total, gifts) in buckets.items()
+    ])
+
+
+def _bucket_expression(granularity, column):
+    """SQL for the first day of `column`'s bucket, matching period_start()."""
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return func.date(column) if granularity == 'day' else func.date(func.date_trunc(granularity, column))
+    if granularity == 'week':
+        return func.date(column, 'weekday 0', '-6 days')
+    if granularity == 'month':
+        return func.date(column, 'start of month')
+    return func.date(column)
+
+
+def backfill_buckets(start=None, end=None):
+    """
+    Recomputes every bucket overlapping the days [start, end] (both optional,
+    inclusive) from the donations table, one INSERT ... SELECT per granularity.
+    Buckets at the edges are recomputed whole. Returns the bucket rows written.
+    The caller commits.
+    """
+    written = 0
+    for granularity in GRANULARITIES:
+        bucket_filters = [DonationBucket.granularity == granularity]
+        donation_filters = []
+        if start:
+            first = period_start(granularity, start)
+            bucket_filters.append(DonationBucket.bucket_start >= first)
+            donation_filters.append(Donation.created_at >= datetime.combine(first, time.min))
+        if end:
+            after = next_period(granularity, period_start(granularity, end))
+            bucket_filters.append(DonationBucket.bucket_start < after)
+            donation_filters.append(Donation.created_at < datetime.combine(after, time.min))
+        db.session.execute(delete(DonationBucket).where(*bucket_filters))
+
+        bucket = _bucket_expression(granularity, Donation.created_at)
+        rows = (
+            select(literal(granularity), bucket, DonationRequest.category_id, DonationRequest.ngo_id,
+                   func.sum(Donation.amount_donated), func.count())
+            .join(DonationRequest, DonationRequest.id == Donation.donation_request_id)
+            .where(*donation_filters)
+            .group_by(bucket, DonationRequest.category_id, DonationRequest.ngo_id)
+        )
+        result = db.session.execute(insert(DonationBucket).from_select(
+            ['granularity', 'bucket_start', 'category_id', 'ngo_id', 'total_donated', 'gift_count'], rows))
+        written += max(result.rowcount, 0)
+    return written
+
+
+# --- Queries ---
+
+def parse_day(value, name):
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise AnalyticsError(f"Invalid {name} '{value}'. Use YYYY-MM-DD.")
+
+
+def _sources(granularity, periods, start, end):
+    """
+    Splits the requested range into bucket ranges to read: the stored buckets of
+    `granularity` for periods inside [start, end], and day buckets for the parts of
+    the first and last periods that the range only partly covers.
+    """
+    full, days = [], []
+    for period in periods:
+        last_day = next_period(granularity, period) - timedelta(days=1)
+        if granularity == 'day' or (period >= start and last_day <= end):
+            full.append(period)
+        else:
+            days.append((max(period, start), min(last_day, end)))
+    sources = []
+    if full:
+        sources.append((granularity, full[0], full[-1]))
+    sources.extend(('day', first, last) for first, last in days)
+    return sources
+
+
+def _names(model, column, ids):
+    names = {}
+    ids = list(ids)
+    for i in range(0, len(ids), _IN_CHUNK):
+        names.update(db.session.execute(select(model.id, column).where(model.id.in_(ids[i:i + _IN_CHUNK]))).all())
+    return names
+
+
+def donation_time_series(start, end, granularity='day', group_by=(), category_id=None, ngo_id=None,
+                         max_buckets=1000):
+    """
+    Donation volume and count per day, week or month over [start, end] (dates,
+    inclusive), optionally split by category and/or NGO and filtered to one of each.
+
+    Reads only donation_buckets: whole periods come from their own bucket rows and
+    partly covered edge periods from day buckets, so the cost follows the number of
+    periods and (category, NGO) pairs, not donations. Without group_by every period
+    is listed, with zeros where nothing was given.
+    """
+    if granularity not in GRANULARITIES:
+        raise AnalyticsError(f"Invalid granularity '{granularity}'. Use one of: {', '.join(GRANULARITIES)}.")
+    unknown = [key for key in group_by if key not in GROUP_BY_COLUMNS]
+    if unknown:
+        raise AnalyticsError(f"Invalid group_by '{','.join(unknown)}'. Use category and/or ngo.")
+    if start > end:
+        raise AnalyticsError("start must not be after end.")
+
+    periods, period = [], period_start(granularity, start)
+    while period <= end:
+        periods.append(period)
+        if len(periods) > max_buckets:
+            raise AnalyticsError(f"Range spans more than {max_buckets} {granularity} buckets; "
+                                 f"narrow it or use a coarser granularity.")
+        period = next_period(granularity, period)
+
+    group_columns = [GROUP_BY_COLUMNS[key] for key in group_by]
+    filters = [or_(*(and_(DonationBucket.granularity == source, DonationBucket.bucket_start.between(first, last))
+                     for source, first, last in _sources(granularity, periods, start, end)))]
+    if category_id:
+        filters.append(DonationBucket.category_id == category_id)
+    if ngo_id:
+        filters.append(DonationBucket.ngo_id == ngo_id)
+    stmt = (
+        select(DonationBucket.bucket_start, *group_columns, func.sum(DonationBucket.total_donated),
+               func.sum(DonationBucket.gift_count))
+        .where(*filters)
+        .group_by(DonationBucket.granularity, DonationBucket.bucket_start, *group_columns)
+    )
+
+    series = {(period,): [Decimal('0'), 0] for period in periods} if not group_by else {}
+    for row in db.session.execute(stmt):
+        key = (period_start(granularity, row[0]),) + tuple(row[1:1 + len(group_columns)])
+        point = series.setdefault(key, [Decimal('0'), 0])
+        point[0] += Decimal(str(row[-2] or 0))
+        point[1] += int(row[-1] or 0)
+
+    positions = {key: 1 + i for i, key in enumerate(group_by)}
+    categories = _names(Category, Category.name, {key[positions['category']] for key in series}) \
+        if 'category' in positions else {}
+    ngos = _names(NGOProfile, NGOProfile.organization_name, {key[positions['ngo']] for key in series}) \
+        if 'ngo' in positions else {}
+
+    points = []
+    total_donated, gift_count = Decimal('0'), 0
+    for key, (total, gifts) in sorted(series.items()):
+        point = {'bucket': key[0], 'total_donated': total.quantize(Decimal('0.01')), 'gift_count': gifts}
+        if 'category' in positions:
+            point['category_id'] = key[positions['category']]
+            point['category_name'] = categories.get(point['category_id'])
+        if 'ngo' in positions:
+            point['ngo_id'] = key[positions['ngo']]
+            point['organization_name'] = ngos.get(point['ngo_id'])
+        points.append(point)
+        total_donated += total
+        gift_count += gifts
+
+    return {
+        'granularity': granularity,
+        'start': start,
+        'end': end,
+        'group_by': list(group_by),
+        'total_donated': total_donated.quantize(Decimal('0.01')),
+        'gift_count': gift_count,
+        'series': points,
+    }
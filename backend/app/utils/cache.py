@@ -0,0 +1,252 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from flask import current_app, request, g
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    """
+    A thread-safe, in-process LRU cache whose entries also expire after `ttl` seconds.
+    Keeps hit/miss/eviction counters so the cache can be sized from real traffic.
+    """
+    def __init__(self, maxsize=512, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Bumped on every invalidation; lets a slow writer detect that its value went stale.
+        self.generation = 0
+        # time.monotonic() of the last invalidation
+        self.cleared_at = float('-inf')
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return item[1]
+            if item is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None, generation=None):
+        """
+        Stores a value. If `generation` is given and the cache has been invalidated
+        since it was read, the value was computed from stale data and is dropped.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self.generation += 1
+            self.cleared_at = time.monotonic()
+            self._data.pop(key, None)
+
+    def clear(self, prefix=None):
+        """Drops every entry, or only the tuple keys that start with the tuple `prefix`."""
+        with self._lock:
+            self.generation += 1
+            self.cleared_at = time.monotonic()
+            if prefix is None:
+                self._data.clear()
+                return
+            size = len(prefix)
+            for key in [k for k in self._data if isinstance(k, tuple) and k[:size] == prefix]:
+                del self._data[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxSize": self.maxsize,
+                "ttlSeconds": self.ttl,
+            }
+
+
+# --- Running callbacks after commit ---
+# Invalidating before the commit would let a concurrent request re-cache the old rows
+# in the window before the new ones become visible, so callers register invalidations
+# on the session and they run only once the transaction has committed. Other side
+# effects that must not outrun the transaction (waking worker pools, deleting staged
+# files) use the same hook.
+
+def on_commit(callback, *args):
+    """Schedules `callback(*args)` to run after the current session's next successful commit."""
+    from app.extensions import db
+    db.session().info.setdefault('after_commit_callbacks', []).append((callback, args))
+
+
+# The name cache invalidations use
+invalidate_on_commit = on_commit
+
+
+@event.listens_for(Session, 'after_commit')
+def _run_after_commit_callbacks(session):
+    for callback, args in session.info.pop('after_commit_callbacks', []):
+        callback(*args)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _drop_after_commit_callbacks(session):
+    session.info.pop('after_commit_callbacks', None)
+
+
+# --- HTTP response cache for the public cause endpoints ---
+
+CachedResponse = namedtuple('CachedResponse', ['body', 'etag', 'mimetype', 'headers'])
+
+# Headers produced by the views that must be replayed on a cache hit (pagination cursors).
+_REPLAYED_HEADERS = ('Link', 'X-Next-Cursor', 'X-Prev-Cursor', 'X-Page-Limit')
+
+
+def init_response_cache(app):
+    """Creates the app's response cache from RESPONSE_CACHE_* settings."""
+    if app.config.get('RESPONSE_CACHE_ENABLED', True):
+        app.extensions['response_cache'] = TTLCache(
+            maxsize=app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 512),
+            ttl=app.config.get('RESPONSE_CACHE_TTL', 30),
+        )
+
+
+def get_response_cache():
+    return current_app.extensions.get('response_cache')
+
+
+def cached_response(namespace, key_arg=None):
+    """
+    Caches a view's 200 responses in the in-process response cache.
+
+    Every response gets a strong ETag (a hash of the body). A request whose
+    If-None-Match matches receives 304 Not Modified with no body, whether the
+    response came from the cache or not. Entries are grouped by `namespace`, plus
+    the value of the URL argument `key_arg` when given, so they can be dropped
+    with invalidate_responses().
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = get_response_cache()
+            group = (namespace, kwargs[key_arg]) if key_arg else (namespace,)
+            key = group + (request.full_path,)
+
+            generation = cache.generation if cache is not None else None
+            entry = cache.get(key) if cache is not None else None
+            if entry is None:
+                # Lets @use_replica avoid caching a replica read that predates a fresh write
+                g.filling_response_cache = cache is not None
+                response = current_app.make_response(fn(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+                body = response.get_data()
+                entry = CachedResponse(
+                    body=body,
+                    etag=hashlib.sha256(body).hexdigest(),
+                    mimetype=response.mimetype,
+                    headers={h: response.headers[h] for h in _REPLAYED_HEADERS if h in response.headers},
+                )
+                if cache is not None:
+                    cache.set(key, entry, generation=generation)
+                cache_status = 'MISS'
+            else:
+                cache_status = 'HIT'
+
+            response = current_app.response_class(entry.body, mimetype=entry.mimetype)
+            response.headers.update(entry.headers)
+            response.set_etag(entry.etag)
+            # Clients may keep a copy but must revalidate it with If-None-Match
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Cache'] = cache_status
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+def invalidate_responses(namespace, key=None):
+    """Drops cached responses for a namespace (and optionally one key within it), after commit."""
+    def _clear(app):
+        cache = app.extensions.get('response_cache')
+        if cache is not None:
+            cache.clear((namespace, key) if key is not None else (namespace,))
+    on_commit(_clear, current_app._get_current_object())
+
+
+def invalidate_cause(request_id=None):
+    """
+    Drops every cached cause listing and, if given, the cached detail of one cause.
+    Call whenever a cause's public data changes: approval/rejection, NGO edits and
+    deletes, or a donation changing amount_received. Takes effect on commit.
+    """
+    invalidate_responses('causes')
+    if request_id is not None:
+        invalidate_responses('cause', request_id)
+
+
+def invalidate_all_causes():
+    """
+    Drops every cached cause listing and every cached cause detail. For changes that
+    reach many causes at once: an NGO profile edit (details embed the profile) or
+    a rejected NGO's causes being deleted. Takes effect on commit.
+    """
+    invalidate_responses('causes')
+    invalidate_responses('cause')
+
+
+# --- NGO approval cache for approved_ngo_required ---
+# NGO tokens outlive approval changes, so the approval flag has to be checked on every
+# NGO request. Caching it per user keeps that off the database in the steady state;
+# approve/reject drop the entry on commit, so this worker sees the change immediately
+# and other workers within NGO_APPROVAL_CACHE_TTL seconds.
+
+def init_approval_cache(app):
+    """Creates the app's NGO approval cache from NGO_APPROVAL_CACHE_* settings."""
+    app.extensions['ngo_approval_cache'] = TTLCache(
+        maxsize=app.config.get('NGO_APPROVAL_CACHE_MAX_ENTRIES', 4096),
+        ttl=app.config.get('NGO_APPROVAL_CACHE_TTL', 60),
+    )
+
+
+def get_approval_cache():
+    return current_app.extensions.get('ngo_approval_cache')
+
+
+def is_ngo_approved(user_id):
+    """True if `user_id` is an existing, approved NGO. Reads the database only on a cache miss."""
+    from app.extensions import db
+    from app.models.user import User
+
+    cache = get_approval_cache()
+    generation = cache.generation
+    approved = cache.get(user_id)
+    if approved is None:
+        approved = bool(db.session.query(User.is_approved).filter(User.id == user_id, User.role == 'NGO').scalar())
+        cache.set(user_id, approved, generation=generation)
+    return approved
+
+
+def invalidate_ngo_approval(user_id):
+    """Drops the cached approval flag of one NGO user, after commit."""
+    def _delete(app):
+        app.extensions['ngo_approval_cache'].delete(user_id)
+    on_commit(_delete, current_app._get_current_object())
@@ -1,6 +1,7 @@
 from functools import wraps
 from flask import jsonify
-from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from app.utils.cache import is_ngo_approved
 
 def admin_required(fn):
     """
@@ -35,21 +36,17 @@ def ngo_required(fn):
 
 def approved_ngo_required(fn):
     """
-    A custom decorator that verifies the JWT is present and the user's role is 'NGO'.
-    In a real app, you would also check if the NGO is approved.
+    A custom decorator that verifies the JWT is present, the user's role is 'NGO'
+    and the NGO is still approved. The approval flag comes from the in-process
+    approval cache, so tokens issued before a rejection stop working without a
+    database read on every request.
     """
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
         claims = get_jwt()
-        if claims.get("role") == "NGO":
-            # You would add a database check here for approval status
-            # from app.models.user import User
-            # user_id = claims.get('sub', {}).get('id')
-            # user = User.query.get(user_id)
-            # if user and user.is_approved:
-            #     return fn(*args, **kwargs)
-            return fn(*args, **kwargs) # Simplified for now
+        if claims.get("role") == "NGO" and is_ngo_approved(get_jwt_identity().get('id')):
+            return fn(*args, **kwargs)
         else:
             return jsonify({"message": "Approved NGOs only!"}), 403
     return wrapper
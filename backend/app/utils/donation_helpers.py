@@ -0,0 +1,263 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import update, case, func, literal, insert, select, delete
+from app.extensions import db
+from app.models.donation import DonationRequest, Donation
+from app.models.donor import DonorProfile
+from app.utils.stats_helpers import bump_stat, TOTAL_DONATIONS
+from app.utils.cache import invalidate_cause
+from app.utils.rollup_helpers import record_in_rollups
+from app.utils.analytics_helpers import record_in_buckets, remove_from_buckets
+from app.utils.sendgrid_helpers import queue_donation_receipts, queue_cause_completed
+
+
+class DonationRejected(Exception):
+    """
+    Raised when a donation cannot be applied to a request.
+    Carries the JSON message and HTTP status code the route should return.
+    """
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def _amount(value):
+    return literal(value, DonationRequest.amount_received.type)
+
+
+def apply_to_request(request_id, amount):
+    """
+    Adds `amount` to a request's amount_received in a single conditional UPDATE.
+
+    The remaining-amount check, the increment and the switch to 'Completed' all
+    happen inside the database, so concurrent donations to the same cause can
+    neither lose updates nor over-fund it: whichever UPDATE the database applies
+    second sees the first one's total. Returns the request's new status ('Approved',
+    or 'Completed' if this amount funded it) or None if the row was not updated.
+    """
+    amount = _amount(amount)
+    new_total = func.round(DonationRequest.amount_received + amount, 2)
+    stmt = (
+        update(DonationRequest)
+        .where(
+            DonationRequest.id == request_id,
+            DonationRequest.status == 'Approved',
+            new_total <= DonationRequest.amount_needed,
+        )
+        .values(
+            amount_received=new_total,
+            status=case((new_total >= DonationRequest.amount_needed, 'Completed'), else_=DonationRequest.status),
+            updated_at=datetime.utcnow(),
+        )
+        .returning(DonationRequest.status)
+        .execution_options(synchronize_session=False)
+    )
+    return db.session.execute(stmt).scalar()
+
+
+def record_donation(donor_id, request_id, amount, transaction_id=None):
+    """
+    Records a donation against an approved request.
+    Adds the Donation to the session; the caller commits.
+    Raises DonationRejected if the request is missing, not approved, or the
+    amount exceeds what is still needed.
+    """
+    status = apply_to_request(request_id, amount)
+    if not status:
+        # Only the failure path reads the row, to report why the update did not match.
+        donation_request = db.session.get(DonationRequest, request_id)
+        if not donation_request or donation_request.status != 'Approved':
+            raise DonationRejected("Donation request not found or not approved", 404)
+        raise DonationRejected("Donation amount exceeds remaining amount needed", 400)
+
+    donation = Donation(
+        id=str(uuid.uuid4()),
+        donor_id=donor_id,
+        donation_request_id=request_id,
+        amount_donated=amount,
+        transaction_id=transaction_id,
+        created_at=datetime.utcnow()
+    )
+    db.session.add(donation)
+    _on_donations_recorded([{
+        'id': donation.id,
+        'donor_id': donor_id,
+        'donation_request_id': request_id,
+        'amount_donated': amount,
+        'created_at': donation.created_at,
+    }], completed=[request_id] if status == 'Completed' else ())
+    return donation
+
+
+def _on_donations_recorded(donations, completed=()):
+    """
+    Keeps everything derived from donations in step, inside the same transaction.
+    `donations` is a list of dicts with the inserted Donation column values;
+    `completed` lists the requests these donations fully funded.
+    """
+    bump_stat(TOTAL_DONATIONS, sum(d['amount_donated'] for d in donations))
+    record_in_rollups(donations)
+    record_in_buckets(donations)
+    for request_id in {d['donation_request_id'] for d in donations}:
+        invalidate_cause(request_id)
+    # Notifications go through the outbox, so no email is sent from the request
+    queue_donation_receipts([d['id'] for d in donations])
+    queue_cause_completed(list(completed))
+
+
+def remove_cause_donations(request_ids):
+    """
+    Deletes every donation of the given requests ahead of deleting the requests
+    themselves, and takes them back out of everything derived from donations.
+    DELETE ... RETURNING reports exactly the rows this transaction removed, so two
+    concurrent deletes of the same cause cannot both subtract its donations.
+    The caller commits. Returns the removed donations as dicts.
+    """
+    removed = []
+    for chunk in _chunks(request_ids):
+        stmt = (
+            delete(Donation)
+            .where(Donation.donation_request_id.in_(chunk))
+            .returning(Donation.id, Donation.donor_id, Donation.donation_request_id, Donation.amount_donated,
+                       Donation.created_at)
+            .execution_options(synchronize_session=False)
+        )
+        removed.extend(dict(row._mapping) for row in db.session.execute(stmt))
+    if removed:
+        _on_donations_removed(removed)
+    return removed
+
+
+def _on_donations_removed(donations):
+    """The counterpart of _on_donations_recorded for donations deleted with their cause."""
+    bump_stat(TOTAL_DONATIONS, -sum(Decimal(str(d['amount_donated'])) for d in donations))
+    remove_from_buckets(donations)
+
+
+# --- Bulk ingestion ---
+
+# Stay well below SQLite's bound-parameter limit when looking rows up with IN (...)
+_IN_CHUNK = 500
+
+
+def _chunks(values, size=_IN_CHUNK):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _parse_row(raw):
+    """Validates one incoming row. Returns (clean dict, None) or (None, error message)."""
+    if not isinstance(raw, dict):
+        return None, "Row must be an object"
+    missing = [f for f in ('donor_id', 'donation_request_id', 'amount_donated', 'transaction_id')
+               if raw.get(f) in (None, '')]
+    if missing:
+        return None, f"Missing required fields: {', '.join(missing)}"
+    try:
+        amount = Decimal(str(raw['amount_donated'])).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError, TypeError):
+        return None, "Invalid amount_donated format"
+    if amount <= 0:
+        return None, "Amount donated must be a positive number"
+    created_at = datetime.utcnow()
+    if raw.get('created_at'):
+        try:
+            created_at = datetime.fromisoformat(str(raw['created_at']))
+        except ValueError:
+            return None, "Invalid created_at; use an ISO datetime"
+        if created_at.tzinfo is not None:
+            # Stored timestamps are naive UTC, like datetime.utcnow()
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return {
+        'donor_id': str(raw['donor_id']),
+        'donation_request_id': str(raw['donation_request_id']),
+        'amount_donated': amount,
+        'transaction_id': str(raw['transaction_id']),
+        'created_at': created_at,
+    }, None
+
+
+def ingest_donations(raw_rows):
+    """
+    Validates and records a batch of donations (offline drives, gateway settlement files).
+
+    The whole batch is checked with a handful of set-based queries (existing
+    transaction ids, donors, requests) rather than per-row lookups. Accepted rows are
+    written with one multi-row INSERT, and each affected request gets a single
+    conditional UPDATE for the batch total, so the no-over-funding guarantee of
+    record_donation() still holds. Rows are accepted in file order until a request
+    is fully funded; the rest for that request are rejected.
+
+    Adds everything to the current transaction; the caller commits.
+    Returns a list with one {'row', 'transaction_id', 'status', ...} report per input row.
+    """
+    results = []
+    candidates = []
+    seen_transactions = set()
+    for index, raw in enumerate(raw_rows):
+        row, error = _parse_row(raw)
+        transaction_id = raw.get('transaction_id') if isinstance(raw, dict) else None
+        result = {'row': index, 'transaction_id': transaction_id}
+        results.append(result)
+        if error:
+            result.update(status='rejected', error=error)
+        elif row['transaction_id'] in seen_transactions:
+            result.update(status='rejected', error="Duplicate transaction_id within batch")
+        else:
+            seen_transactions.add(row['transaction_id'])
+            candidates.append((result, row))
+
+    # Set-based lookups for the whole batch
+    existing, donors, requests = set(), set(), {}
+    for chunk in _chunks(seen_transactions):
+        existing.update(db.session.scalars(select(Donation.transaction_id).where(Donation.transaction_id.in_(chunk))))
+    for chunk in _chunks({row['donor_id'] for _, row in candidates}):
+        donors.update(db.session.scalars(select(DonorProfile.id).where(DonorProfile.id.in_(chunk))))
+    for chunk in _chunks({row['donation_request_id'] for _, row in candidates}):
+        stmt = select(DonationRequest.id, DonationRequest.status, DonationRequest.amount_needed,
+                      DonationRequest.amount_received).where(DonationRequest.id.in_(chunk))
+        for request_id, status, needed, received in db.session.execute(stmt):
+            requests[request_id] = (status, Decimal(str(needed)) - Decimal(str(received)))
+
+    # Allocate rows against each request's remaining amount, in input order
+    accepted, totals = {}, {}
+    for result, row in candidates:
+        request_id = row['donation_request_id']
+        status, remaining = requests.get(request_id, (None, None))
+        if row['transaction_id'] in existing:
+            result.update(status='rejected', error="Duplicate transaction_id; already recorded")
+        elif row['donor_id'] not in donors:
+            result.update(status='rejected', error="Donor not found")
+        elif status != 'Approved':
+            result.update(status='rejected', error="Donation request not found or not approved")
+        elif totals.get(request_id, Decimal('0')) + row['amount_donated'] > remaining:
+            result.update(status='rejected', error="Donation amount exceeds remaining amount needed")
+        else:
+            totals[request_id] = totals.get(request_id, Decimal('0')) + row['amount_donated']
+            accepted.setdefault(request_id, []).append((result, row))
+
+    # One conditional UPDATE per affected request; if a concurrent donation got there
+    # first and the total no longer fits, that request's rows are rejected as a group.
+    inserts, completed = [], []
+    for request_id, items in accepted.items():
+        status = apply_to_request(request_id, totals[request_id])
+        if status == 'Completed':
+            completed.append(request_id)
+        if not status:
+            for result, _ in items:
+                result.update(status='rejected', error="Request changed concurrently; retry these rows")
+            continue
+        for result, row in items:
+            row['id'] = str(uuid.uuid4())
+            row['updated_at'] = row['created_at']
+            result.update(status='accepted', donation_id=row['id'])
+            inserts.append(row)
+
+    if inserts:
+        db.session.execute(insert(Donation), inserts)
+        _on_donations_recorded(inserts, completed)
+    return results
+
@@ -0,0 +1,110 @@
+import json
+import os
+import smtplib
+import uuid
+from datetime import datetime
+from urllib import request as urlrequest
+from urllib.error import HTTPError, URLError
+
+
+class TransportError(Exception):
+    """
+    Raised by a Transport when a message was not delivered. `permanent` errors
+    (e.g. a rejected address) are not retried; anything else is.
+    """
+    def __init__(self, message, permanent=False):
+        super().__init__(message)
+        self.permanent = permanent
+
+
+class Transport:
+    """
+    Delivers one email.message.EmailMessage (From, To and Subject set, plain-text body).
+    Implementations must be safe to call from several sender threads at once.
+    """
+    def send(self, message):
+        raise NotImplementedError
+
+
+class FileTransport(Transport):
+    """Writes each message as an .eml file into `directory`. For development, tests and benchmarks."""
+    def __init__(self, directory):
+        self.directory = directory
+
+    def send(self, message):
+        name = f"{datetime.utcnow():%Y%m%d%H%M%S%f}-{uuid.uuid4().hex[:8]}.eml"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, name), 'wb') as handle:
+                handle.write(message.as_bytes())
+        except OSError as e:
+            raise TransportError(str(e)) from e
+
+
+class SMTPTransport(Transport):
+    """Sends through an SMTP server, e.g. a local sink such as MailHog or `python -m aiosmtpd -n`."""
+    def __init__(self, host='localhost', port=25, username=None, password=None, use_tls=False, timeout=10):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def send(self, message):
+        try:
+            with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+                if self.use_tls:
+                    smtp.starttls()
+                if self.username:
+                    smtp.login(self.username, self.password or '')
+                smtp.send_message(message)
+        except smtplib.SMTPRecipientsRefused as e:
+            raise TransportError(f"Recipient refused: {e}", permanent=True) from e
+        except (smtplib.SMTPException, OSError) as e:
+            raise TransportError(f"SMTP send failed: {e}") from e
+
+
+class SendGridTransport(Transport):
+    """Sends through the SendGrid v3 mail API over plain HTTPS (no SDK needed)."""
+    API_URL = 'https://api.sendgrid.com/v3/mail/send'
+
+    def __init__(self, api_key, timeout=10):
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def send(self, message):
+        payload = {
+            'personalizations': [{'to': [{'email': message['To']}]}],
+            'from': {'email': message['From']},
+            'subject': message['Subject'],
+            'content': [{'type': 'text/plain', 'value': message.get_content()}],
+        }
+        http_request = urlrequest.Request(
+            self.API_URL, data=json.dumps(payload).encode('utf-8'), method='POST',
+            headers={'Authorization': f'Bearer {self.api_key}', 'Content-Type': 'application/json'},
+        )
+        try:
+            with urlrequest.urlopen(http_request, timeout=self.timeout):
+                pass
+        except HTTPError as e:
+            # 429 and 5xx are worth retrying; any other 4xx will fail the same way again
+            permanent = 400 <= e.code < 500 and e.code != 429
+            raise TransportError(f"SendGrid answered {e.code}: {e.read()[:500]!r}", permanent=permanent) from e
+        except (URLError, OSError) as e:
+            raise TransportError(f"SendGrid request failed: {e}") from e
+
+
+def create_transport(config):
+    """Builds the transport named by EMAIL_TRANSPORT ('sendgrid', 'smtp' or 'file')."""
+    name = config.get('EMAIL_TRANSPORT', 'file')
+    timeout = config.get('EMAIL_SEND_TIMEOUT', 10)
+    if name == 'sendgrid':
+        return SendGridTransport(config.get('SENDGRID_API_KEY'), timeout=timeout)
+    if name == 'smtp':
+        return SMTPTransport(config.get('SMTP_HOST', 'localhost'), config.get('SMTP_PORT', 25),
+                             config.get('SMTP_USERNAME'), config.get('SMTP_PASSWORD'),
+                             config.get('SMTP_USE_TLS', False), timeout=timeout)
+    if name == 'file':
+        return FileTransport(config['EMAIL_FILE_DIR'])
+    raise ValueError(f"Unknown EMAIL_TRANSPORT {name!r}; use 'sendgrid', 'smtp' or 'file'.")
@@ -0,0 +1,85 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from app.config import ENGINE_PROFILES
+
+# Profile applied when DB_ENGINE_PROFILE is empty, by database backend
+_DEFAULT_PROFILES = {'sqlite': 'sqlite-wal', 'postgresql': 'postgres-web'}
+
+# Config settings that override a profile's engine_options
+_OVERRIDES = {'DB_POOL_SIZE': 'pool_size', 'DB_MAX_OVERFLOW': 'max_overflow', 'DB_POOL_RECYCLE': 'pool_recycle'}
+
+_POSTGRES_TIMEOUTS = ('statement_timeout', 'lock_timeout', 'idle_in_transaction_session_timeout')
+
+
+def _backend(config):
+    uri = config.get('SQLALCHEMY_DATABASE_URI')
+    return make_url(uri).get_backend_name() if uri else None
+
+
+def resolve_engine_profile(config):
+    """Returns the name of the engine profile to use, or None when there is none for this database."""
+    name = config.get('DB_ENGINE_PROFILE')
+    if name:
+        if name not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown DB_ENGINE_PROFILE {name!r}; use one of: {', '.join(sorted(ENGINE_PROFILES))}.")
+        return name
+    return _DEFAULT_PROFILES.get(_backend(config))
+
+
+def engine_options(config):
+    """
+    Builds SQLALCHEMY_ENGINE_OPTIONS from the engine profile and the DB_* overrides.
+    Options set explicitly in SQLALCHEMY_ENGINE_OPTIONS win over both.
+    """
+    profile = ENGINE_PROFILES.get(resolve_engine_profile(config), {})
+    options = dict(profile.get('engine_options', {}))
+    for setting, option in _OVERRIDES.items():
+        if config.get(setting) not in (None, ''):
+            options[option] = int(config[setting])
+
+    if _backend(config) == 'postgresql':
+        timeouts = {key: profile[key] for key in _POSTGRES_TIMEOUTS if key in profile}
+        if config.get('DB_STATEMENT_TIMEOUT') not in (None, ''):
+            timeouts['statement_timeout'] = int(config['DB_STATEMENT_TIMEOUT'])
+        connect_args = {}
+        if 'connect_timeout' in profile:
+            connect_args['connect_timeout'] = profile['connect_timeout']
+        if timeouts:
+            connect_args['options'] = ' '.join(f'-c {key}={value}' for key, value in timeouts.items())
+        if connect_args:
+            options['connect_args'] = connect_args
+
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+
+def configure_engine(app):
+    """Resolves the engine profile into SQLALCHEMY_ENGINE_OPTIONS. Call before db.init_app()."""
+    app.config['DB_ENGINE_PROFILE'] = resolve_engine_profile(app.config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+
+def _set_pragmas(pragmas):
+    statements = [f'PRAGMA {name}={value}' for name, value in pragmas.items()]
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+    return on_connect
+
+
+def init_engine_profile(app):
+    """Runs the profile's SQLite pragmas on every new connection. Call after db.init_app()."""
+    from app.extensions import db
+
+    pragmas = ENGINE_PROFILES.get(app.config.get('DB_ENGINE_PROFILE'), {}).get('pragmas')
+    if not pragmas:
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _set_pragmas(pragmas))
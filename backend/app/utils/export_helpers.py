@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+from flask import Response, current_app, stream_with_context
+from app.extensions import db
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class ExportError(ValueError):
+    """Raised for invalid export parameters (bad format or date)."""
+
+
+def parse_date_bound(value, end=False):
+    """
+    Parses a 'start'/'end' query parameter. Accepts a date (YYYY-MM-DD) or a full ISO datetime.
+    A bare end date includes that whole day, so it is turned into an exclusive bound on the next day.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ExportError(f"Invalid date '{value}'. Use YYYY-MM-DD or an ISO datetime.")
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+# Spreadsheets evaluate a cell starting with one of these as a formula
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _text(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str):
+        # User-entered text (titles, names) is quoted so it cannot run as a formula in Excel or Sheets
+        return "'" + value if value.startswith(_FORMULA_PREFIXES) else value
+    return str(value)
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        # Keep exact cents for finance instead of converting to float
+        return str(value)
+    return value
+
+
+def _stream_rows(stmt, chunk_size):
+    """
+    Yields result rows in chunks of `chunk_size` lists.
+    yield_per makes the driver fetch incrementally (a server-side cursor on Postgres),
+    so no more than one chunk is ever held in memory.
+    """
+    result = db.session.execute(stmt.execution_options(yield_per=chunk_size))
+    try:
+        for chunk in result.partitions():
+            yield chunk
+    finally:
+        result.close()
+
+
+def _csv_chunks(stmt, fields, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for chunk in _stream_rows(stmt, chunk_size):
+        for row in chunk:
+            writer.writerow([_text(value) for value in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _ndjson_chunks(stmt, fields, chunk_size):
+    for chunk in _stream_rows(stmt, chunk_size):
+        yield ''.join(
+            json.dumps(dict(zip(fields, (_json_value(value) for value in row))), separators=(',', ':')) + '\n'
+            for row in chunk
+        )
+
+
+def export_response(stmt, fmt, filename):
+    """
+    Streams the rows of a Core select as a CSV or NDJSON download.
+    The column labels of `stmt` become the CSV header / JSON keys.
+    Memory use is bounded by EXPORT_CHUNK_SIZE rows regardless of table size.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f"Unsupported format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}.")
+    fields = [column.key for column in stmt.selected_columns]
+    chunk_size = current_app.config['EXPORT_CHUNK_SIZE']
+    chunks = _csv_chunks if fmt == 'csv' else _ndjson_chunks
+
+    response = Response(stream_with_context(chunks(stmt, fields, chunk_size)), mimetype=EXPORT_FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
@@ -0,0 +1,137 @@
+import threading
+import time
+from decimal import Decimal
+from flask import current_app, request, jsonify
+from sqlalchemy import case, func
+from app.extensions import db
+from app.models.cause import Category
+from app.models.donation import DonationRequest
+from app.utils.cache import invalidate_on_commit
+
+# Funding buckets: (key, label, upper bound of amount_received / amount_needed)
+FUNDING_BUCKETS = (
+    ('under_25', '< 25% funded', Decimal('0.25')),
+    ('25_to_75', '25-75% funded', Decimal('0.75')),
+    ('over_75', '> 75% funded', None),
+)
+FUNDING_BUCKET_KEYS = tuple(key for key, _, _ in FUNDING_BUCKETS)
+
+
+def funding_bucket():
+    """SQL expression giving the funding bucket key of a DonationRequest row (no division, so no NULLs)."""
+    whens = [(DonationRequest.amount_received < DonationRequest.amount_needed * bound, key)
+             for key, _, bound in FUNDING_BUCKETS if bound is not None]
+    return case(*whens, else_=FUNDING_BUCKETS[-1][0])
+
+
+class CategoryRegistry:
+    """
+    An in-process map of category names to ids, so filtering by category name
+    costs no query. Loaded lazily, dropped after category changes commit, and
+    reloaded after `ttl` seconds so other workers pick new categories up. An
+    unknown name triggers a reload, at most once per `miss_reload_interval`.
+    """
+    def __init__(self, ttl=300, miss_reload_interval=5):
+        self.ttl = ttl
+        self.miss_reload_interval = miss_reload_interval
+        self._lock = threading.Lock()
+        self._by_name = None
+        self._loaded_at = 0.0
+
+    def _snapshot(self, force=False):
+        with self._lock:
+            now = time.monotonic()
+            if force or self._by_name is None or now - self._loaded_at > self.ttl:
+                rows = db.session.query(Category.id, Category.name).order_by(Category.name).all()
+                self._by_name = {name: category_id for category_id, name in rows}
+                self._loaded_at = now
+            return self._by_name, self._loaded_at
+
+    def all(self):
+        """Returns [(id, name), ...] sorted by name."""
+        by_name, _ = self._snapshot()
+        return [(category_id, name) for name, category_id in by_name.items()]
+
+    def id_for(self, name):
+        by_name, loaded_at = self._snapshot()
+        if name not in by_name and time.monotonic() - loaded_at > self.miss_reload_interval:
+            by_name, _ = self._snapshot(force=True)
+        return by_name.get(name)
+
+    def invalidate(self):
+        with self._lock:
+            self._by_name = None
+
+
+def init_category_registry(app):
+    app.extensions['category_registry'] = CategoryRegistry(ttl=app.config.get('CATEGORY_REGISTRY_TTL', 300))
+
+
+def get_category_registry():
+    return current_app.extensions['category_registry']
+
+
+def invalidate_category_registry():
+    """Drops this worker's category registry once the current transaction commits."""
+    invalidate_on_commit(lambda app: app.extensions['category_registry'].invalidate(),
+                         current_app._get_current_object())
+
+
+def cause_filter_args():
+    """
+    Reads the 'category' (name) and 'funding' (bucket key) query parameters.
+    Returns ((category_id, funding), None), or (None, error response) for an unknown value.
+    """
+    category_id = None
+    category_name = request.args.get('category')
+    if category_name:
+        category_id = get_category_registry().id_for(category_name)
+        if category_id is None:
+            return None, (jsonify({"message": "Category not found"}), 404)
+    funding = request.args.get('funding') or None
+    if funding and funding not in FUNDING_BUCKET_KEYS:
+        return None, (jsonify({"message": f"Invalid funding bucket. Use one of: {', '.join(FUNDING_BUCKET_KEYS)}."}), 400)
+    return (category_id, funding), None
+
+
+def approved_cause_filters(category_id=None, funding=None):
+    """Returns the WHERE clauses for approved causes, optionally narrowed to a category and funding bucket."""
+    filters = [DonationRequest.status == 'Approved']
+    if category_id:
+        filters.append(DonationRequest.category_id == category_id)
+    if funding:
+        filters.append(funding_bucket() == funding)
+    return filters
+
+
+def cause_facets(query, category_id=None, funding=None):
+    """
+    Counts the causes of `query` (a DonationRequest query with the base filters applied)
+    per category and per funding bucket, with a single GROUP BY (category, bucket).
+
+    Each facet honours the other facet's selection but not its own, so the counts
+    say how many results picking that value would give.
+    """
+    bucket = funding_bucket().label('bucket')
+    rows = query.with_entities(DonationRequest.category_id, bucket, func.count()) \
+        .group_by(DonationRequest.category_id, bucket).all()
+
+    category_counts, bucket_counts = {}, {}
+    for row_category, row_bucket, count in rows:
+        if funding is None or row_bucket == funding:
+            category_counts[row_category] = category_counts.get(row_category, 0) + count
+        if category_id is None or row_category == category_id:
+            bucket_counts[row_bucket] = bucket_counts.get(row_bucket, 0) + count
+
+    return {
+        "total": sum(count for row_category, row_bucket, count in rows
+                     if (category_id is None or row_category == category_id) and (funding is None or row_bucket == funding)),
+        "categories": [
+            {"id": cid, "name": name, "count": category_counts.get(cid, 0), "selected": cid == category_id}
+            for cid, name in get_category_registry().all()
+        ],
+        "funding": [
+            {"key": key, "label": label, "count": bucket_counts.get(key, 0), "selected": key == funding}
+            for key, label, _ in FUNDING_BUCKETS
+        ],
+    }
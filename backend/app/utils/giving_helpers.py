@@ -0,0 +1,70 @@
+from decimal import Decimal
+from sqlalchemy import func, extract, select
+from app.extensions import db
+from app.models.donation import DonationRequest, Donation
+from app.models.ngo import NGOProfile
+
+
+def _giving_by_cause_and_year(donor_id):
+    """
+    One grouped query: the donor's total, gift count and last gift date per
+    (cause, year), with the cause title and NGO name joined onto the groups
+    rather than onto every donation.
+    """
+    year = extract('year', Donation.created_at)
+    grouped = (
+        select(
+            Donation.donation_request_id.label('cause_id'),
+            year.label('year'),
+            func.sum(Donation.amount_donated).label('total_given'),
+            func.count(Donation.id).label('gift_count'),
+            func.max(Donation.created_at).label('last_gift_at'),
+        )
+        .where(Donation.donor_id == donor_id)
+        .group_by(Donation.donation_request_id, year)
+        .subquery()
+    )
+    stmt = (
+        select(grouped, DonationRequest.title, DonationRequest.status, NGOProfile.organization_name)
+        .join(DonationRequest, DonationRequest.id == grouped.c.cause_id)
+        .join(NGOProfile, NGOProfile.id == DonationRequest.ngo_id)
+    )
+    return db.session.execute(stmt).all()
+
+
+def donor_giving_summary(donor_id):
+    """
+    Summarizes a donor's giving per cause and per calendar year.
+
+    Both views are folded from the same (cause, year) groups, so there is a
+    single pass over the donor's donations, in the database. Causes are ordered
+    by most recent gift, years newest first.
+    """
+    causes, years = {}, {}
+    for row in _giving_by_cause_and_year(donor_id):
+        total = Decimal(str(row.total_given or 0))
+        cause = causes.setdefault(row.cause_id, {
+            'cause_id': row.cause_id,
+            'title': row.title,
+            'status': row.status,
+            'organization_name': row.organization_name,
+            'total_given': Decimal('0'),
+            'gift_count': 0,
+            'last_gift_at': row.last_gift_at,
+        })
+        cause['total_given'] += total
+        cause['gift_count'] += row.gift_count
+        cause['last_gift_at'] = max(cause['last_gift_at'], row.last_gift_at)
+
+        year = years.setdefault(int(row.year), {'year': int(row.year), 'total_given': Decimal('0'),
+                                                 'gift_count': 0, 'cause_count': 0})
+        year['total_given'] += total
+        year['gift_count'] += row.gift_count
+        year['cause_count'] += 1
+
+    return {
+        'total_given': sum((c['total_given'] for c in causes.values()), Decimal('0')),
+        'gift_count': sum(c['gift_count'] for c in causes.values()),
+        'causes': sorted(causes.values(), key=lambda c: (c['last_gift_at'], c['cause_id']), reverse=True),
+        'years': sorted(years.values(), key=lambda y: y['year'], reverse=True),
+    }
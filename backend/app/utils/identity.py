@@ -0,0 +1,78 @@
+from collections import namedtuple
+from flask import g
+from flask_jwt_extended import get_jwt
+from sqlalchemy.orm import joinedload
+from app.extensions import db
+from app.models.user import User
+from app.models.ngo import NGOProfile
+from app.models.donor import DonorProfile
+
+Identity = namedtuple('Identity', ['user_id', 'role', 'profile_id'])
+
+# Role -> (profile model, User relationship holding it)
+_PROFILES = {
+    'NGO': (NGOProfile, User.ngo_profile),
+    'Donor': (DonorProfile, User.donor_profile),
+}
+
+
+def identity_claims(user):
+    """
+    Returns the additional access-token claims for `user`. The role and profile id
+    travel in the token so NGO and donor routes never have to look the profile up.
+    """
+    profile = user.ngo_profile if user.role == 'NGO' else user.donor_profile if user.role == 'Donor' else None
+    return {
+        "role": user.role,
+        "username": user.username,
+        "profile_id": profile.id if profile else None,
+    }
+
+
+def current_identity():
+    """
+    Returns the (user_id, role, profile_id) of the current request's token, resolved once per request.
+    Tokens without a profile id (issued before the claim existed, or before the
+    profile was created, when it is null) fall back to one profile lookup.
+    """
+    identity = g.get('_identity')
+    if identity is None:
+        claims = get_jwt()
+        user_id = claims.get('sub', {}).get('id')
+        role = claims.get('role')
+        profile_id = claims.get('profile_id')
+        if profile_id is None and role in _PROFILES:
+            model = _PROFILES[role][0]
+            profile_id = db.session.query(model.id).filter(model.user_id == user_id).scalar()
+        identity = g._identity = Identity(user_id, role, profile_id)
+    return identity
+
+
+def current_user():
+    """Returns the current request's User (with its role profile joined in), loaded at most once per request."""
+    if '_current_user' not in g:
+        identity = current_identity()
+        query = User.query
+        if identity.role in _PROFILES:
+            query = query.options(joinedload(_PROFILES[identity.role][1]))
+        g._current_user = query.filter(User.id == identity.user_id).first()
+    return g._current_user
+
+
+def current_profile():
+    """
+    Returns the current request's NGOProfile or DonorProfile, or None (admins, missing profile).
+    Reuses the profile joined by current_user() when the user was already loaded.
+    """
+    if '_current_profile' not in g:
+        identity = current_identity()
+        profile = None
+        if identity.role in _PROFILES and identity.profile_id:
+            model, relationship = _PROFILES[identity.role]
+            user = g.get('_current_user')
+            if user is not None:
+                profile = getattr(user, relationship.key)
+            else:
+                profile = db.session.get(model, identity.profile_id)
+        g._current_profile = profile
+    return g._current_profile
@@ -0,0 +1,251 @@
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from flask import g, request, has_request_context, current_app, jsonify
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing value per label set."""
+    kind = 'counter'
+
+    def __init__(self, name, help, labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values=(), amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        for label_values, value in sorted(items):
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set, as Prometheus expects."""
+    kind = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, label_values=()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                state = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self._lock:
+            items = [(labels, (list(counts), total, count)) for labels, (counts, total, count) in self._values.items()]
+        names = self.labels + ('le',)
+        for label_values, (counts, total, count) in sorted(items):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket', _format_labels(names, label_values + (_format_number(bound),)), cumulative
+            yield f'{self.name}_sum', _format_labels(self.labels, label_values), total
+            yield f'{self.name}_count', _format_labels(self.labels, label_values), count
+
+
+class MetricsRegistry:
+    """
+    Holds the app's metrics. Recording is a dict update under a lock, and the text
+    exposition is only built when /metrics is scraped, so unscraped metrics cost
+    next to nothing. Values are per worker process; Prometheus sums across them.
+    """
+    def __init__(self):
+        endpoint = ('endpoint',)
+        self.requests = Counter('http_requests_total', 'HTTP requests by endpoint, method and status.',
+                                ('endpoint', 'method', 'status'))
+        self.latency = Histogram('http_request_duration_seconds', 'Time from request start to response.',
+                                 ('endpoint', 'method'), LATENCY_BUCKETS)
+        self.response_size = Histogram('http_response_size_bytes', 'Response body size (non-streamed responses).',
+                                       endpoint, SIZE_BUCKETS)
+        self.sql_statements = Counter('db_statements_total', 'SQL statements executed.', endpoint)
+        self.sql_seconds = Counter('db_statement_seconds_total', 'Time spent executing SQL statements.', endpoint)
+        self.sql_per_request = Histogram('db_statements_per_request', 'SQL statements issued per request.',
+                                         endpoint, COUNT_BUCKETS)
+        self.serialization = Histogram('serialization_duration_seconds',
+                                       'Time spent serializing response payloads (schema dump and JSON encoding).',
+                                       endpoint, LATENCY_BUCKETS)
+        self.pool_wait = Histogram('db_pool_checkout_wait_seconds', 'Time waiting to check a connection out of the pool.',
+                                   (), WAIT_BUCKETS)
+        self.metrics = [self.requests, self.latency, self.response_size, self.sql_statements,
+                        self.sql_seconds, self.sql_per_request, self.serialization, self.pool_wait]
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# --- Request-scoped accumulators ---
+
+def _endpoint_label():
+    return request.endpoint or 'unmatched'
+
+
+@contextmanager
+def serialization_timer():
+    """
+    Adds the time spent in the block to the current request's serialization time.
+    Nested uses (a schema dumping a nested schema) are only counted once.
+    """
+    if not has_request_context() or g.get('_serializing'):
+        yield
+        return
+    g._serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        g._serializing = False
+        g.serialization_time = g.get('serialization_time', 0.0) + time.perf_counter() - started
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, with jsonify() time counted as serialization time."""
+    def response(self, *args, **kwargs):
+        with serialization_timer():
+            return super().response(*args, **kwargs)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_metrics_started', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get('_metrics_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    if has_request_context():
+        g.sql_count = g.get('sql_count', 0) + 1
+        g.sql_time = g.get('sql_time', 0.0) + elapsed
+
+
+def _instrument_pool(engine, registry):
+    """
+    Wraps the engine pool's connect() to time checkouts. SQLAlchemy has no event
+    before a checkout starts waiting, so the bound method is replaced on this pool
+    instance; dispose() creates a new pool, so it is wrapped again after that.
+    """
+    pool = engine.pool
+    if getattr(pool, '_metrics_wrapped', False):
+        return
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            registry.pool_wait.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+    pool._metrics_wrapped = True
+
+
+def _may_scrape():
+    """True if the request carries METRICS_TOKEN as a bearer token or comes from METRICS_ALLOWED_IPS."""
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        scheme, _, presented = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(presented.encode(), token.encode()):
+            return True
+    return request.remote_addr in current_app.config.get('METRICS_ALLOWED_IPS', ())
+
+
+def init_metrics(app):
+    """
+    Records per-endpoint latency, response size, SQL count/time and serialization time,
+    plus connection pool checkout waits, and serves them on /metrics in Prometheus
+    text format to scrapers allowed by METRICS_TOKEN / METRICS_ALLOWED_IPS.
+    Disabled with METRICS_ENABLED=false.
+    """
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    from app.extensions import db
+
+    registry = app.extensions['metrics'] = MetricsRegistry()
+    app.json = TimedJSONProvider(app)
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _instrument_pool(engine, registry)
+            event.listen(engine, 'engine_disposed', lambda engine: _instrument_pool(engine, registry))
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('request_started')
+        if started is None:
+            return response
+        endpoint = _endpoint_label()
+        registry.requests.inc((endpoint, request.method, str(response.status_code)))
+        registry.latency.observe(time.perf_counter() - started, (endpoint, request.method))
+        if not response.is_streamed and response.content_length is not None:
+            registry.response_size.observe(response.content_length, (endpoint,))
+        sql_count = g.get('sql_count', 0)
+        registry.sql_per_request.observe(sql_count, (endpoint,))
+        if sql_count:
+            registry.sql_statements.inc((endpoint,), sql_count)
+            registry.sql_seconds.inc((endpoint,), g.get('sql_time', 0.0))
+        if 'serialization_time' in g:
+            registry.serialization.observe(g.serialization_time, (endpoint,))
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        if not _may_scrape():
+            return jsonify({"message": "Not allowed to read metrics."}), 403
+        return current_app.response_class(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
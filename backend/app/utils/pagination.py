@@ -0,0 +1,150 @@
+import base64
+import json
+from collections import namedtuple
+from datetime import datetime
+from flask import request, jsonify, current_app, abort, make_response
+from urllib.parse import urlencode
+from sqlalchemy import tuple_, literal
+
+# A single page of results plus the opaque cursors needed to fetch its neighbours.
+Page = namedtuple('Page', ['items', 'next_cursor', 'prev_cursor', 'limit'])
+
+NEXT = 'n'
+PREV = 'p'
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(values, direction=NEXT):
+    """
+    Encodes the sort key of a row (e.g. its created_at and id) into an opaque,
+    URL-safe cursor string.
+    """
+    payload = json.dumps([direction, [_encode_value(v) for v in values]], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size=2):
+    """
+    Decodes a cursor produced by encode_cursor.
+    Returns a (direction, values) tuple. Raises InvalidCursor on any malformed input.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        values = [_decode_value(v) for v in values]
+    except (ValueError, TypeError, KeyError):
+        raise InvalidCursor(cursor)
+    if direction not in (NEXT, PREV) or len(values) != size:
+        raise InvalidCursor(cursor)
+    return direction, values
+
+
+def get_page_args():
+    """
+    Reads the 'cursor' and 'limit' query parameters from the current request.
+    The limit is clamped to PAGINATION_MAX_LIMIT so clients cannot ask for the whole table.
+    """
+    default_limit = current_app.config['PAGINATION_DEFAULT_LIMIT']
+    max_limit = current_app.config['PAGINATION_MAX_LIMIT']
+    limit = request.args.get('limit', default_limit, type=int)
+    limit = max(1, min(limit or default_limit, max_limit))
+    return request.args.get('cursor') or None, limit
+
+
+def keyset_paginate(query, sort_columns, cursor=None, limit=None, key=None):
+    """
+    Applies keyset (cursor) pagination to a query, newest first.
+
+    Args:
+        query: A SQLAlchemy query that is not yet ordered or limited.
+        sort_columns: The columns forming a unique sort key, e.g.
+            (DonationRequest.created_at, DonationRequest.id).
+        cursor: An opaque cursor from a previous page, or None for the first page.
+        limit: The page size. Defaults to the value from get_page_args().
+        key: Optional function returning the sort key values of a result row.
+            Defaults to reading attributes named after the sort columns.
+    Returns:
+        A Page with the items and the cursors for the next and previous pages.
+
+    Unlike OFFSET paging, each page is a bounded index range scan starting at the
+    cursor position, so page 1,000 costs the same as page 1.
+    """
+    if limit is None:
+        request_cursor, limit = get_page_args()
+        cursor = cursor or request_cursor
+    if key is None:
+        key = lambda row: [getattr(row, col.key) for col in sort_columns]
+
+    direction = NEXT
+    position = tuple_(*sort_columns)
+    if cursor:
+        try:
+            direction, values = decode_cursor(cursor, size=len(sort_columns))
+        except InvalidCursor:
+            abort(make_response(jsonify({"message": "Invalid pagination cursor"}), 400))
+        boundary = tuple_(*[literal(v, col.type) for col, v in zip(sort_columns, values)])
+        if direction == NEXT:
+            query = query.filter(position < boundary)
+        else:
+            query = query.filter(position > boundary)
+
+    if direction == NEXT:
+        query = query.order_by(*[col.desc() for col in sort_columns])
+    else:
+        query = query.order_by(*[col.asc() for col in sort_columns])
+
+    # Fetch one extra row to find out whether another page exists in this direction.
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if direction == PREV:
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None
+
+    next_cursor = encode_cursor(key(rows[-1]), NEXT) if rows and has_next else None
+    prev_cursor = encode_cursor(key(rows[0]), PREV) if rows and has_prev else None
+    return Page(rows, next_cursor, prev_cursor, limit)
+
+
+def paginated_response(payload, page):
+    """
+    Builds a JSON response for a page of serialized items.
+    The body stays a plain JSON list; the cursors travel in the Link, X-Next-Cursor
+    and X-Prev-Cursor headers so existing clients keep working unchanged.
+    """
+    response = jsonify(payload)
+    links = []
+    if page.next_cursor:
+        response.headers['X-Next-Cursor'] = page.next_cursor
+        links.append(f'<{_page_url(page.next_cursor, page.limit)}>; rel="next"')
+    if page.prev_cursor:
+        response.headers['X-Prev-Cursor'] = page.prev_cursor
+        links.append(f'<{_page_url(page.prev_cursor, page.limit)}>; rel="prev"')
+    if links:
+        response.headers['Link'] = ', '.join(links)
+    response.headers['X-Page-Limit'] = str(page.limit)
+    return response
+
+
+def _page_url(cursor, limit):
+    args = request.args.to_dict()
+    args.update(cursor=cursor, limit=limit)
+    return f'{request.base_url}?{urlencode(args)}'
@@ -0,0 +1,94 @@
+import os
+import threading
+from flask import current_app, has_app_context, jsonify
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+DEFAULT_HASH_METHOD = f'pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}'
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when more hashes are queued than PASSWORD_HASH_MAX_PENDING allows."""
+
+
+def normalize_method(method):
+    """
+    Expands a werkzeug method string to the form it is stored under in a hash
+    ('pbkdf2:sha256' -> 'pbkdf2:sha256:600000', 'scrypt' -> 'scrypt:32768:8:1'),
+    so a stored hash can be compared against the configured cost profile.
+    """
+    parts = method.split(':')
+    if parts[0] == 'pbkdf2':
+        hash_name = parts[1] if len(parts) > 1 else 'sha256'
+        iterations = parts[2] if len(parts) > 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    if parts == ['scrypt']:
+        return 'scrypt:32768:8:1'
+    return method
+
+
+class PasswordHasher:
+    """
+    Limits how many password hashes run at once; it does not make them asynchronous.
+
+    pbkdf2 and scrypt are deliberately CPU-heavy, and the request that asked for
+    a hash still waits for it in its own thread. What this adds is a concurrency
+    limit: at most `workers` hashes (default one per core) run at a time, so a
+    login burst cannot oversubscribe the CPU and starve every other request, and
+    once `max_pending` callers are running or waiting, further ones fail fast
+    with PasswordHasherBusy (a 503) instead of piling up. hashlib releases the
+    GIL while hashing, so requests that are not hashing keep being served.
+    """
+    def __init__(self, method=DEFAULT_HASH_METHOD, workers=None, max_pending=64):
+        self.method = normalize_method(method)
+        self.workers = workers or os.cpu_count() or 1
+        self._running = threading.BoundedSemaphore(self.workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _run(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            with self._running:
+                return fn(*args, **kwargs)
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, method=self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was created with a different method or cost than the configured one."""
+        return password_hash.split('$', 1)[0] != self.method
+
+
+def init_password_hasher(app):
+    """Creates the app's password hasher from PASSWORD_HASH_* settings."""
+    app.extensions['password_hasher'] = PasswordHasher(
+        method=app.config.get('PASSWORD_HASH_METHOD', DEFAULT_HASH_METHOD),
+        workers=app.config.get('PASSWORD_HASH_WORKERS'),
+        max_pending=app.config.get('PASSWORD_HASH_MAX_PENDING', 64),
+    )
+
+    @app.errorhandler(PasswordHasherBusy)
+    def _hasher_busy(error):
+        response = jsonify({"message": "Server is busy, please try again shortly."})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+
+
+_fallback_hasher = None
+
+
+def get_password_hasher():
+    """Returns the current app's hasher, or a default one outside an app context (e.g. scripts)."""
+    global _fallback_hasher
+    if has_app_context():
+        hasher = current_app.extensions.get('password_hasher')
+        if hasher is not None:
+            return hasher
+    if _fallback_hasher is None:
+        _fallback_hasher = PasswordHasher(workers=1)
+    return _fallback_hasher
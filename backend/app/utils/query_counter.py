@@ -0,0 +1,32 @@
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """Engine event hook: counts every statement sent to the database during a request."""
+    if has_request_context():
+        g.query_count = g.get('query_count', 0) + 1
+
+
+def current_query_count():
+    """Returns the number of SQL statements issued so far in the current request."""
+    return g.get('query_count', 0)
+
+
+def init_query_counter(app):
+    """
+    Counts the SQL statements issued by each request and reports the total in an
+    X-Query-Count response header. Enabled with QUERY_COUNTER_ENABLED, so it can be
+    switched on against a seeded database to check for N+1 regressions.
+    """
+    if not app.config.get('QUERY_COUNTER_ENABLED'):
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _count_query):
+        event.listen(Engine, 'before_cursor_execute', _count_query)
+
+    @app.after_request
+    def add_query_count_header(response):
+        response.headers['X-Query-Count'] = str(current_query_count())
+        return response
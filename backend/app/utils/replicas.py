@@ -0,0 +1,201 @@
+import random
+import sqlite3
+import time
+from functools import wraps
+from flask import current_app, g, request, has_app_context, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from app.utils.cache import TTLCache
+
+# Binds named replica_0, replica_1, ... are created from SQLALCHEMY_REPLICA_URIS
+REPLICA_BIND_PREFIX = 'replica_'
+
+
+class RoutingSession(Session):
+    """
+    The app's session. Inside a view marked with @use_replica, reads go to the
+    replica engine chosen for the request; flushes and INSERT/UPDATE/DELETE
+    statements always go to the primary, and pin the rest of the request there.
+    """
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context():
+            replica = g.get('replica_engine')
+            if replica is not None:
+                if self._flushing or getattr(clause, 'is_dml', False):
+                    g.replica_engine = None
+                else:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_engines():
+    from app.extensions import db
+    return [engine for key, engine in db.engines.items()
+            if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)]
+
+
+# --- Read-your-writes ---
+# A client that just wrote is pinned to the primary for REPLICA_READ_YOUR_WRITES_SECONDS
+# on views that opt in, so it never reads a replica that has not caught up with its
+# own write yet. The pin is kept per user in this process, and handed to the client
+# as an expiry time in a cookie and a response header (REPLICA_PIN_HEADER); the
+# client sends either back, which carries the pin to the other worker processes.
+# A pin only ever routes its own client's reads to the primary, so one that is
+# tampered with costs nothing but replica offload, and expiries beyond the window
+# are ignored.
+
+def _pin_cache():
+    return current_app.extensions.get('replica_pins')
+
+
+def _current_user_id():
+    from app.utils.identity import current_identity
+    try:
+        return current_identity().user_id
+    except RuntimeError:
+        # No token was verified for this request
+        return None
+
+
+def _valid_pin(value):
+    now = time.time()
+    try:
+        return now < float(value) <= now + current_app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10)
+    except (TypeError, ValueError):
+        return False
+
+
+def _pinned_to_primary():
+    config = current_app.config
+    if _valid_pin(request.headers.get(config.get('REPLICA_PIN_HEADER', 'X-DB-Pin'))) \
+            or _valid_pin(request.cookies.get(config.get('REPLICA_PIN_COOKIE', 'db_pin'))):
+        return True
+    user_id = _current_user_id()
+    return bool(user_id) and _pin_cache().get(user_id) is not None
+
+
+def _refilling_invalidated_cache():
+    """
+    True when this view is refilling the response cache shortly after a write dropped
+    entries from it. The replica may not have that write yet, and caching what it
+    returns would serve the stale data for the whole TTL, so the primary is read.
+    """
+    if not g.get('filling_response_cache'):
+        return False
+    cache = current_app.extensions.get('response_cache')
+    window = current_app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10)
+    return cache is not None and time.monotonic() - cache.cleared_at < window
+
+
+def use_replica(read_your_writes=False):
+    """
+    Routes the reads of a read-only view to a read replica, if any are configured.
+    With `read_your_writes`, a client that wrote within the last
+    REPLICA_READ_YOUR_WRITES_SECONDS reads from the primary instead. Place it below
+    @jwt_required() so the user is known.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            engines = current_app.extensions.get('replica_engines')
+            if engines and not _refilling_invalidated_cache() and not (read_your_writes and _pinned_to_primary()):
+                g.replica_engine = random.choice(engines)
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _mark_write(session, *args):
+    session.info['replica_wrote'] = True
+
+
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['replica_wrote'] = True
+
+
+def _after_commit(session):
+    if session.info.pop('replica_wrote', False) and has_request_context():
+        g.db_wrote = True
+
+
+def _after_rollback(session):
+    session.info.pop('replica_wrote', None)
+
+
+# --- Setup ---
+
+def configure_replicas(app):
+    """Adds a replica_<n> bind for each of SQLALCHEMY_REPLICA_URIS. Call before db.init_app()."""
+    uris = app.config.get('SQLALCHEMY_REPLICA_URIS') or []
+    if uris:
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds.update((f'{REPLICA_BIND_PREFIX}{i}', uri) for i, uri in enumerate(uris))
+        app.config['SQLALCHEMY_BINDS'] = binds
+
+
+def init_replicas(app):
+    """
+    Collects the replica engines and, when there are any, tracks committed writes
+    so the writing client can be pinned to the primary. Call after db.init_app().
+    """
+    from app.extensions import db
+    with app.app_context():
+        engines = replica_engines()
+    # Flask-SQLAlchemy registers a (here always empty) metadata per bind key on the
+    # shared db object, which create_all() in an app without these binds trips over
+    for key in [key for key in db.metadatas if isinstance(key, str) and key.startswith(REPLICA_BIND_PREFIX)]:
+        del db.metadatas[key]
+    if not engines:
+        return
+    app.extensions['replica_engines'] = engines
+    window = app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 10)
+    app.extensions['replica_pins'] = TTLCache(maxsize=app.config.get('REPLICA_PIN_MAX_ENTRIES', 10000),
+                                              ttl=max(window, 0.001))
+
+    if not event.contains(RoutingSession, 'after_flush', _mark_write):
+        event.listen(RoutingSession, 'after_flush', _mark_write)
+        event.listen(RoutingSession, 'do_orm_execute', _mark_dml)
+        event.listen(RoutingSession, 'after_commit', _after_commit)
+        event.listen(RoutingSession, 'after_rollback', _after_rollback)
+
+    @app.after_request
+    def pin_writer_to_primary(response):
+        if not g.get('db_wrote') or window <= 0:
+            return response
+        user_id = _current_user_id()
+        if user_id:
+            app.extensions['replica_pins'].set(user_id, True)
+        expires = str(time.time() + window)
+        response.headers[app.config.get('REPLICA_PIN_HEADER', 'X-DB-Pin')] = expires
+        response.set_cookie(app.config.get('REPLICA_PIN_COOKIE', 'db_pin'), expires,
+                            max_age=int(window) + 1, httponly=True, samesite='Lax')
+        return response
+
+
+def sync_sqlite_replicas(app):
+    """
+    Copies the primary SQLite database over each SQLite replica with the online
+    backup API: a stand-in for replication when trying replicas locally.
+    Returns the replica paths that were refreshed.
+    """
+    primary = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if primary.get_backend_name() != 'sqlite':
+        raise ValueError('Replica sync only copies SQLite databases; use database replication for anything else.')
+    refreshed = []
+    source = sqlite3.connect(primary.database)
+    try:
+        for uri in app.config.get('SQLALCHEMY_REPLICA_URIS') or []:
+            replica = make_url(uri)
+            if replica.get_backend_name() != 'sqlite':
+                continue
+            target = sqlite3.connect(replica.database)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+            refreshed.append(replica.database)
+    finally:
+        source.close()
+    return refreshed
@@ -0,0 +1,240 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import select, insert, update, delete, func, and_, tuple_
+from app.extensions import db
+from app.models.cause_stats import CauseDailyStat, CauseDonor
+from app.models.donation import DonationRequest, Donation
+
+# Stay well below SQLite's bound-parameter limit in multi-row VALUES
+_VALUES_CHUNK = 500
+
+# Gifts older than this may predate a donor's recorded first gift (bulk ingestion);
+# a gift stamped just now never can, so those skip the check
+_BACKDATED_AFTER = timedelta(minutes=1)
+
+
+def upsert_insert(model):
+    """INSERT for the session's database dialect, with ON CONFLICT support."""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        raise NotImplementedError(f'Cause rollups need INSERT ... ON CONFLICT, which {dialect} does not support here.')
+    return dialect_insert(model)
+
+
+def _insert_new_donors(first_gifts):
+    """
+    Inserts a cause_donors row for every (cause, donor) pair not seen before.
+    Returns the pairs that were new; concurrent writers can never both count one.
+    """
+    new = []
+    pairs = list(first_gifts.items())
+    for i in range(0, len(pairs), _VALUES_CHUNK):
+        rows = [{'donation_request_id': cause_id, 'donor_id': donor_id, 'first_gift_at': first_gift_at}
+                for (cause_id, donor_id), first_gift_at in pairs[i:i + _VALUES_CHUNK]]
+        stmt = (
+            upsert_insert(CauseDonor).values(rows)
+            .on_conflict_do_nothing(index_elements=['donation_request_id', 'donor_id'])
+            .returning(CauseDonor.donation_request_id, CauseDonor.donor_id)
+        )
+        new.extend(tuple(row) for row in db.session.execute(stmt))
+    return new
+
+
+def _move_first_gifts(first_gifts):
+    """
+    For backdated gifts (bulk ingestion) from donors the cause already had, moves
+    the donor's first gift earlier when the new gift predates it.
+    Returns {(cause, donor): previous first_gift_at} for the pairs that moved.
+    """
+    moved = {}
+    pairs = list(first_gifts)
+    for i in range(0, len(pairs), _VALUES_CHUNK):
+        chunk = pairs[i:i + _VALUES_CHUNK]
+        stmt = select(CauseDonor.donation_request_id, CauseDonor.donor_id, CauseDonor.first_gift_at).where(
+            tuple_(CauseDonor.donation_request_id, CauseDonor.donor_id).in_(chunk))
+        for cause_id, donor_id, first_gift_at in db.session.execute(stmt):
+            if first_gifts[(cause_id, donor_id)] < first_gift_at:
+                moved[(cause_id, donor_id)] = first_gift_at
+    for (cause_id, donor_id), previous in moved.items():
+        db.session.execute(
+            update(CauseDonor)
+            .where(CauseDonor.donation_request_id == cause_id, CauseDonor.donor_id == donor_id)
+            .values(first_gift_at=first_gifts[(cause_id, donor_id)])
+            .execution_options(synchronize_session=False)
+        )
+    return moved
+
+
+def record_in_rollups(donations):
+    """
+    Adds newly recorded donations to the per-cause daily rollups, inside the
+    current transaction. `donations` is a list of dicts with the inserted
+    Donation column values. Each (cause, day) row is upserted with an in-database
+    increment, so concurrent donations to the same cause never lose a count.
+    """
+    days, first_gifts = {}, {}
+    for donation in donations:
+        key = (donation['donation_request_id'], donation['created_at'].date())
+        day = days.setdefault(key, [Decimal('0'), 0, 0])
+        day[0] += Decimal(str(donation['amount_donated']))
+        day[1] += 1
+        pair = (donation['donation_request_id'], donation['donor_id'])
+        if pair not in first_gifts or donation['created_at'] < first_gifts[pair]:
+            first_gifts[pair] = donation['created_at']
+
+    new_pairs = set(_insert_new_donors(first_gifts))
+    for pair in new_pairs:
+        days[(pair[0], first_gifts[pair].date())][2] += 1
+
+    backdated_before = datetime.utcnow() - _BACKDATED_AFTER
+    backdated = {pair: first_gift for pair, first_gift in first_gifts.items()
+                 if first_gift < backdated_before and pair not in new_pairs}
+    for (cause_id, donor_id), previous in _move_first_gifts(backdated).items():
+        days.setdefault((cause_id, previous.date()), [Decimal('0'), 0, 0])[2] -= 1
+        days[(cause_id, first_gifts[(cause_id, donor_id)].date())][2] += 1
+
+    stmt = upsert_insert(CauseDailyStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['donation_request_id', 'day'],
+        set_={
+            'total_donated': CauseDailyStat.total_donated + stmt.excluded.total_donated,
+            'gift_count': CauseDailyStat.gift_count + stmt.excluded.gift_count,
+            'new_donor_count': CauseDailyStat.new_donor_count + stmt.excluded.new_donor_count,
+        },
+    )
+    db.session.execute(stmt, [
+        {'donation_request_id': cause_id, 'day': day, 'total_donated': total, 'gift_count': gifts,
+         'new_donor_count': new_donors}
+        for (cause_id, day), (total, gifts, new_donors) in days.items()
+    ])
+
+
+def remove_cause_rollups(cause_ids):
+    """Deletes the rollup rows of deleted causes. The caller commits."""
+    cause_ids = list(cause_ids)
+    for i in range(0, len(cause_ids), _VALUES_CHUNK):
+        chunk = cause_ids[i:i + _VALUES_CHUNK]
+        db.session.execute(delete(CauseDailyStat).where(CauseDailyStat.donation_request_id.in_(chunk)))
+        db.session.execute(delete(CauseDonor).where(CauseDonor.donation_request_id.in_(chunk)))
+
+
+def rebuild_cause_rollups():
+    """
+    Recomputes both rollup tables from the donations table with two INSERT ... SELECT
+    statements (full scan; for seeding and repairs only). Returns the row counts.
+    The caller commits.
+    """
+    db.session.execute(delete(CauseDailyStat))
+    db.session.execute(delete(CauseDonor))
+
+    first_gifts = (
+        select(Donation.donation_request_id, Donation.donor_id, func.min(Donation.created_at))
+        .group_by(Donation.donation_request_id, Donation.donor_id)
+    )
+    db.session.execute(insert(CauseDonor).from_select(['donation_request_id', 'donor_id', 'first_gift_at'],
+                                                      first_gifts))
+
+    day = func.date(Donation.created_at)
+    daily = (
+        select(Donation.donation_request_id.label('cause_id'), day.label('day'),
+               func.sum(Donation.amount_donated).label('total_donated'), func.count().label('gift_count'))
+        .group_by(Donation.donation_request_id, day)
+        .subquery()
+    )
+    first_day = func.date(CauseDonor.first_gift_at)
+    new_donors = (
+        select(CauseDonor.donation_request_id.label('cause_id'), first_day.label('day'),
+               func.count().label('new_donor_count'))
+        .group_by(CauseDonor.donation_request_id, first_day)
+        .subquery()
+    )
+    rows = (
+        select(daily.c.cause_id, daily.c.day, daily.c.total_donated, daily.c.gift_count,
+               func.coalesce(new_donors.c.new_donor_count, 0))
+        .outerjoin(new_donors, and_(new_donors.c.cause_id == daily.c.cause_id, new_donors.c.day == daily.c.day))
+    )
+    db.session.execute(insert(CauseDailyStat).from_select(
+        ['donation_request_id', 'day', 'total_donated', 'gift_count', 'new_donor_count'], rows))
+
+    return {
+        'cause_daily_stats': db.session.scalar(select(func.count()).select_from(CauseDailyStat)),
+        'cause_donors': db.session.scalar(select(func.count()).select_from(CauseDonor)),
+    }
+
+
+# --- NGO dashboard ---
+
+def _decimal(value):
+    return Decimal(str(value or 0)).quantize(Decimal('0.01'))
+
+
+def ngo_cause_performance(ngo_id, cause_id=None):
+    """
+    Builds the NGO dashboard from the rollups alone: per-cause totals, unique
+    donors and average gift, and a daily funding curve with running totals.
+    The cost grows with the number of causes and active days, never with the
+    number of donations.
+    """
+    cause_filters = [DonationRequest.ngo_id == ngo_id]
+    if cause_id:
+        cause_filters.append(DonationRequest.id == cause_id)
+
+    totals = (
+        select(
+            CauseDailyStat.donation_request_id.label('cause_id'),
+            func.sum(CauseDailyStat.total_donated).label('total_donated'),
+            func.sum(CauseDailyStat.gift_count).label('gift_count'),
+            func.sum(CauseDailyStat.new_donor_count).label('donor_count'),
+            func.min(CauseDailyStat.day).label('first_gift_day'),
+            func.max(CauseDailyStat.day).label('last_gift_day'),
+        )
+        .join(DonationRequest, DonationRequest.id == CauseDailyStat.donation_request_id)
+        .where(*cause_filters)
+        .group_by(CauseDailyStat.donation_request_id)
+        .subquery()
+    )
+    stmt = (
+        select(DonationRequest.id, DonationRequest.title, DonationRequest.status, DonationRequest.amount_needed,
+               DonationRequest.amount_received, DonationRequest.created_at, totals)
+        .outerjoin(totals, totals.c.cause_id == DonationRequest.id)
+        .where(*cause_filters)
+        .order_by(DonationRequest.created_at.desc(), DonationRequest.id.desc())
+    )
+    causes = []
+    for row in db.session.execute(stmt):
+        total, gifts = _decimal(row.total_donated), int(row.gift_count or 0)
+        causes.append({
+            'cause_id': row.id,
+            'title': row.title,
+            'status': row.status,
+            'amount_needed': _decimal(row.amount_needed),
+            'amount_received': _decimal(row.amount_received),
+            'created_at': row.created_at,
+            'total_donated': total,
+            'gift_count': gifts,
+            'donor_count': int(row.donor_count or 0),
+            'average_gift': (total / gifts).quantize(Decimal('0.01')) if gifts else Decimal('0'),
+            'first_gift_day': row.first_gift_day,
+            'last_gift_day': row.last_gift_day,
+        })
+
+    curve = (
+        select(CauseDailyStat.day, func.sum(CauseDailyStat.total_donated), func.sum(CauseDailyStat.gift_count),
+               func.sum(CauseDailyStat.new_donor_count))
+        .join(DonationRequest, DonationRequest.id == CauseDailyStat.donation_request_id)
+        .where(*cause_filters)
+        .group_by(CauseDailyStat.day)
+        .order_by(CauseDailyStat.day)
+    )
+    funding, running = [], Decimal('0')
+    for day, total, gifts, new_donors in db.session.execute(curve):
+        total = _decimal(total)
+        running += total
+        funding.append({'day': day, 'total_donated': total, 'gift_count': int(gifts),
+                        'new_donor_count': int(new_donors), 'cumulative_donated': running})
+
+    return {'causes': causes, 'funding': funding}
@@ -0,0 +1,208 @@
+import re
+from sqlalchemy import event, text, bindparam, select, func, literal_column, table, column, Float
+from app.extensions import db
+from app.models.donation import DonationRequest
+
+# Full-text index over cause titles, descriptions and NGO names.
+# SQLite uses an FTS5 virtual table, Postgres a weighted tsvector column with a GIN index.
+# Neither fits a portable model, so the table is created with raw DDL alongside
+# db.create_all() (and by the migration), and kept in sync by the routes that
+# change causes or NGO names via index_causes()/remove_causes().
+#
+# FTS5 can only look rows up by rowid (request_id is UNINDEXED, so filtering on it
+# scans the whole index), and cause ids are UUIDs. cause_search_keys gives every
+# indexed cause a fixed integer that is its FTS rowid, so updates and deletes
+# touch only their own rows.
+SEARCH_TABLE = 'cause_search'
+_search_table = table(SEARCH_TABLE, column('request_id'), column('document'))
+
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cause_search USING fts5("
+    "request_id UNINDEXED, title, description, organization_name, tokenize='porter unicode61')",
+    "CREATE TABLE IF NOT EXISTS cause_search_keys ("
+    "id INTEGER PRIMARY KEY, request_id VARCHAR(36) NOT NULL UNIQUE)",
+]
+_SQLITE_BM25_WEIGHTS = (0.0, 10.0, 2.0, 5.0)  # request_id, title, description, organization_name
+
+_POSTGRES_DDL = [
+    "CREATE TABLE IF NOT EXISTS cause_search ("
+    "request_id VARCHAR(36) PRIMARY KEY REFERENCES donation_requests(id) ON DELETE CASCADE, "
+    "document TSVECTOR NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_cause_search_document ON cause_search USING GIN (document)",
+]
+
+_SOURCE = (
+    "FROM donation_requests dr JOIN ngo_profiles np ON np.id = dr.ngo_id "
+)
+# Keys follow creation order, which is the order a capped search walks the matches in
+_SQLITE_ADD_KEYS = (
+    "INSERT OR IGNORE INTO cause_search_keys (request_id) SELECT dr.id FROM donation_requests dr "
+    "WHERE {where} ORDER BY dr.created_at, dr.id"
+)
+# FTS5 builds its index fastest (and most compactly) from rows in rowid order
+_SQLITE_INSERT = (
+    "INSERT INTO cause_search (rowid, request_id, title, description, organization_name) "
+    "SELECT k.id, dr.id, dr.title, dr.description, np.organization_name " + _SOURCE +
+    "JOIN cause_search_keys k ON k.request_id = dr.id WHERE {where} ORDER BY k.id"
+)
+_POSTGRES_INSERT = (
+    "INSERT INTO cause_search (request_id, document) "
+    "SELECT dr.id, "
+    "setweight(to_tsvector('english', coalesce(dr.title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(np.organization_name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(dr.description, '')), 'C') " + _SOURCE
+)
+
+
+class SearchUnavailable(Exception):
+    """Raised when the database has no full-text search backend (neither SQLite nor Postgres)."""
+
+
+def _dialect(bind=None):
+    return (bind or db.session.get_bind()).dialect.name
+
+
+def _create_search_table(target, connection, **kw):
+    ddl = {'sqlite': _SQLITE_DDL, 'postgresql': _POSTGRES_DDL}.get(connection.dialect.name, [])
+    for statement in ddl:
+        connection.execute(text(statement))
+
+
+def _drop_search_table(target, connection, **kw):
+    if connection.dialect.name in ('sqlite', 'postgresql'):
+        connection.execute(text('DROP TABLE IF EXISTS cause_search'))
+        connection.execute(text('DROP TABLE IF EXISTS cause_search_keys'))
+
+
+event.listen(db.metadata, 'after_create', _create_search_table)
+event.listen(db.metadata, 'before_drop', _drop_search_table)
+
+
+def _execute(sql, params):
+    expanding = [bindparam(name, expanding=True) for name, value in params.items() if isinstance(value, list)]
+    db.session.execute(text(sql).bindparams(*expanding), params)
+
+
+def _delete_rows(dialect, where, params):
+    """Deletes the index rows of the causes selected by `where`, by rowid on SQLite."""
+    if dialect == 'sqlite':
+        _execute("DELETE FROM cause_search WHERE rowid IN (SELECT k.id FROM cause_search_keys k "
+                 f"JOIN donation_requests dr ON dr.id = k.request_id WHERE {where})", params)
+    else:
+        _execute(f"DELETE FROM cause_search WHERE request_id IN (SELECT dr.id FROM donation_requests dr WHERE {where})",
+                 params)
+
+
+def _reindex(where, **params):
+    """Replaces the index rows of the causes selected by `where` (SQL over `dr`, the donation_requests row)."""
+    dialect = _dialect()
+    if dialect not in ('sqlite', 'postgresql'):
+        return
+    # The causes may only exist in the session so far
+    db.session.flush()
+    if dialect == 'sqlite':
+        _execute(_SQLITE_ADD_KEYS.format(where=where), params)
+    _delete_rows(dialect, where, params)
+    _execute(_SQLITE_INSERT.format(where=where) if dialect == 'sqlite' else _POSTGRES_INSERT + f"WHERE {where}", params)
+
+
+def index_causes(request_ids):
+    """(Re)indexes the given causes inside the current transaction. Call after creating or editing causes."""
+    if request_ids:
+        _reindex('dr.id IN :ids', ids=list(request_ids))
+
+
+def index_ngo_causes(ngo_id):
+    """Reindexes every cause of one NGO, e.g. after its organization_name changed."""
+    _reindex('dr.ngo_id = :ngo_id', ngo_id=ngo_id)
+
+
+def remove_causes(request_ids=None, ngo_id=None):
+    """
+    Drops causes from the index, by id or all causes of one NGO.
+    Call before the rows are deleted; Postgres would cascade, but the FTS5 table cannot.
+    """
+    dialect = _dialect()
+    if dialect not in ('sqlite', 'postgresql'):
+        return
+    selections = []
+    if request_ids:
+        selections.append(('dr.id IN :ids', {'ids': list(request_ids)}))
+    if ngo_id:
+        selections.append(('dr.ngo_id = :ngo_id', {'ngo_id': ngo_id}))
+    for where, params in selections:
+        _delete_rows(dialect, where, params)
+        if dialect == 'sqlite':
+            _execute("DELETE FROM cause_search_keys WHERE request_id IN "
+                     f"(SELECT dr.id FROM donation_requests dr WHERE {where})", params)
+
+
+def rebuild_search_index():
+    """Rebuilds the whole index from donation_requests (after bulk loads or restoring a backup). The caller commits."""
+    if _dialect() not in ('sqlite', 'postgresql'):
+        raise SearchUnavailable()
+    db.session.execute(text("DELETE FROM cause_search"))
+    if _dialect() == 'sqlite':
+        db.session.execute(text("DELETE FROM cause_search_keys WHERE request_id NOT IN (SELECT id FROM donation_requests)"))
+        db.session.execute(text(_SQLITE_ADD_KEYS.format(where='1 = 1')))
+    db.session.execute(text(_SQLITE_INSERT.format(where='1 = 1') if _dialect() == 'sqlite' else _POSTGRES_INSERT))
+    return db.session.execute(text("SELECT count(*) FROM cause_search")).scalar()
+
+
+def _fts5_query(terms):
+    """
+    Turns free text into a safe FTS5 query: every word must match, and the last one
+    also matches as a prefix (search-as-you-type) once it is long enough to be selective.
+    """
+    words = re.findall(r'\w+', terms)
+    if not words:
+        return None
+    quoted = [f'"{word}"' for word in words]
+    if len(words[-1]) >= 3:
+        quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_subquery(terms, max_candidates=None, filters=(), ranked=True):
+    """
+    Returns a subquery of (request_id, search_score) for causes matching `terms`,
+    where a higher search_score means a better match, or None if `terms` has no words.
+    Join it to DonationRequest and page on (search_score, id). With ranked=False
+    it has only request_id, for callers that just need the set of matches.
+
+    Ranking costs time for every match, so a term present in most of a large
+    catalogue would rank the whole table on every page. With `max_candidates`, only
+    that many matches passing `filters` (DonationRequest clauses, e.g. from
+    approved_cause_filters()) are ranked: on SQLite the most recently added ones, on
+    Postgres the most recently created ones, so every page of a search ranks the
+    same set. Selective queries are unaffected.
+    """
+    dialect = _dialect()
+    if dialect == 'sqlite':
+        match = _fts5_query(terms)
+        if match is None:
+            return None
+        # bm25() is lower-is-better; negate it so every backend sorts descending
+        fts_table = literal_column(SEARCH_TABLE)
+        score = -func.bm25(fts_table, *_SQLITE_BM25_WEIGHTS, type_=Float)
+        condition = fts_table.op('MATCH')(match)
+        # Walking the match list in rowid order needs no sort, so LIMIT stops bm25() early
+        candidate_order = (literal_column(f'{SEARCH_TABLE}.rowid').desc(),)
+    elif dialect == 'postgresql':
+        if not re.search(r'\w', terms):
+            return None
+        query = func.websearch_to_tsquery('english', terms)
+        score = func.ts_rank_cd(_search_table.c.document, query, type_=Float)
+        condition = _search_table.c.document.op('@@')(query)
+        # A LIMIT without ORDER BY may pick a different set on every execution
+        candidate_order = (DonationRequest.created_at.desc(), DonationRequest.id.desc())
+    else:
+        raise SearchUnavailable()
+    columns = [_search_table.c.request_id] + ([score.label('search_score')] if ranked else [])
+    stmt = select(*columns).where(condition)
+    if max_candidates:
+        # Only causes the caller can return may use up the candidate slots
+        stmt = stmt.join(DonationRequest, DonationRequest.id == _search_table.c.request_id) \
+            .where(*filters) \
+            .order_by(*candidate_order).limit(max_candidates)
+    return stmt.subquery('search')
@@ -0,0 +1,237 @@
+import itertools
+import math
+import random
+import time
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import update, bindparam
+from app.extensions import db
+from app.models.user import User
+from app.models.ngo import NGOProfile
+from app.models.donor import DonorProfile
+from app.models.cause import Category
+from app.models.donation import DonationRequest, Donation
+from app.utils.password_hashing import get_password_hasher
+
+# Row counts per unit of --scale; everything grows linearly except the categories
+NGOS_PER_SCALE = 50
+DONORS_PER_SCALE = 5000
+CAUSES_PER_SCALE = 2000
+DONATIONS_PER_SCALE = 100000
+
+CATEGORIES = ('Education', 'Health', 'Environment', 'Animals', 'Shelter', 'Food Security', 'Water & Sanitation',
+              'Disaster Relief', 'Elderly Care', 'Women Empowerment', 'Arts & Culture', 'Sports')
+SEED_PASSWORD = 'password123'
+
+_NGO_APPROVED_SHARE = 0.9
+# Status of causes from approved NGOs; 'Completed' comes from funding, not from this mix
+_CAUSE_STATUSES = (('Approved', 0.78), ('Pending', 0.12), ('Rejected', 0.10))
+_DONATION_AMOUNTS = (('5.00', 6), ('10.00', 14), ('20.00', 14), ('25.00', 12), ('50.00', 16), ('75.00', 5),
+                     ('100.00', 14), ('150.00', 4), ('250.00', 7), ('500.00', 5), ('1000.00', 2), ('2500.00', 1))
+_TITLE_WORDS = (
+    ('Clean water for', 'School supplies for', 'Medical camp in', 'Winter blankets for', 'Meals for',
+     'A library for', 'Solar lamps for', 'Rebuilding homes in', 'Vaccines for', 'Scholarships for'),
+    ('rural villages', 'orphaned children', 'flood victims', 'elderly residents', 'street animals',
+     'refugee families', 'coastal communities', 'mountain schools', 'city shelters', 'young women'),
+)
+_DESCRIPTION = ('Your donation funds {what} {who}. We report on every milestone and publish receipts '
+                'for all spending, so supporters can follow the project from start to finish.')
+_FIRST_NAMES = ('Aarav', 'Maya', 'Liam', 'Zara', 'Noah', 'Emma', 'Omar', 'Ivy', 'Ravi', 'Lena', 'Kofi', 'Sofia')
+_LAST_NAMES = ('Sharma', 'Okafor', 'Smith', 'Garcia', 'Chen', 'Novak', 'Haddad', 'Silva', 'Kim', 'Mensah')
+
+
+_UUID_VERSION_MASK = ~((0xf << 76) | (0x3 << 62))
+_UUID_VERSION_BITS = (0x4 << 76) | (0x2 << 62)
+
+
+def _uuid(rng):
+    # Same as str(uuid.UUID(int=..., version=4)) without building the object, which dominates at millions of rows
+    h = '%032x' % (rng.getrandbits(128) & _UUID_VERSION_MASK | _UUID_VERSION_BITS)
+    return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+
+
+def _stamp(epoch):
+    """Formats epoch seconds the way SQLAlchemy stores DateTime on SQLite (and Postgres accepts)."""
+    return datetime.utcfromtimestamp(epoch).isoformat(' ', 'microseconds')
+
+
+class _BulkInserter:
+    """
+    Inserts tuples with the driver's executemany, skipping SQLAlchemy's per-row
+    parameter processing; values must already be strings, numbers or booleans.
+    """
+    def __init__(self, connection, table, columns):
+        compiled = table.insert().compile(dialect=connection.dialect, column_keys=list(columns))
+        self.connection, self.columns, self.sql = connection, tuple(columns), str(compiled)
+        self.positional = compiled.positional
+        if self.positional:
+            self.order = [self.columns.index(name) for name in compiled.positiontup]
+        self.rows = 0
+
+    def insert(self, rows):
+        if not rows:
+            return
+        if not self.positional:
+            rows = [dict(zip(self.columns, row)) for row in rows]
+        elif self.order != list(range(len(self.columns))):
+            rows = [tuple(row[i] for i in self.order) for row in rows]
+        self.connection.exec_driver_sql(self.sql, rows)
+        self.rows += len(rows)
+
+
+def _cumulative_zipf(count, exponent):
+    return list(itertools.accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def generate_dataset(scale=1.0, seed=1, batch_size=50000, days=365, log=print):
+    """
+    Inserts a deterministic synthetic dataset sized by `scale` (scale 1: 50 NGOs,
+    5,000 donors, 2,000 causes and 100,000 donations) into empty tables and
+    returns the row counts. The caller commits.
+
+    Donations favour popular causes and donors (Zipf), and each cause's
+    amount_received is the sum of its donations; causes that reach their target
+    are Completed. Every account's password is SEED_PASSWORD, hashed once.
+    Donations are loaded with the donations indexes dropped and rebuilt after,
+    which is several times faster than maintaining them row by row.
+    """
+    rng = random.Random(seed)
+    connection = db.session.connection()
+    # Same dates for the same day, so reruns line up with earlier exports
+    end = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    end_epoch = (end - datetime(1970, 1, 1)).total_seconds()
+    start_epoch = end_epoch - days * 86400
+    stamp = _stamp
+    now = stamp(end_epoch)
+
+    def past(after=start_epoch):
+        return after + rng.random() * (end_epoch - after)
+
+    counts = {}
+    started = time.perf_counter()
+    password_hash = get_password_hasher().hash(SEED_PASSWORD)
+
+    # --- Categories ---
+    categories = [(_uuid(rng), name, f'Causes related to {name.lower()}.', now, now) for name in CATEGORIES]
+    _BulkInserter(connection, Category.__table__, ('id', 'name', 'description', 'created_at', 'updated_at')) \
+        .insert(categories)
+    counts['categories'] = len(categories)
+
+    # --- Users and profiles ---
+    user_columns = ('id', 'username', 'email', 'password_hash', 'role', 'is_approved', 'created_at', 'updated_at')
+    users = _BulkInserter(connection, User.__table__, user_columns)
+    admin_id = _uuid(rng)
+    users.insert([(admin_id, 'admin', 'admin@example.com', password_hash, 'Admin', True, stamp(start_epoch), now)])
+
+    ngos = []  # (profile id, approved, created epoch)
+    ngo_users, ngo_profiles = [], []
+    for i in range(max(1, round(NGOS_PER_SCALE * scale))):
+        user_id, profile_id, created = _uuid(rng), _uuid(rng), past()
+        approved = rng.random() < _NGO_APPROVED_SHARE
+        ngos.append((profile_id, approved, created))
+        ngo_users.append((user_id, f'ngo{i}', f'ngo{i}@example.com', password_hash, 'NGO', approved,
+                          stamp(created), now))
+        ngo_profiles.append((profile_id, user_id, f'Organization {i}', f'Contact {i}', f'+1-555-{i % 10000:04d}',
+                             stamp(created), now))
+    users.insert(ngo_users)
+    _BulkInserter(connection, NGOProfile.__table__,
+                  ('id', 'user_id', 'organization_name', 'contact_person', 'phone_number', 'created_at', 'updated_at')) \
+        .insert(ngo_profiles)
+    counts['ngos'] = len(ngos)
+
+    donor_ids = []
+    donor_profiles = _BulkInserter(connection, DonorProfile.__table__,
+                                   ('id', 'user_id', 'first_name', 'last_name', 'created_at', 'updated_at'))
+    donor_count = max(1, round(DONORS_PER_SCALE * scale))
+    for batch_start in range(0, donor_count, batch_size):
+        donor_users, profiles = [], []
+        for i in range(batch_start, min(donor_count, batch_start + batch_size)):
+            user_id, profile_id, created = _uuid(rng), _uuid(rng), stamp(past())
+            donor_ids.append(profile_id)
+            donor_users.append((user_id, f'donor{i}', f'donor{i}@example.com', password_hash, 'Donor', True,
+                                created, now))
+            profiles.append((profile_id, user_id, rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES), created, now))
+        users.insert(donor_users)
+        donor_profiles.insert(profiles)
+    counts['users'] = users.rows
+    counts['donors'] = len(donor_ids)
+
+    # --- Causes ---
+    # Inserted unfunded; amount_received and status are filled in once the donations are known
+    causes = {}  # id -> (created epoch, amount_needed in cents, status)
+    cause_rows = []
+    statuses, status_weights = zip(*_CAUSE_STATUSES)
+    for i in range(max(1, round(CAUSES_PER_SCALE * scale))):
+        ngo_id, ngo_approved, ngo_created = rng.choice(ngos)
+        cause_id, created = _uuid(rng), past(ngo_created)
+        status = rng.choices(statuses, status_weights)[0] if ngo_approved else 'Pending'
+        needed = int(min(500000, max(500, round(math.exp(rng.gauss(8.6, 1.0)), -2)))) * 100
+        causes[cause_id] = (created, needed, status)
+        what, who = rng.choice(_TITLE_WORDS[0]), rng.choice(_TITLE_WORDS[1])
+        approved_by = admin_id if status != 'Pending' else None
+        cause_rows.append((cause_id, ngo_id, rng.choice(categories)[0], f'{what} {who}',
+                           _DESCRIPTION.format(what=what.lower(), who=who), f'{needed // 100}.00', '0.00', status,
+                           stamp(created), now, approved_by, stamp(past(created)) if approved_by else None))
+    _BulkInserter(connection, DonationRequest.__table__,
+                  ('id', 'ngo_id', 'category_id', 'title', 'description', 'amount_needed', 'amount_received',
+                   'status', 'created_at', 'updated_at', 'approved_by_admin_id', 'approval_date')).insert(cause_rows)
+    counts['causes'] = len(cause_rows)
+
+    # --- Donations ---
+    # Only approved causes take donations; popularity is independent of creation order
+    open_causes = [cause_id for cause_id, (_, _, status) in causes.items() if status == 'Approved']
+    rng.shuffle(open_causes)
+    received = dict.fromkeys(open_causes, 0)
+    cause_weights = _cumulative_zipf(len(open_causes), 1.0)
+    donor_weights = _cumulative_zipf(len(donor_ids), 0.8)
+    amounts, amount_weights = zip(*_DONATION_AMOUNTS)
+    amount_cents = {amount: int(amount.replace('.', '')) for amount in amounts}
+
+    donation_count = round(DONATIONS_PER_SCALE * scale) if open_causes else 0
+    # Each donation falls between its cause's creation and the end of the period
+    windows = {cause_id: (causes[cause_id][0], end_epoch - causes[cause_id][0]) for cause_id in open_causes}
+    donations_started = time.perf_counter()
+    indexes = list(Donation.__table__.indexes)
+    for index in indexes:
+        index.drop(connection)
+    donations = _BulkInserter(connection, Donation.__table__,
+                              ('id', 'donor_id', 'donation_request_id', 'amount_donated', 'created_at', 'updated_at'))
+    for batch_start in range(0, donation_count, batch_size):
+        size = min(batch_size, donation_count - batch_start)
+        batch_causes = rng.choices(open_causes, cum_weights=cause_weights, k=size)
+        batch_donors = rng.choices(donor_ids, cum_weights=donor_weights, k=size)
+        batch_amounts = rng.choices(amounts, amount_weights, k=size)
+        rows = []
+        for cause_id, donor_id, amount in zip(batch_causes, batch_donors, batch_amounts):
+            received[cause_id] += amount_cents[amount]
+            opened, window = windows[cause_id]
+            rows.append((_uuid(rng), donor_id, cause_id, amount, stamp(opened + rng.random() * window), now))
+        # Primary key order touches far fewer B-tree pages than random UUID order
+        rows.sort()
+        donations.insert(rows)
+        log(f'  donations: {donations.rows}/{donation_count}')
+    for index in indexes:
+        index.create(connection)
+    counts['donations'] = donations.rows
+    counts['donation_seconds'] = round(time.perf_counter() - donations_started, 2)
+
+    # --- Funding totals ---
+    funded = []
+    for cause_id, cents in received.items():
+        if not cents:
+            continue
+        _, needed, status = causes[cause_id]
+        if cents >= needed:
+            needed, status = cents, 'Completed'
+        funded.append({'b_id': cause_id, 'b_received': Decimal(cents) / 100, 'b_needed': Decimal(needed) / 100,
+                       'b_status': status})
+    if funded:
+        table = DonationRequest.__table__
+        db.session.execute(
+            update(table).where(table.c.id == bindparam('b_id')).values(
+                amount_received=bindparam('b_received'), amount_needed=bindparam('b_needed'),
+                status=bindparam('b_status')),
+            funded)
+
+    counts['seconds'] = round(time.perf_counter() - started, 2)
+    return counts
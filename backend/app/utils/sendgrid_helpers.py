@@ -0,0 +1,368 @@
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from flask import current_app
+from sqlalchemy import update, select, insert, delete, literal, or_, and_
+from app.extensions import db
+from app.models.donation import DonationRequest, Donation
+from app.models.donor import DonorProfile
+from app.models.ngo import NGOProfile
+from app.models.outbox import OutboxEmail
+from app.models.user import User
+from app.utils.cache import on_commit
+from app.utils.email_transports import TransportError, create_transport
+from app.utils.workers import WorkerPool, backoff_delay, wake_pool
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's bound-parameter limit when selecting rows with IN (...)
+_IN_CHUNK = 500
+
+
+def _chunks(values, size=_IN_CHUNK):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+# --- Queueing (runs inside the caller's transaction) ---
+
+def _enabled():
+    return current_app.config.get('EMAIL_NOTIFICATIONS_ENABLED', True)
+
+
+def _first_attempt_at(now):
+    # Held back briefly so a burst for one recipient goes out as a single email
+    return now + timedelta(seconds=current_app.config.get('EMAIL_COALESCE_SECONDS', 30))
+
+
+def _wake_sender_on_commit():
+    on_commit(wake_pool, current_app._get_current_object(), 'email_sender')
+
+
+def queue_email(kind, recipient, object_id=None, context=None):
+    """Adds one outbox row to the current transaction; it is sent after the caller commits."""
+    if not _enabled() or not recipient:
+        return
+    now = datetime.utcnow()
+    db.session.add(OutboxEmail(kind=kind, recipient=recipient, object_id=object_id, context=context,
+                               status='Pending', attempts=0, next_attempt_at=_first_attempt_at(now), created_at=now))
+    _wake_sender_on_commit()
+
+
+def _queue_from_select(kind, select_stmt):
+    """Queues one `kind` email per row of `select_stmt`, which yields (recipient, object_id), in one INSERT ... SELECT."""
+    now = datetime.utcnow()
+    stmt = insert(OutboxEmail).from_select(
+        ['kind', 'recipient', 'object_id', 'status', 'attempts', 'next_attempt_at', 'created_at'],
+        select_stmt.with_only_columns(
+            literal(kind), *select_stmt.selected_columns, literal('Pending'), literal(0),
+            literal(_first_attempt_at(now), db.DateTime), literal(now, db.DateTime),
+        ),
+    )
+    db.session.execute(stmt)
+
+
+def queue_donation_receipts(donation_ids):
+    """
+    Queues a receipt to the donor of each donation. The recipients are joined in
+    SQL, so this costs one INSERT ... SELECT per 500 donations and no reads.
+    """
+    if not _enabled() or not donation_ids:
+        return
+    for chunk in _chunks(donation_ids):
+        _queue_from_select('donation_receipt', select(User.email, Donation.id)
+                           .select_from(Donation)
+                           .join(DonorProfile, DonorProfile.id == Donation.donor_id)
+                           .join(User, User.id == DonorProfile.user_id)
+                           .where(Donation.id.in_(chunk)))
+    _wake_sender_on_commit()
+
+
+def queue_cause_completed(request_ids):
+    """Queues a 'fully funded' notice to the NGO behind each request."""
+    if not _enabled() or not request_ids:
+        return
+    for chunk in _chunks(request_ids):
+        _queue_from_select('cause_completed', select(User.email, DonationRequest.id)
+                           .select_from(DonationRequest)
+                           .join(NGOProfile, NGOProfile.id == DonationRequest.ngo_id)
+                           .join(User, User.id == NGOProfile.user_id)
+                           .where(DonationRequest.id.in_(chunk)))
+    _wake_sender_on_commit()
+
+
+# --- Rendering ---
+
+def _money(value):
+    return f"{float(value):,.2f}"
+
+
+def _render_ngo_approved(row, _):
+    name = (row.context or {}).get('name', 'there')
+    return ("Your NGO account has been approved",
+            f"Hi {name},\n\nYour NGO account has been approved. You can now sign in and create causes.")
+
+
+def _render_ngo_rejected(row, _):
+    name = (row.context or {}).get('name', 'there')
+    return ("Your NGO registration was not approved",
+            f"Hi {name},\n\nYour NGO registration was reviewed and not approved, and the account has been removed.")
+
+
+def _render_donation_receipt(row, lookups):
+    donation = lookups['donation_receipt'].get(row.object_id)
+    if donation is None:
+        return None
+    amount, created_at, transaction_id, title = donation
+    lines = [f"Thank you for your donation of {_money(amount)} to \"{title}\" on {created_at:%Y-%m-%d}."]
+    if transaction_id:
+        lines.append(f"Transaction: {transaction_id}")
+    return f"Receipt for your donation to {title}", "\n".join(lines)
+
+
+def _render_cause_completed(row, lookups):
+    cause = lookups['cause_completed'].get(row.object_id)
+    if cause is None:
+        return None
+    title, received = cause
+    return (f"\"{title}\" is fully funded",
+            f"Good news: \"{title}\" has reached its goal with {_money(received)} raised.")
+
+
+_RENDERERS = {
+    'ngo_approved': _render_ngo_approved,
+    'ngo_rejected': _render_ngo_rejected,
+    'donation_receipt': _render_donation_receipt,
+    'cause_completed': _render_cause_completed,
+}
+
+
+def _load_lookups(rows):
+    """Fetches what the templates need for a whole batch with one query per kind."""
+    ids = {}
+    for row in rows:
+        ids.setdefault(row.kind, set()).add(row.object_id)
+    lookups = {'donation_receipt': {}, 'cause_completed': {}}
+    for chunk in _chunks(ids.get('donation_receipt', ())):
+        stmt = select(Donation.id, Donation.amount_donated, Donation.created_at, Donation.transaction_id,
+                      DonationRequest.title) \
+            .join(DonationRequest, DonationRequest.id == Donation.donation_request_id).where(Donation.id.in_(chunk))
+        lookups['donation_receipt'].update((r[0], tuple(r[1:])) for r in db.session.execute(stmt))
+    for chunk in _chunks(ids.get('cause_completed', ())):
+        stmt = select(DonationRequest.id, DonationRequest.title, DonationRequest.amount_received) \
+            .where(DonationRequest.id.in_(chunk))
+        lookups['cause_completed'].update((r[0], tuple(r[1:])) for r in db.session.execute(stmt))
+    return lookups
+
+
+def build_message(recipient, rendered):
+    """One EmailMessage for a recipient; several notifications are combined into a digest."""
+    message = EmailMessage()
+    message['From'] = current_app.config.get('EMAIL_FROM')
+    message['To'] = recipient
+    if len(rendered) == 1:
+        subject, body = rendered[0]
+    else:
+        subject = f"{len(rendered)} updates on your account"
+        body = "\n\n----------\n\n".join(f"{s}\n\n{b}" for s, b in rendered)
+    message['Subject'] = subject
+    message.set_content(body)
+    return message
+
+
+# --- Sending ---
+
+class RateLimiter:
+    """Token bucket shared by a process's sender threads: `rate` sends per second, bursts up to `burst`."""
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _due(now):
+    return or_(
+        and_(OutboxEmail.status == 'Pending', OutboxEmail.next_attempt_at <= now),
+        # A sender died holding it
+        and_(OutboxEmail.status == 'Sending', OutboxEmail.locked_until < now),
+    )
+
+
+def claim_batch(limit):
+    """
+    Marks up to `limit` due rows as Sending under a fresh claim token and commits,
+    together with every other never-attempted Pending row for the same recipients
+    so they can be coalesced now rather than sent separately later (rows waiting
+    out a retry backoff keep waiting). Returns the claimed rows. The UPDATE only
+    matches rows that are still claimable, so concurrent senders never get the
+    same row.
+    """
+    now = datetime.utcnow()
+    lease = timedelta(seconds=current_app.config.get('EMAIL_LEASE', 300))
+    candidates = db.session.execute(
+        select(OutboxEmail.id, OutboxEmail.recipient).where(_due(now)).order_by(OutboxEmail.next_attempt_at).limit(limit)
+    ).all()
+    if not candidates:
+        db.session.rollback()
+        return []
+    token = str(uuid.uuid4())
+    db.session.execute(
+        update(OutboxEmail)
+        .where(or_(
+            and_(OutboxEmail.id.in_([c.id for c in candidates]), _due(now)),
+            and_(OutboxEmail.status == 'Pending', OutboxEmail.attempts == 0,
+                 OutboxEmail.recipient.in_({c.recipient for c in candidates})),
+        ))
+        .values(status='Sending', attempts=OutboxEmail.attempts + 1, locked_until=now + lease, claim_token=token)
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.session.execute(
+        select(OutboxEmail.id, OutboxEmail.kind, OutboxEmail.recipient, OutboxEmail.object_id,
+               OutboxEmail.context, OutboxEmail.attempts, OutboxEmail.claim_token)
+        .where(OutboxEmail.claim_token == token).order_by(OutboxEmail.id)
+    ).all()
+    db.session.commit()
+    return rows
+
+
+def _mark_sent(rows):
+    """Marks claimed rows Sent. Rows re-claimed by another sender since (a new claim token) are left alone."""
+    db.session.execute(
+        update(OutboxEmail).where(OutboxEmail.id.in_([row.id for row in rows]),
+                                  OutboxEmail.claim_token == rows[0].claim_token)
+        .values(status='Sent', sent_at=datetime.utcnow(), locked_until=None, claim_token=None, last_error=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _mark_failed(rows, error, permanent=False):
+    """
+    Reschedules each row with backoff, or fails it for good once it is out of
+    attempts, unless another sender has re-claimed it since.
+    """
+    config = current_app.config
+    now = datetime.utcnow()
+    message = str(error)[:2000]
+    for row in rows:
+        values = dict(locked_until=None, claim_token=None, last_error=message)
+        if permanent or row.attempts >= config.get('EMAIL_MAX_ATTEMPTS', 8):
+            values.update(status='Failed')
+        else:
+            delay = backoff_delay(row.attempts, config.get('EMAIL_RETRY_BACKOFF', 30),
+                                  config.get('EMAIL_RETRY_BACKOFF_MAX', 3600))
+            values.update(status='Pending', next_attempt_at=now + timedelta(seconds=delay))
+        db.session.execute(update(OutboxEmail)
+                           .where(OutboxEmail.id == row.id, OutboxEmail.claim_token == row.claim_token)
+                           .values(**values).execution_options(synchronize_session=False))
+
+
+def send_due_batch(limit=None):
+    """
+    Claims a batch of due emails, renders them, combines them per recipient and
+    sends one message per recipient through the rate-limited transport.
+    No transaction is held open while sending. Returns the number of rows handled.
+    """
+    config = current_app.config
+    rows = claim_batch(limit or config.get('EMAIL_BATCH_SIZE', 100))
+    if not rows:
+        return 0
+
+    lookups = _load_lookups(rows)
+    groups, missing = {}, []
+    for row in rows:
+        rendered = _RENDERERS[row.kind](row, lookups) if row.kind in _RENDERERS else None
+        if rendered is None:
+            missing.append(row)
+        else:
+            groups.setdefault(row.recipient, []).append((row, rendered))
+    if missing:
+        # What the email was about was deleted before it went out
+        _mark_failed(missing, "Nothing to send: the subject of this email no longer exists", permanent=True)
+    db.session.commit()
+
+    transport = get_transport()
+    limiter = current_app.extensions.get('email_rate_limiter')
+    for recipient, items in groups.items():
+        group_rows = [row for row, _ in items]
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            transport.send(build_message(recipient, [rendered for _, rendered in items]))
+        except TransportError as e:
+            logger.warning("Email to %s failed (%s messages): %s", recipient, len(group_rows), e)
+            _mark_failed(group_rows, e, permanent=e.permanent)
+        except Exception as e:
+            logger.exception("Email to %s failed", recipient)
+            _mark_failed(group_rows, f'{type(e).__name__}: {e}')
+        else:
+            _mark_sent(group_rows)
+        db.session.commit()
+    return len(rows)
+
+
+def send_all_due():
+    """Sends batches until nothing is due. Returns the number of rows handled."""
+    total = 0
+    while True:
+        handled = send_due_batch()
+        if not handled:
+            return total
+        total += handled
+
+
+def purge_sent(older_than_days):
+    """Deletes Sent rows older than `older_than_days`. The caller commits. Returns the count."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    return db.session.execute(
+        delete(OutboxEmail).where(OutboxEmail.status == 'Sent', OutboxEmail.sent_at < cutoff)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def get_transport():
+    return current_app.extensions['email_transport']
+
+
+class EmailSenderPool(WorkerPool):
+    """Threads that drain the email outbox one batch at a time (see WorkerPool)."""
+    def __init__(self, app, workers=1, poll_interval=10.0):
+        super().__init__(app, send_due_batch, workers, poll_interval, name='email-sender')
+
+
+def init_email(app):
+    """
+    Sets up the email transport (EMAIL_TRANSPORT), the per-process send rate limit
+    and the in-process sender threads (EMAIL_SENDER_WORKERS; 0 leaves the outbox
+    to `flask emails send`).
+    """
+    app.extensions['email_transport'] = create_transport(app.config)
+    app.extensions['email_rate_limiter'] = RateLimiter(app.config.get('EMAIL_RATE_LIMIT', 10),
+                                                       app.config.get('EMAIL_RATE_BURST'))
+
+    workers = app.config.get('EMAIL_SENDER_WORKERS', 1)
+    if workers > 0 and not app.testing:
+        pool = app.extensions['email_sender'] = EmailSenderPool(app, workers, app.config.get('EMAIL_POLL_INTERVAL', 10))
+
+        @app.before_request
+        def start_email_sender():
+            pool.ensure_started()
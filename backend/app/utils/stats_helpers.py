@@ -0,0 +1,75 @@
+import random
+from datetime import datetime
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import select, insert, delete, func
+from app.extensions import db
+from app.models.stats import DashboardStat
+from app.models.user import User
+from app.models.donation import Donation
+from app.utils.rollup_helpers import upsert_insert
+
+TOTAL_NGOS = 'total_ngos'
+PENDING_APPROVALS = 'pending_approvals'
+TOTAL_DONATIONS = 'total_donations'
+
+STAT_NAMES = (TOTAL_NGOS, PENDING_APPROVALS, TOTAL_DONATIONS)
+
+
+def pick_shard():
+    """A random shard number below COUNTER_SHARDS for the next write to a sharded counter row."""
+    return random.randrange(max(current_app.config['COUNTER_SHARDS'], 1))
+
+
+def bump_stat(name, delta):
+    """
+    Adjusts a dashboard counter by `delta` inside the current transaction.
+    Adds to one random shard of the counter with an in-database upsert, so
+    concurrent writers neither overwrite each other nor all queue on one row.
+    The caller commits.
+    """
+    if not delta:
+        return
+    stmt = upsert_insert(DashboardStat)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['name', 'shard'],
+        set_={'value': DashboardStat.value + stmt.excluded.value, 'updated_at': stmt.excluded.updated_at},
+    )
+    db.session.execute(stmt, {'name': name, 'shard': pick_shard(), 'value': delta, 'updated_at': datetime.utcnow()})
+
+
+def get_stats():
+    """Returns every dashboard counter as a {name: Decimal} dict, summing each one's shards in one query."""
+    stmt = select(DashboardStat.name, func.sum(DashboardStat.value)) \
+        .where(DashboardStat.name.in_(STAT_NAMES)).group_by(DashboardStat.name)
+    stats = {name: Decimal('0') for name in STAT_NAMES}
+    stats.update({name: Decimal(str(value or 0)).quantize(Decimal('0.01')) for name, value in db.session.execute(stmt)})
+    return stats
+
+
+def compute_stats():
+    """Recomputes every dashboard counter from the base tables (full scans; for rebuilds only)."""
+    return {
+        TOTAL_NGOS: Decimal(User.query.filter_by(role='NGO').count()),
+        PENDING_APPROVALS: Decimal(User.query.filter_by(role='NGO', is_approved=False).count()),
+        TOTAL_DONATIONS: Decimal(str(db.session.query(func.sum(Donation.amount_donated)).scalar() or 0)),
+    }
+
+
+def rebuild_stats():
+    """
+    Overwrites the stored counters with freshly computed values, folding each
+    one's shards back into a single row.
+    Returns a {name: (stored, actual)} dict of every counter that had drifted.
+    The caller commits.
+    """
+    stored = get_stats()
+    actual = compute_stats()
+    drift = {}
+    for name, value in actual.items():
+        value = value.quantize(Decimal('0.01'))
+        if stored[name].quantize(Decimal('0.01')) != value:
+            drift[name] = (stored[name], value)
+        db.session.execute(delete(DashboardStat).where(DashboardStat.name == name))
+        db.session.execute(insert(DashboardStat).values(name=name, shard=0, value=value, updated_at=datetime.utcnow()))
+    return drift
@@ -0,0 +1,259 @@
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app, send_from_directory, abort
+from sqlalchemy import update, select, or_, and_
+from werkzeug.utils import secure_filename
+from app.extensions import db
+from app.models.donation import DonationRequest
+from app.models.upload import UploadJob
+from app.utils.cache import invalidate_cause, on_commit
+from app.utils.uploaders import create_uploader, get_uploader
+from app.utils.workers import WorkerPool, backoff_delay, wake_pool
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+
+class UploadRejected(Exception):
+    """Raised when an upload cannot be queued; carries the HTTP status to answer with."""
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+# --- Request side ---
+
+def enqueue_image_upload(donation_request_id, file):
+    """
+    Stages `file` (a werkzeug FileStorage) on local disk and queues an UploadJob
+    for it in the current transaction. Workers are woken once the caller commits.
+    Raises UploadRejected for a missing, oversized or non-image file.
+    """
+    config = current_app.config
+    if file is None or not file.filename:
+        raise UploadRejected("No image file provided. Send it as multipart form field 'image'.")
+    filename = secure_filename(file.filename)
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in ALLOWED_IMAGE_EXTENSIONS:
+        raise UploadRejected(f"Unsupported image type. Use one of: {', '.join(sorted(ALLOWED_IMAGE_EXTENSIONS))}.")
+
+    job_id = str(uuid.uuid4())
+    staging_dir = config['UPLOAD_STAGING_DIR']
+    os.makedirs(staging_dir, exist_ok=True)
+    staged_path = os.path.join(staging_dir, job_id + extension)
+    max_bytes = config['UPLOAD_MAX_BYTES']
+    # Copy in chunks so an oversized file is refused without reading all of it
+    size = 0
+    with open(staged_path, 'wb') as staged:
+        while size <= max_bytes:
+            chunk = file.stream.read(64 * 1024)
+            if not chunk:
+                break
+            size += len(chunk)
+            staged.write(chunk)
+    if size == 0 or size > max_bytes:
+        remove_staged(staged_path)
+        if size == 0:
+            raise UploadRejected("The image file is empty.")
+        raise UploadRejected(f"Image is larger than {max_bytes // (1024 * 1024)} MB.", 413)
+
+    job = UploadJob(id=job_id, donation_request_id=donation_request_id, filename=filename,
+                    staged_path=staged_path, max_attempts=config['UPLOAD_MAX_ATTEMPTS'])
+    db.session.add(job)
+    on_commit(wake_pool, current_app._get_current_object(), 'upload_workers')
+    return job
+
+
+def cancel_uploads(request_ids=None, ngo_id=None):
+    """
+    Drops the upload jobs of the given causes, or of all causes of one NGO, and
+    on commit their staged files. Call before deleting the causes.
+    """
+    query = UploadJob.query
+    if request_ids:
+        query = query.filter(UploadJob.donation_request_id.in_(list(request_ids)))
+    elif ngo_id:
+        query = query.join(DonationRequest, DonationRequest.id == UploadJob.donation_request_id) \
+            .filter(DonationRequest.ngo_id == ngo_id)
+    else:
+        return
+    for job in query.all():
+        if job.status != 'Succeeded':
+            on_commit(remove_staged, job.staged_path)
+        db.session.delete(job)
+
+
+def remove_staged(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# --- Worker side ---
+
+def _due(now):
+    return or_(
+        and_(UploadJob.status == 'Queued', UploadJob.next_attempt_at <= now),
+        # A worker died holding it
+        and_(UploadJob.status == 'Running', UploadJob.locked_until < now),
+    )
+
+
+def claim_next_job():
+    """
+    Atomically marks the next due job as Running for UPLOAD_JOB_LEASE seconds and
+    commits. Returns (job id, donation request id, staged path, attempt number,
+    max attempts), or None when nothing is due. The UPDATE only matches a job
+    that is still due, so concurrent workers can never claim the same job.
+    """
+    now = datetime.utcnow()
+    lease = timedelta(seconds=current_app.config['UPLOAD_JOB_LEASE'])
+    candidates = db.session.execute(
+        select(UploadJob.id).where(_due(now)).order_by(UploadJob.next_attempt_at).limit(5)
+    ).scalars().all()
+    for job_id in candidates:
+        claimed = db.session.execute(
+            update(UploadJob).where(UploadJob.id == job_id, _due(now))
+            .values(status='Running', attempts=UploadJob.attempts + 1, locked_until=now + lease, updated_at=now)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if claimed:
+            row = db.session.execute(
+                select(UploadJob.id, UploadJob.donation_request_id, UploadJob.staged_path,
+                       UploadJob.attempts, UploadJob.max_attempts).where(UploadJob.id == job_id)
+            ).one()
+            db.session.commit()
+            return tuple(row)
+    db.session.rollback()
+    return None
+
+
+def retry_delay(attempt, config):
+    """Exponential backoff with jitter: about UPLOAD_RETRY_BACKOFF * 2^(attempt-1), capped."""
+    return backoff_delay(attempt, config['UPLOAD_RETRY_BACKOFF'], config['UPLOAD_RETRY_BACKOFF_MAX'])
+
+
+def _holds_lease(job_id, attempt):
+    """Matches the job only while it is still Running under this worker's claim (attempt number)."""
+    return and_(UploadJob.id == job_id, UploadJob.status == 'Running', UploadJob.attempts == attempt)
+
+
+def process_job(job_id, request_id, staged_path, attempt, max_attempts):
+    """
+    Uploads one claimed job and records the outcome. No transaction is open during
+    the upload. The outcome is only written while this worker still holds the job:
+    if its lease ran out and another worker re-claimed it, or the job was cancelled,
+    the result is dropped and the current holder's write wins.
+    """
+    extension = os.path.splitext(staged_path)[1]
+    try:
+        if not os.path.exists(staged_path):
+            raise FileNotFoundError(f"Staged file {staged_path} is missing")
+        url = get_uploader().upload(staged_path, f'{request_id}/{job_id}{extension}')
+    except Exception as e:
+        _record_failure(job_id, attempt, max_attempts, e, permanent=isinstance(e, FileNotFoundError))
+        return False
+
+    now = datetime.utcnow()
+    finished = db.session.execute(
+        update(UploadJob).where(_holds_lease(job_id, attempt))
+        .values(status='Succeeded', result_url=url, last_error=None, locked_until=None, finished_at=now,
+                updated_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not finished:
+        db.session.rollback()
+        logger.warning("Upload job %s attempt %s lost its claim; dropping its result %s", job_id, attempt, url)
+        return False
+    updated = db.session.execute(
+        update(DonationRequest).where(DonationRequest.id == request_id).values(image_url=url)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not updated:
+        # The cause was deleted while the file was uploading
+        db.session.rollback()
+        remove_staged(staged_path)
+        return False
+    invalidate_cause(request_id)
+    db.session.commit()
+    remove_staged(staged_path)
+    return True
+
+
+def _record_failure(job_id, attempt, max_attempts, error, permanent=False):
+    """Requeues the job with backoff, or fails it for good, if this worker still holds it."""
+    config = current_app.config
+    now = datetime.utcnow()
+    last_error = f'{type(error).__name__}: {error}'[:2000]
+    failed = permanent or attempt >= max_attempts
+    if failed:
+        values = dict(status='Failed', finished_at=now)
+    else:
+        values = dict(status='Queued', next_attempt_at=now + timedelta(seconds=retry_delay(attempt, config)))
+    staged_path = db.session.execute(
+        update(UploadJob).where(_holds_lease(job_id, attempt))
+        .values(last_error=last_error, locked_until=None, updated_at=now, **values)
+        .returning(UploadJob.staged_path)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if staged_path is None:
+        # Cancelled, or re-claimed by another worker after this one's lease ran out
+        db.session.rollback()
+        return
+    db.session.commit()
+    if failed:
+        logger.warning("Upload job %s failed after %s attempts: %s", job_id, attempt, last_error)
+        remove_staged(staged_path)
+    else:
+        logger.info("Upload job %s attempt %s failed, retrying at %s: %s",
+                    job_id, attempt, values['next_attempt_at'], last_error)
+
+
+def run_due_jobs(limit=None):
+    """Processes due jobs one at a time until none is due (or `limit` were processed). Returns the count."""
+    processed = 0
+    while limit is None or processed < limit:
+        claimed = claim_next_job()
+        if claimed is None:
+            break
+        process_job(*claimed)
+        processed += 1
+    return processed
+
+
+class UploadWorkerPool(WorkerPool):
+    """Threads that drain the upload queue one job at a time (see WorkerPool)."""
+    def __init__(self, app, workers=2, poll_interval=5.0):
+        super().__init__(app, lambda: run_due_jobs(limit=1), workers, poll_interval, name='upload-worker')
+
+
+def init_uploads(app):
+    """
+    Sets up the uploader from UPLOAD_BACKEND and the in-process upload workers
+    (UPLOAD_WORKERS; 0 leaves the queue to `flask uploads work`). With the local
+    backend, files are also served from LOCAL_UPLOAD_URL.
+    """
+    app.extensions['uploader'] = create_uploader(app.config)
+
+    workers = app.config.get('UPLOAD_WORKERS', 2)
+    if workers > 0 and not app.testing:
+        pool = app.extensions['upload_workers'] = UploadWorkerPool(
+            app, workers, app.config.get('UPLOAD_POLL_INTERVAL', 5))
+
+        @app.before_request
+        def start_upload_workers():
+            pool.ensure_started()
+
+    base_url = app.config.get('LOCAL_UPLOAD_URL', '/uploads')
+    if app.config.get('UPLOAD_BACKEND') == 'local' and base_url.startswith('/'):
+        @app.route(base_url.rstrip('/') + '/<path:filename>', methods=['GET'])
+        def local_upload(filename):
+            directory = app.config['LOCAL_UPLOAD_DIR']
+            if not os.path.isdir(directory):
+                abort(404)
+            return send_from_directory(directory, filename, max_age=86400)
@@ -0,0 +1,81 @@
+import os
+import shutil
+import threading
+from flask import current_app
+
+
+class UploadError(Exception):
+    """Raised by an Uploader when the file could not be stored; the job is retried."""
+
+
+class Uploader:
+    """
+    Stores a staged local file somewhere public and returns its URL.
+    Implementations must be safe to call from several worker threads at once.
+    """
+    def upload(self, path, key):
+        """Uploads the file at `path` under `key` (e.g. '<request id>/<job id>.jpg') and returns its URL."""
+        raise NotImplementedError
+
+
+class LocalUploader(Uploader):
+    """Copies files into a local directory served at `base_url`. For development, tests and benchmarks."""
+    def __init__(self, directory, base_url='/uploads'):
+        self.directory = directory
+        self.base_url = base_url.rstrip('/')
+
+    def upload(self, path, key):
+        target = os.path.join(self.directory, *key.split('/'))
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(path, target)
+        except OSError as e:
+            raise UploadError(str(e)) from e
+        return f'{self.base_url}/{key}'
+
+
+class CloudinaryUploader(Uploader):
+    """
+    Uploads to Cloudinary. The SDK is imported and configured once, on the first
+    upload rather than at startup, so web processes that never upload skip it.
+    """
+    def __init__(self, cloud_name, api_key, api_secret, folder='charity_requests', timeout=60):
+        self.credentials = dict(cloud_name=cloud_name, api_key=api_key, api_secret=api_secret)
+        self.folder = folder
+        self.timeout = timeout
+        self._upload = None
+        self._lock = threading.Lock()
+
+    def _sdk_upload(self):
+        if self._upload is None:
+            with self._lock:
+                if self._upload is None:
+                    import cloudinary
+                    import cloudinary.uploader
+                    cloudinary.config(secure=True, **self.credentials)
+                    self._upload = cloudinary.uploader.upload
+        return self._upload
+
+    def upload(self, path, key):
+        public_id = os.path.splitext(key)[0]
+        try:
+            result = self._sdk_upload()(path, folder=self.folder, public_id=public_id, overwrite=True,
+                                        timeout=self.timeout)
+        except Exception as e:
+            raise UploadError(f"Cloudinary upload failed: {e}") from e
+        return result['secure_url']
+
+
+def create_uploader(config):
+    """Builds the uploader named by UPLOAD_BACKEND ('cloudinary' or 'local')."""
+    backend = config.get('UPLOAD_BACKEND', 'local')
+    if backend == 'cloudinary':
+        return CloudinaryUploader(config.get('CLOUDINARY_CLOUD_NAME'), config.get('CLOUDINARY_API_KEY'),
+                                  config.get('CLOUDINARY_API_SECRET'), timeout=config.get('UPLOAD_TIMEOUT', 60))
+    if backend == 'local':
+        return LocalUploader(config['LOCAL_UPLOAD_DIR'], config.get('LOCAL_UPLOAD_URL', '/uploads'))
+    raise ValueError(f"Unknown UPLOAD_BACKEND {backend!r}; use 'cloudinary' or 'local'.")
+
+
+def get_uploader():
+    return current_app.extensions['uploader']
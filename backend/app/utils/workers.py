@@ -0,0 +1,72 @@
+import logging
+import random
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt, base, cap):
+    """Exponential backoff with jitter: about base * 2^(attempt-1) seconds, capped at `cap`."""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class WorkerPool:
+    """
+    Background threads that drain a database-backed queue. Each one calls `work()`
+    inside an app context; `work` returns how many items it processed. When it
+    processed none, the thread sleeps until woken (after a commit queued new work)
+    or until `poll_interval` passes, to pick up retries and work queued by other
+    processes. Threads start on first use in each process, so forking servers get
+    their own.
+    """
+    def __init__(self, app, work, workers=1, poll_interval=5.0, name='worker'):
+        self.app = app
+        self.work = work
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.name = name
+        self._threads = []
+        self._lock = threading.Lock()
+        self._wake = threading.Condition()
+        self._stopping = False
+
+    def ensure_started(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            self._threads = [threading.Thread(target=self._run, name=f'{self.name}-{i}', daemon=True)
+                             for i in range(self.workers)]
+            for thread in self._threads:
+                thread.start()
+
+    def wake(self):
+        with self._wake:
+            self._wake.notify_all()
+
+    def stop(self, timeout=None):
+        self._stopping = True
+        self.wake()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                with self.app.app_context():
+                    processed = self.work()
+            except Exception:
+                logger.exception("%s error", self.name)
+                processed = 0
+            if not processed and not self._stopping:
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+
+
+def wake_pool(app, name):
+    """after-commit callback: wakes the pool stored as app.extensions[name], if this process runs one."""
+    pool = app.extensions.get(name)
+    if pool is not None:
+        pool.wake()
@@ -0,0 +1,133 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Every benchmark runs the real Flask app in-process against its own throwaway
+SQLite database (or DATABASE_URL if BENCH_DATABASE_URL is set), so they never
+touch backend/app.db.
+"""
+import atexit
+import os
+import random
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_jwt_extended import create_access_token
+from werkzeug.security import generate_password_hash
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import User, NGOProfile, DonorProfile, Category
+from app.models.donation import DonationRequest, Donation
+from app.utils.stats_helpers import rebuild_stats
+from app.utils.search import rebuild_search_index
+from app.utils.rollup_helpers import rebuild_cause_rollups
+from app.utils.analytics_helpers import backfill_buckets
+from app.utils.identity import identity_claims
+
+
+def make_bench_app(**overrides):
+    """
+    Creates the app bound to a fresh database and creates all tables.
+    Keyword arguments override Config attributes.
+    """
+    database_url = os.environ.get('BENCH_DATABASE_URL')
+    if not database_url:
+        fd, path = tempfile.mkstemp(prefix='bench-', suffix='.db')
+        os.close(fd)
+        atexit.register(os.remove, path)
+        database_url = 'sqlite:///' + path
+
+    attrs = {'SQLALCHEMY_DATABASE_URI': database_url}
+    attrs.update(overrides)
+    app = create_app(type('BenchConfig', (Config,), attrs))
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def seed_sample(app, ngos=20, donors=200, causes=500, donations=5000, seed=42):
+    """
+    Inserts a deterministic sample dataset with Core bulk inserts.
+    Returns a dict of the generated ids, keyed by table.
+    """
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash('password123')
+
+    def ts(days_back=365):
+        return now - timedelta(seconds=rng.randint(0, days_back * 86400))
+
+    users, ngo_rows, donor_rows = [], [], []
+    admin_id = _uuid(rng)
+    users.append(dict(id=admin_id, username='admin', email='admin@example.com', password_hash=password_hash,
+                      role='Admin', is_approved=True, created_at=now, updated_at=now))
+    for i in range(ngos):
+        uid, pid = _uuid(rng), _uuid(rng)
+        users.append(dict(id=uid, username=f'ngo{i}', email=f'ngo{i}@example.com', password_hash=password_hash,
+                          role='NGO', is_approved=i % 5 != 0, created_at=ts(), updated_at=now))
+        ngo_rows.append(dict(id=pid, user_id=uid, organization_name=f'Organization {i}', contact_person=f'Contact {i}',
+                             created_at=now, updated_at=now))
+    for i in range(donors):
+        uid, pid = _uuid(rng), _uuid(rng)
+        users.append(dict(id=uid, username=f'donor{i}', email=f'donor{i}@example.com', password_hash=password_hash,
+                          role='Donor', is_approved=True, created_at=ts(), updated_at=now))
+        donor_rows.append(dict(id=pid, user_id=uid, first_name=f'Donor{i}', last_name='Bench',
+                               created_at=now, updated_at=now))
+
+    category_rows = [dict(id=_uuid(rng), name=name, description=f'{name} causes', created_at=now, updated_at=now)
+                     for name in ('Education', 'Health', 'Environment', 'Animals', 'Shelter')]
+
+    cause_rows = []
+    for i in range(causes):
+        cause_rows.append(dict(
+            id=_uuid(rng), ngo_id=rng.choice(ngo_rows)['id'], category_id=rng.choice(category_rows)['id'],
+            title=f'Benchmark cause {i}', description='A benchmark cause description that is long enough.',
+            amount_needed=Decimal(rng.randint(1000, 50000)), amount_received=Decimal('0.00'),
+            status=rng.choice(('Approved', 'Approved', 'Approved', 'Pending', 'Rejected')),
+            created_at=ts(), updated_at=now))
+
+    donation_rows = []
+    for _ in range(donations):
+        cause = rng.choice(cause_rows)
+        amount = Decimal(rng.randint(1, 200))
+        cause['amount_received'] += amount
+        donation_rows.append(dict(id=_uuid(rng), donor_id=rng.choice(donor_rows)['id'], donation_request_id=cause['id'],
+                                  amount_donated=amount, created_at=ts(), updated_at=now))
+    for cause in cause_rows:
+        # Keep the sample consistent: never over-funded, fully funded causes are Completed.
+        cause['amount_needed'] = max(cause['amount_needed'], cause['amount_received'])
+        if cause['status'] == 'Approved' and cause['amount_received'] == cause['amount_needed']:
+            cause['status'] = 'Completed'
+
+    with app.app_context():
+        for model, rows in ((User, users), (NGOProfile, ngo_rows), (DonorProfile, donor_rows),
+                            (Category, category_rows), (DonationRequest, cause_rows), (Donation, donation_rows)):
+            if rows:
+                db.session.execute(model.__table__.insert(), rows)
+        rebuild_stats()
+        rebuild_cause_rollups()
+        backfill_buckets()
+        rebuild_search_index()
+        db.session.commit()
+
+    return {'admin': admin_id, 'users': users, 'ngos': ngo_rows, 'donors': donor_rows,
+            'categories': category_rows, 'causes': cause_rows, 'donations': donation_rows}
+
+
+def auth_headers(app, user):
+    """Returns an Authorization header carrying the same token login would issue for the given user row."""
+    with app.app_context():
+        token = create_access_token(identity={'id': user['id']},
+                                    additional_claims=identity_claims(db.session.get(User, user['id'])))
+    return {'Authorization': f'Bearer {token}'}
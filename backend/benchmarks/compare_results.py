@@ -0,0 +1,83 @@
+"""
+Compares two load_suite.py result files endpoint by endpoint.
+
+    python benchmarks/compare_results.py results/main.json results/HEAD.json --threshold 15
+
+Prints the baseline and candidate p50/p95/p99 latency and throughput with the
+relative change. Exits with status 1 if any endpoint's p95 got slower by more
+than --threshold percent (and by at least --min-ms), or started returning 5xx,
+so it can gate CI. Endpoints with fewer than --min-count requests, or present in
+only one file, are listed but not judged.
+"""
+import argparse
+import json
+import sys
+
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps')
+
+
+def change(before, after):
+    if not before:
+        return None
+    return (after - before) / before * 100
+
+
+def fmt_change(value):
+    return '     n/a' if value is None else f'{value:>+7.1f}%'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed p95 slowdown in percent')
+    parser.add_argument('--min-ms', type=float, default=0.5,
+                        help='ignore p95 slowdowns smaller than this many milliseconds (timer noise)')
+    parser.add_argument('--min-count', type=int, default=20,
+                        help='do not judge the p95 of endpoints with fewer requests than this')
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    for name, results in (('baseline', baseline), ('candidate', candidate)):
+        meta = results['meta']
+        print(f'{name:<10} revision={meta.get("revision")} database={meta.get("database")} sizes={meta.get("sizes")}')
+    if baseline['meta'].get('settings') != candidate['meta'].get('settings'):
+        print('warning: the runs used different settings, so the traffic differs')
+
+    print(f'\n{"endpoint":<40} ' + ' '.join(f'{m.replace("_ms", "").replace("throughput_rps", "req/s"):>26}'
+                                             for m in METRICS))
+    regressions = []
+    rows = [('overall', baseline['overall'], candidate['overall'])]
+    for label in sorted(set(baseline['endpoints']) | set(candidate['endpoints'])):
+        rows.append((label, baseline['endpoints'].get(label), candidate['endpoints'].get(label)))
+
+    for label, before, after in rows:
+        if before is None or after is None:
+            print(f'{label:<40} only in {"candidate" if before is None else "baseline"}')
+            continue
+        cells = []
+        for metric in METRICS:
+            cells.append(f'{before[metric]:>8.1f} -> {after[metric]:>8.1f} {fmt_change(change(before[metric], after[metric]))}')
+        print(f'{label:<40} ' + ' '.join(cells))
+
+        slowdown = change(before['p95_ms'], after['p95_ms'])
+        enough = min(before['count'], after['count']) >= args.min_count
+        if enough and slowdown is not None and slowdown > args.threshold and after['p95_ms'] - before['p95_ms'] >= args.min_ms:
+            regressions.append(f'{label}: p95 {before["p95_ms"]:.1f}ms -> {after["p95_ms"]:.1f}ms ({slowdown:+.1f}%)')
+        if after.get('errors', 0) > before.get('errors', 0):
+            regressions.append(f'{label}: 5xx responses {before.get("errors", 0)} -> {after["errors"]}')
+
+    if regressions:
+        print('\nregressions:')
+        for line in regressions:
+            print(f'  {line}')
+        sys.exit(1)
+    print('\nno regressions')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Fires many parallel donations at a single cause through POST /api/donors/donate/<id>
+and checks that no update was lost and the cause was never over-funded.
+
+    python benchmarks/concurrent_donations.py --donations 5000 --threads 32
+
+The cause is deliberately under-sized so that late donations must be rejected.
+At the end, amount_received must equal SUM(donations.amount_donated) for the
+cause and must not exceed amount_needed.
+"""
+import argparse
+import random
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+
+from sqlalchemy import func
+
+from common import make_bench_app, seed_sample, auth_headers
+from app.extensions import db
+from app.models.donation import DonationRequest, Donation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--donations', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--oversubscribe', type=float, default=1.5,
+                        help='total offered / amount_needed (above 1.0 forces rejections)')
+    args = parser.parse_args()
+
+    app = make_bench_app()
+    data = seed_sample(app, ngos=5, donors=args.threads, causes=1, donations=0)
+    cause_id = data['causes'][0]['id']
+
+    rng = random.Random(7)
+    amounts = [Decimal(rng.randint(100, 10000)) / 100 for _ in range(args.donations)]
+    needed = (sum(amounts) / Decimal(str(args.oversubscribe))).quantize(Decimal('0.01'))
+    with app.app_context():
+        cause = db.session.get(DonationRequest, cause_id)
+        cause.status, cause.amount_needed, cause.amount_received = 'Approved', needed, Decimal('0.00')
+        db.session.commit()
+
+    users = {u['id']: u for u in data['users']}
+    headers = [auth_headers(app, users[d['user_id']]) for d in data['donors']]
+    results = Counter()
+    lock = threading.Lock()
+
+    def worker(index):
+        client = app.test_client()
+        local = Counter()
+        for amount in amounts[index::args.threads]:
+            response = client.post(f'/api/donors/donate/{cause_id}', json={'amount_donated': str(amount)},
+                                   headers=headers[index])
+            local[response.status_code] += 1
+        with lock:
+            results.update(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        cause = db.session.get(DonationRequest, cause_id)
+        donated = db.session.query(func.coalesce(func.sum(Donation.amount_donated), 0)) \
+            .filter(Donation.donation_request_id == cause_id).scalar()
+        rows = Donation.query.filter_by(donation_request_id=cause_id).count()
+        received = Decimal(str(cause.amount_received)).quantize(Decimal('0.01'))
+        donated = Decimal(str(donated)).quantize(Decimal('0.01'))
+
+    print(f'requests:        {args.donations} over {args.threads} threads in {elapsed:.2f}s '
+          f'({args.donations / elapsed:.0f} req/s)')
+    print(f'responses:       {dict(sorted(results.items()))}')
+    print(f'donation rows:   {rows} (201 responses: {results[201]})')
+    print(f'amount_needed:   {needed}')
+    print(f'amount_received: {received}')
+    print(f'sum(donations):  {donated}')
+    print(f'final status:    {cause.status}')
+
+    consistent = received == donated and rows == results[201] and received <= needed
+    print('RESULT:          ' + ('consistent' if consistent else 'INCONSISTENT'))
+    raise SystemExit(0 if consistent else 1)
+
+
+if __name__ == '__main__':
+    main()
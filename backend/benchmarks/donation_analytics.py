@@ -0,0 +1,90 @@
+"""
+Admin donation analytics latency: GET /api/admin/analytics/donations, which reads
+the day/week/month donation buckets, against the same series grouped straight
+from donations joined to donation_requests.
+
+    python benchmarks/donation_analytics.py --donations 200000 --repeat 20
+
+Each case is a (range, granularity, group_by) combination; ranges that do not
+line up with week or month boundaries make the endpoint read day buckets for the
+partly covered edge periods.
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, func
+
+from common import make_bench_app, seed_sample, auth_headers
+from app.extensions import db
+from app.models.donation import DonationRequest, Donation
+from app.utils.analytics_helpers import _bucket_expression
+
+CASES = [
+    (30, 'day', ''),
+    (90, 'week', 'category'),
+    (365, 'month', ''),
+    (365, 'month', 'category,ngo'),
+    (365, 'day', 'ngo'),
+]
+
+
+def adhoc_series(start, end, granularity, group_by):
+    bucket = _bucket_expression(granularity, Donation.created_at)
+    columns = [{'category': DonationRequest.category_id, 'ngo': DonationRequest.ngo_id}[key]
+               for key in group_by.split(',') if key]
+    stmt = (
+        select(bucket, *columns, func.sum(Donation.amount_donated), func.count())
+        .join(DonationRequest, DonationRequest.id == Donation.donation_request_id)
+        .where(Donation.created_at >= start, Donation.created_at < end + timedelta(days=1))
+        .group_by(bucket, *columns)
+    )
+    return db.session.execute(stmt).all()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--donations', type=int, default=100000)
+    parser.add_argument('--ngos', type=int, default=20)
+    parser.add_argument('--causes', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    app = make_bench_app(RESPONSE_CACHE_ENABLED=False, UPLOAD_WORKERS=0, EMAIL_SENDER_WORKERS=0)
+    data = seed_sample(app, ngos=args.ngos, donors=1000, causes=args.causes, donations=args.donations)
+    headers = auth_headers(app, next(u for u in data['users'] if u['id'] == data['admin']))
+    client = app.test_client()
+    # Ranges end mid-week, mid-month
+    end = datetime.utcnow().date() - timedelta(days=3)
+
+    print(f"{args.donations} donations, median of {args.repeat}")
+    print(f"{'range':>6} {'granularity':<12} {'group_by':<14} {'points':>7} {'buckets':>10} {'ad hoc':>10}")
+    for days, granularity, group_by in CASES:
+        start = end - timedelta(days=days - 1)
+        url = (f'/api/admin/analytics/donations?start={start}&end={end}'
+               f'&granularity={granularity}&group_by={group_by}')
+        points = len(client.get(url, headers=headers).get_json()['series'])
+
+        def endpoint():
+            assert client.get(url, headers=headers).status_code == 200
+
+        def adhoc():
+            with app.app_context():
+                adhoc_series(start, end, granularity, group_by)
+
+        print(f"{days:>5}d {granularity:<12} {group_by or '-':<14} {points:>7} "
+              f"{timed(endpoint, args.repeat):>8.1f}ms {timed(adhoc, args.repeat):>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Concurrent read/write throughput under each database engine profile
+(DB_ENGINE_PROFILE, see ENGINE_PROFILES in app/config.py).
+
+Reader threads page through GET /api/causes/approved and open cause details
+while writer threads donate through POST /api/donors/donate/<id>, for a fixed
+time per profile. The response cache is off so every read reaches the database.
+
+    python benchmarks/engine_profiles.py --duration 20 --readers 8 --writers 2
+    BENCH_DATABASE_URL=postgresql://... python benchmarks/engine_profiles.py --profiles postgres-web
+
+With SQLite's rollback journal ('sqlite-default') readers wait behind every
+donation commit; with WAL ('sqlite-wal') they keep reading the last committed
+snapshot.
+"""
+import argparse
+import random
+import threading
+import time
+
+from common import make_bench_app, seed_sample, auth_headers
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(profile, args):
+    app = make_bench_app(DB_ENGINE_PROFILE=profile, RESPONSE_CACHE_ENABLED=False, UPLOAD_WORKERS=0,
+                         EMAIL_SENDER_WORKERS=0)
+    data = seed_sample(app, ngos=10, donors=max(args.writers, 20), causes=300, donations=3000)
+    causes = [c['id'] for c in data['causes'] if c['status'] == 'Approved']
+    users = {u['id']: u for u in data['users']}
+    donor_headers = [auth_headers(app, users[d['user_id']]) for d in data['donors']]
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {'read': [], 'write': [], 'errors': 0}
+
+    def reader(index):
+        client, rng = app.test_client(), random.Random(index)
+        latencies, errors = [], 0
+        while not stop.is_set():
+            if rng.random() < 0.5:
+                url = '/api/causes/approved?limit=20'
+            else:
+                url = f'/api/donors/approved-requests/{rng.choice(causes)}'
+            started = time.perf_counter()
+            response = client.get(url, headers=donor_headers[0])
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code >= 500
+        with lock:
+            results['read'].extend(latencies)
+            results['errors'] += errors
+
+    def writer(index):
+        client, rng = app.test_client(), random.Random(1000 + index)
+        headers = donor_headers[index % len(donor_headers)]
+        latencies, errors = [], 0
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = client.post(f'/api/donors/donate/{rng.choice(causes)}', headers=headers,
+                                   json={'amount_donated': '0.01'})
+            latencies.append(time.perf_counter() - started)
+            errors += response.status_code >= 500
+        with lock:
+            results['write'].extend(latencies)
+            results['errors'] += errors
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    reads, writes = results['read'], results['write']
+    print(f"{profile:<16} {len(reads) / args.duration:>9.1f} {percentile(reads, 95) * 1000:>9.1f}ms "
+          f"{len(writes) / args.duration:>9.1f} {percentile(writes, 95) * 1000:>9.1f}ms "
+          f"{percentile(writes, 99) * 1000:>9.1f}ms {results['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--profiles', nargs='+', default=['sqlite-default', 'sqlite-wal'])
+    parser.add_argument('--duration', type=float, default=10, help='seconds per profile')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    args = parser.parse_args()
+
+    print(f"{'profile':<16} {'reads/s':>9} {'read p95':>11} {'writes/s':>9} {'write p95':>11} {'write p99':>11} {'5xx':>7}")
+    for profile in args.profiles:
+        run(profile, args)
+
+
+if __name__ == '__main__':
+    main()
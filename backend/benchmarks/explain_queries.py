@@ -0,0 +1,100 @@
+"""
+Prints the query plan of each hot list query before and after the indexes from
+migration 7c1e2f4a9b3d_add_hot_path_indexes.
+
+    python benchmarks/explain_queries.py                     # SQLite (temporary file)
+    BENCH_DATABASE_URL=postgresql://... python benchmarks/explain_queries.py
+
+The queries are built with the same filters and (created_at, id) keyset ordering
+the routes use, then compiled for the target dialect. On Postgres the tables are
+ANALYZEd after seeding so the planner sees realistic row counts.
+"""
+import argparse
+
+from sqlalchemy import text
+
+from common import make_bench_app, seed_sample
+from app.extensions import db
+from app.models import User
+from app.models.donation import DonationRequest, Donation
+
+
+def hot_queries(data):
+    """The list queries issued by cause_routes, admin_routes, donor_routes and ngo_routes."""
+    ngo_id = data['ngos'][0]['id']
+    donor_id = data['donors'][0]['id']
+    category_id = data['categories'][0]['id']
+    request_id = data['causes'][0]['id']
+    newest_first = lambda model: (model.created_at.desc(), model.id.desc())
+    return [
+        ('cause_routes.get_approved_donation_requests',
+         DonationRequest.query.filter_by(status='Approved').order_by(*newest_first(DonationRequest)).limit(21)),
+        ('donor_routes.get_approved_donation_requests (category)',
+         DonationRequest.query.filter_by(status='Approved', category_id=category_id)
+         .order_by(*newest_first(DonationRequest)).limit(21)),
+        ('admin_routes.get_all_donation_requests',
+         DonationRequest.query.order_by(*newest_first(DonationRequest)).limit(21)),
+        ('ngo_routes.get_my_donation_requests',
+         DonationRequest.query.filter_by(ngo_id=ngo_id).order_by(*newest_first(DonationRequest)).limit(21)),
+        ('donor_routes.get_my_donations',
+         Donation.query.filter_by(donor_id=donor_id).order_by(*newest_first(Donation)).limit(21)),
+        ('donations for one request',
+         Donation.query.filter_by(donation_request_id=request_id)),
+        ('admin_routes.get_pending_ngos',
+         User.query.filter_by(role='NGO', is_approved=False).order_by(*newest_first(User)).limit(21)),
+        ('admin_routes.get_dashboard_stats (pending count)',
+         User.query.filter_by(role='NGO', is_approved=False).with_entities(db.func.count())),
+    ]
+
+
+def explain(query):
+    dialect = db.engine.dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect.name == 'sqlite' else 'EXPLAIN '
+    rows = db.session.execute(text(prefix + sql)).fetchall()
+    if dialect.name == 'sqlite':
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def hot_indexes():
+    tables = (DonationRequest.__table__, Donation.__table__, User.__table__)
+    return [index for table in tables for index in table.indexes if index.name.startswith('ix_')]
+
+
+def print_plans(title, queries):
+    print(f'\n===== {title} =====')
+    for label, query in queries:
+        print(f'\n-- {label}')
+        for line in explain(query):
+            print(f'   {line}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--causes', type=int, default=5000)
+    parser.add_argument('--donations', type=int, default=50000)
+    args = parser.parse_args()
+
+    app = make_bench_app()
+    data = seed_sample(app, causes=args.causes, donations=args.donations)
+
+    with app.app_context():
+        print(f'Dialect: {db.engine.dialect.name}')
+        with db.engine.begin() as conn:
+            for index in hot_indexes():
+                index.drop(conn)
+            conn.execute(text('ANALYZE'))
+        print_plans('BEFORE (no secondary indexes)', hot_queries(data))
+        # End the session's transaction so the next plans see the new schema.
+        db.session.remove()
+
+        with db.engine.begin() as conn:
+            for index in hot_indexes():
+                index.create(conn)
+            conn.execute(text('ANALYZE'))
+        print_plans('AFTER (migration 7c1e2f4a9b3d)', hot_queries(data))
+
+
+if __name__ == '__main__':
+    main()
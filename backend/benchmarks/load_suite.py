@@ -0,0 +1,276 @@
+"""
+Drives the real app in-process with a mixed, reproducible traffic profile and
+reports latency percentiles and throughput per endpoint.
+
+    python benchmarks/load_suite.py --scale 4 --sessions 2000 --threads 8 --output results/HEAD.json
+    python benchmarks/compare_results.py results/main.json results/HEAD.json
+
+The database is seeded with seed_sample() multiplied by --scale. The traffic is a
+list of user sessions generated up front from --seed, so two runs at the same
+settings send the same requests:
+
+  donor browsing  (--browse)  cause list pages, search, facets and cause details;
+                              the cause opened is picked with Zipf(--zipf) popularity
+  donation bursts (--bursts)  several donors giving to the same popular cause at once
+  donor account   (--account) /api/users/me and /api/donors/my-donations
+  NGO dashboard   (--ngo)     the NGO's own causes and profile
+  admin polling   (--admin)   dashboard stats, pending NGOs and the cause review list
+
+Sessions are run by --threads workers. Results are printed as a table and, with
+--output, written as JSON (settings, git revision, per-endpoint count, status
+codes, throughput and p50/p95/p99/max latency in ms) for compare_results.py.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from common import make_bench_app, seed_sample, auth_headers
+from app.extensions import db
+
+SEARCH_TERMS = ['benchmark', 'cause', 'description', 'long enough', 'organization', 'bench']
+FUNDING = ['under_25', '25_to_75', 'over_75']
+
+
+class Step:
+    """One request of a session. With follow_cursor, the previous response's X-Next-Cursor is sent along."""
+    __slots__ = ('label', 'method', 'url', 'params', 'body', 'headers', 'follow_cursor')
+
+    def __init__(self, label, url, method='GET', params=None, body=None, headers=None, follow_cursor=False):
+        self.label, self.method, self.url = label, method, url
+        self.params, self.body, self.headers, self.follow_cursor = params or {}, body, headers, follow_cursor
+
+
+class Traffic:
+    """Builds the session list from the seeded data and a seeded RNG."""
+
+    def __init__(self, app, data, args):
+        self.rng = random.Random(args.seed)
+        self.args = args
+        users = {u['id']: u for u in data['users']}
+        approved = [c for c in data['causes'] if c['status'] == 'Approved']
+        # Popularity rank is independent of creation order
+        self.rng.shuffle(approved)
+        self.popular = [c['id'] for c in approved]
+        self.cum_weights = list(itertools.accumulate(1 / (rank ** args.zipf) for rank in range(1, len(approved) + 1)))
+        self.categories = [c['name'] for c in data['categories']]
+
+        donors = self.rng.sample(data['donors'], min(len(data['donors']), args.actors))
+        ngos = [n for n in data['ngos'] if users[n['user_id']]['is_approved']][:args.actors]
+        self.donor_headers = [auth_headers(app, users[d['user_id']]) for d in donors]
+        self.ngo_headers = [auth_headers(app, users[n['user_id']]) for n in ngos]
+        self.admin_headers = auth_headers(app, users[data['admin']])
+
+    def popular_cause(self):
+        return self.popular[bisect_left(self.cum_weights, self.rng.random() * self.cum_weights[-1])]
+
+    def browse(self):
+        rng = self.rng
+        steps = []
+        params = {}
+        if rng.random() < 0.3:
+            params['category'] = rng.choice(self.categories)
+        if rng.random() < 0.15:
+            params['funding'] = rng.choice(FUNDING)
+        if rng.random() < 0.2:
+            steps.append(Step('GET /api/causes/facets', '/api/causes/facets', params=dict(params)))
+        if rng.random() < 0.25:
+            steps.append(Step('GET /api/causes/search', '/api/causes/search',
+                              params=dict(params, q=rng.choice(SEARCH_TERMS))))
+        else:
+            steps.append(Step('GET /api/causes/approved', '/api/causes/approved', params=dict(params)))
+            for _ in range(min(3, int(rng.expovariate(1.5)))):
+                steps.append(Step('GET /api/causes/approved (next page)', '/api/causes/approved',
+                                  params=dict(params), follow_cursor=True))
+        for _ in range(1 + int(rng.expovariate(0.8))):
+            steps.append(Step('GET /api/causes/<id>', f'/api/causes/{self.popular_cause()}'))
+        return steps
+
+    def donation_burst(self):
+        cause_id = self.popular_cause()
+        donors = self.rng.sample(self.donor_headers, min(len(self.donor_headers), self.rng.randint(2, 8)))
+        # Every donation is its own session so the workers send the burst in parallel
+        return [[Step('POST /api/donors/donate/<id>', f'/api/donors/donate/{cause_id}', method='POST',
+                      body={'amount_donated': str(self.rng.randint(1, 50))}, headers=headers)]
+                for headers in donors]
+
+    def account(self):
+        headers = self.rng.choice(self.donor_headers)
+        return [Step('GET /api/users/me', '/api/users/me', headers=headers),
+                Step('GET /api/donors/my-donations', '/api/donors/my-donations', headers=headers)]
+
+    def ngo_dashboard(self):
+        headers = self.rng.choice(self.ngo_headers)
+        return [Step('GET /api/ngo/causes', '/api/ngo/causes', headers=headers),
+                Step('GET /api/users/me', '/api/users/me', headers=headers)]
+
+    def admin_poll(self):
+        steps = [Step('GET /api/admin/stats', '/api/admin/stats', headers=self.admin_headers)]
+        if self.rng.random() < 0.3:
+            steps.append(Step('GET /api/admin/ngos/pending', '/api/admin/ngos/pending', headers=self.admin_headers))
+            steps.append(Step('GET /api/admin/donation-requests', '/api/admin/donation-requests',
+                              headers=self.admin_headers))
+        return steps
+
+    def sessions(self, count):
+        args = self.args
+        kinds = [(self.browse, args.browse), (self.donation_burst, args.bursts), (self.account, args.account),
+                 (self.ngo_dashboard, args.ngo), (self.admin_poll, args.admin)]
+        makers, weights = zip(*[(maker, weight) for maker, weight in kinds if weight > 0])
+        sessions = []
+        while len(sessions) < count:
+            maker = self.rng.choices(makers, weights)[0]
+            if maker == self.donation_burst:
+                sessions.extend(maker())
+            else:
+                sessions.append(maker())
+        return sessions
+
+
+def run_sessions(app, sessions, threads):
+    """Runs the sessions on `threads` workers; returns ({label: [ms]}, {label: Counter(status)}, seconds)."""
+    latencies, statuses = defaultdict(list), defaultdict(Counter)
+    lock = threading.Lock()
+    queue = iter(sessions)
+
+    def worker():
+        client = app.test_client()
+        local_latencies, local_statuses = defaultdict(list), defaultdict(Counter)
+        while True:
+            with lock:
+                steps = next(queue, None)
+            if steps is None:
+                break
+            cursor = None
+            for step in steps:
+                params = step.params
+                if step.follow_cursor:
+                    if not cursor:
+                        break
+                    params = dict(params, cursor=cursor)
+                started = time.perf_counter()
+                response = client.open(step.url, method=step.method, query_string=params, json=step.body,
+                                       headers=step.headers)
+                local_latencies[step.label].append((time.perf_counter() - started) * 1000)
+                local_statuses[step.label][response.status_code] += 1
+                cursor = response.headers.get('X-Next-Cursor')
+        with lock:
+            for label, samples in local_latencies.items():
+                latencies[label].extend(samples)
+            for label, counts in local_statuses.items():
+                statuses[label].update(counts)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return latencies, statuses, time.perf_counter() - started
+
+
+def percentile(sorted_samples, fraction):
+    # Nearest-rank percentile
+    index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples, counts, elapsed):
+    samples = sorted(samples)
+    return {
+        'count': len(samples),
+        'status': {str(code): n for code, n in sorted(counts.items())},
+        'errors': sum(n for code, n in counts.items() if code >= 500),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'mean_ms': round(sum(samples) / len(samples), 3),
+        'p50_ms': round(percentile(samples, 0.50), 3),
+        'p95_ms': round(percentile(samples, 0.95), 3),
+        'p99_ms': round(percentile(samples, 0.99), 3),
+        'max_ms': round(samples[-1], 3),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiplies the seed_sample() sizes (20 NGOs, 200 donors, 500 causes, 5000 donations)')
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--warmup', type=int, default=100, help='sessions run first and left out of the results')
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent of cause popularity')
+    parser.add_argument('--actors', type=int, default=50, help='distinct logged-in donors and NGOs')
+    parser.add_argument('--browse', type=float, default=70)
+    parser.add_argument('--bursts', type=float, default=5)
+    parser.add_argument('--account', type=float, default=12)
+    parser.add_argument('--ngo', type=float, default=8)
+    parser.add_argument('--admin', type=float, default=5)
+    parser.add_argument('--no-cache', action='store_true', help='run with RESPONSE_CACHE_ENABLED=False')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    args = parser.parse_args()
+
+    app = make_bench_app(RESPONSE_CACHE_ENABLED=not args.no_cache)
+    sizes = {name: max(1, int(size * args.scale))
+             for name, size in (('ngos', 20), ('donors', 200), ('causes', 500), ('donations', 5000))}
+    started = time.perf_counter()
+    data = seed_sample(app, seed=args.seed, **sizes)
+    print(f'seeded {sizes} in {time.perf_counter() - started:.1f}s')
+
+    traffic = Traffic(app, data, args)
+    warmup, sessions = traffic.sessions(args.warmup), traffic.sessions(args.sessions)
+    if warmup:
+        run_sessions(app, warmup, args.threads)
+    latencies, statuses, elapsed = run_sessions(app, sessions, args.threads)
+
+    endpoints = {label: summarize(latencies[label], statuses[label], elapsed) for label in sorted(latencies)}
+    all_samples = [ms for samples in latencies.values() for ms in samples]
+    all_statuses = sum(statuses.values(), Counter())
+    overall = summarize(all_samples, all_statuses, elapsed)
+
+    print(f'{"endpoint":<40} {"count":>6} {"req/s":>8} {"p50":>8} {"p95":>8} {"p99":>8} {"max":>8}  status')
+    for label, result in list(endpoints.items()) + [('overall', overall)]:
+        print(f'{label:<40} {result["count"]:>6} {result["throughput_rps"]:>8.1f} {result["p50_ms"]:>6.1f}ms '
+              f'{result["p95_ms"]:>6.1f}ms {result["p99_ms"]:>6.1f}ms {result["max_ms"]:>6.1f}ms  {result["status"]}')
+
+    if args.output:
+        with app.app_context():
+            dialect = db.engine.dialect.name
+        results = {
+            'meta': {
+                'revision': git_revision(),
+                'created_at': datetime.utcnow().isoformat() + 'Z',
+                'python': platform.python_version(),
+                'database': dialect,
+                'settings': vars(args),
+                'sizes': sizes,
+                'duration_s': round(elapsed, 3),
+            },
+            'overall': overall,
+            'endpoints': endpoints,
+        }
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f'results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
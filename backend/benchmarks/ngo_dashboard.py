@@ -0,0 +1,91 @@
+"""
+NGO dashboard latency as an NGO's donation history grows: GET /api/ngo/dashboard,
+which reads the cause rollups, against the same figures computed ad hoc from
+the donations table.
+
+    python benchmarks/ngo_dashboard.py --donations 10000 50000 200000
+
+Each size gets a fresh database with the same NGOs and causes, so only the
+number of donations per cause changes. The rollup path should stay flat; the
+ad hoc aggregate grows with the donations it scans.
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import select, func, distinct
+
+from common import make_bench_app, seed_sample, auth_headers
+from app.extensions import db
+from app.models.donation import DonationRequest, Donation
+
+
+def adhoc_dashboard(ngo_id):
+    """The dashboard's figures straight from the donations (the approach the rollups replace)."""
+    per_cause = (
+        select(Donation.donation_request_id, func.sum(Donation.amount_donated), func.count(),
+               func.count(distinct(Donation.donor_id)))
+        .join(DonationRequest, DonationRequest.id == Donation.donation_request_id)
+        .where(DonationRequest.ngo_id == ngo_id)
+        .group_by(Donation.donation_request_id)
+    )
+    day = func.date(Donation.created_at)
+    curve = (
+        select(day, func.sum(Donation.amount_donated), func.count())
+        .join(DonationRequest, DonationRequest.id == Donation.donation_request_id)
+        .where(DonationRequest.ngo_id == ngo_id)
+        .group_by(day)
+    )
+    return db.session.execute(per_cause).all(), db.session.execute(curve).all()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def run(donations, args):
+    app = make_bench_app(RESPONSE_CACHE_ENABLED=False, UPLOAD_WORKERS=0, EMAIL_SENDER_WORKERS=0)
+    data = seed_sample(app, ngos=args.ngos, donors=500, causes=args.causes, donations=donations)
+    users = {u['id']: u for u in data['users']}
+    # The NGO with the most donations
+    cause_ngo = {c['id']: c['ngo_id'] for c in data['causes']}
+    counts = {}
+    for donation in data['donations']:
+        ngo_id = cause_ngo[donation['donation_request_id']]
+        counts[ngo_id] = counts.get(ngo_id, 0) + 1
+    ngo = max((n for n in data['ngos'] if users[n['user_id']]['is_approved']), key=lambda n: counts.get(n['id'], 0))
+    headers = auth_headers(app, users[ngo['user_id']])
+    client = app.test_client()
+
+    def endpoint():
+        assert client.get('/api/ngo/dashboard', headers=headers).status_code == 200
+
+    def adhoc():
+        with app.app_context():
+            adhoc_dashboard(ngo['id'])
+
+    endpoint()
+    rollup_ms, adhoc_ms = timed(endpoint, args.repeat), timed(adhoc, args.repeat)
+    print(f"{donations:>10} {counts.get(ngo['id'], 0):>14} {rollup_ms:>12.1f}ms {adhoc_ms:>12.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--donations', type=int, nargs='+', default=[10000, 50000, 200000])
+    parser.add_argument('--ngos', type=int, default=5)
+    parser.add_argument('--causes', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'donations':>10} {'NGO donations':>14} {'rollups p50':>14} {'ad hoc p50':>14}")
+    for donations in args.donations:
+        run(donations, args)
+
+
+if __name__ == '__main__':
+    main()
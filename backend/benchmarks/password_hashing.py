@@ -0,0 +1,107 @@
+"""
+Measures login throughput at different password hashing cost profiles, and how
+badly a login burst stalls unrelated requests served by the same process.
+
+    python benchmarks/password_hashing.py --logins 400 --threads 16
+    python benchmarks/password_hashing.py --methods pbkdf2:sha256:600000 scrypt:32768:8:1 --workers 2
+
+For each PASSWORD_HASH_METHOD it fires --logins POST /api/auth/login requests
+from --threads client threads while a probe thread polls GET /health, and
+reports logins/sec, logins/sec per core used for hashing, and the /health
+latency seen during the burst.
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+
+from common import make_bench_app, seed_sample
+from app.extensions import db
+from app.models import User
+from app.utils.password_hashing import get_password_hasher
+
+DEFAULT_METHODS = ['pbkdf2:sha256:100000', 'pbkdf2:sha256:260000', 'pbkdf2:sha256:600000', 'scrypt:32768:8:1']
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(method, args):
+    app = make_bench_app(PASSWORD_HASH_METHOD=method, PASSWORD_HASH_WORKERS=args.workers,
+                         PASSWORD_HASH_MAX_PENDING=max(args.threads, 64))
+    data = seed_sample(app, ngos=1, donors=args.threads, causes=0, donations=0)
+    with app.app_context():
+        # Store every donor's password with the profile under test, so no login triggers a rehash
+        db.session.query(User).update({'password_hash': get_password_hasher().hash('password123')})
+        db.session.commit()
+    emails = [u['email'] for u in data['users'] if u['role'] == 'Donor']
+
+    statuses = []
+    probe_latencies = []
+    done = threading.Event()
+
+    def login_worker(index):
+        client = app.test_client()
+        for _ in range(index, args.logins, args.threads):
+            response = client.post('/api/auth/login', json={'email': emails[index], 'password': 'password123'})
+            statuses.append(response.status_code)
+
+    def probe():
+        client = app.test_client()
+        while not done.is_set():
+            started = time.perf_counter()
+            client.get('/health')
+            probe_latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.005)
+
+    prober = threading.Thread(target=probe)
+    workers = [threading.Thread(target=login_worker, args=(i,)) for i in range(args.threads)]
+    prober.start()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    done.set()
+    prober.join()
+
+    cores = min(args.workers, os.cpu_count() or 1)
+    ok = statuses.count(200)
+    return {
+        'method': method,
+        'logins': len(statuses),
+        'ok': ok,
+        'per_sec': ok / elapsed,
+        'per_core': ok / elapsed / cores,
+        'ms_per_hash': elapsed * 1000 * cores / max(ok, 1),
+        'probe_p50': statistics.median(probe_latencies) if probe_latencies else 0.0,
+        'probe_p95': percentile(probe_latencies, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--methods', nargs='+', default=DEFAULT_METHODS)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=16, help='concurrent login clients')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='PASSWORD_HASH_WORKERS')
+    args = parser.parse_args()
+
+    print(f'{args.logins} logins from {args.threads} threads, {args.workers} hash worker(s), '
+          f'{os.cpu_count()} core(s)\n')
+    print(f'{"method":<24} {"ok":>6} {"logins/s":>9} {"/s/core":>8} {"ms/hash":>8} '
+          f'{"health p50":>11} {"health p95":>11}')
+    for method in args.methods:
+        r = run(method, args)
+        print(f'{r["method"]:<24} {r["ok"]:>6} {r["per_sec"]:>9.1f} {r["per_core"]:>8.1f} {r["ms_per_hash"]:>8.1f} '
+              f'{r["probe_p50"]:>9.1f}ms {r["probe_p95"]:>9.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
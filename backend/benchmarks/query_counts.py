@@ -0,0 +1,57 @@
+"""
+Reports how many SQL statements each list/detail endpoint issues against a
+seeded database, using the X-Query-Count header from app/utils/query_counter.py.
+
+    python benchmarks/query_counts.py --causes 5000 --donations 50000 --limit 100
+
+A fixed count that does not grow with --limit means no N+1 queries.
+"""
+import argparse
+
+from common import make_bench_app, seed_sample, auth_headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--causes', type=int, default=2000)
+    parser.add_argument('--donations', type=int, default=20000)
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+
+    app = make_bench_app(QUERY_COUNTER_ENABLED=True, PAGINATION_MAX_LIMIT=max(args.limit, 100))
+    data = seed_sample(app, causes=args.causes, donations=args.donations)
+    client = app.test_client()
+
+    users = {u['id']: u for u in data['users']}
+    admin = users[data['admin']]
+    ngo_user = next(users[n['user_id']] for n in data['ngos'] if users[n['user_id']]['is_approved'])
+    donor_user = max(data['donors'], key=lambda d: sum(x['donor_id'] == d['id'] for x in data['donations']))
+    donor_user = users[donor_user['user_id']]
+    approved = next(c for c in data['causes'] if c['status'] == 'Approved')
+
+    checks = [
+        ('GET /api/causes/approved', '/api/causes/approved', None),
+        ('GET /api/causes/<id>', f"/api/causes/{approved['id']}", None),
+        ('GET /api/admin/donation-requests', '/api/admin/donation-requests', admin),
+        ('GET /api/admin/ngos/pending', '/api/admin/ngos/pending', admin),
+        ('GET /api/admin/analytics/donations', '/api/admin/analytics/donations?granularity=week&group_by=category', admin),
+        ('GET /api/ngo/causes', '/api/ngo/causes', ngo_user),
+        ('GET /api/ngo/dashboard', '/api/ngo/dashboard', ngo_user),
+        ('GET /api/donors/approved-requests', '/api/donors/approved-requests', donor_user),
+        ('GET /api/donors/my-donations', '/api/donors/my-donations', donor_user),
+        ('GET /api/donors/my-donations/summary', '/api/donors/my-donations/summary', donor_user),
+        ('GET /api/users/me (NGO)', '/api/users/me', ngo_user),
+        ('GET /api/users/me (donor)', '/api/users/me', donor_user),
+    ]
+    print(f"{'endpoint':40} {'status':>6} {'rows':>6} {'queries':>8}")
+    for label, url, user in checks:
+        headers = auth_headers(app, user) if user else {}
+        sep = '&' if '?' in url else '?'
+        response = client.get(f'{url}{sep}limit={args.limit}', headers=headers)
+        body = response.get_json()
+        rows = len(body) if isinstance(body, list) else 1
+        print(f"{label:40} {response.status_code:>6} {rows:>6} {response.headers.get('X-Query-Count', '?'):>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Measures GET /api/causes/search latency over a large synthetic catalogue.
+
+    python benchmarks/search_bench.py --causes 100000 1000000
+    BENCH_DATABASE_URL=postgresql://... python benchmarks/search_bench.py --causes 100000
+
+Cause titles and descriptions are drawn from a Zipf-like vocabulary, so some
+terms match a large share of the catalogue and others only a handful of rows.
+For each size it reports the index build time, then p50/p95 latency for the
+first page of each query and the average per-page latency of walking five pages
+by following X-Next-Cursor, next to an unindexed LIKE '%term%' scan for comparison. Use
+--max-candidates 0 to rank every match instead of SEARCH_MAX_CANDIDATES. It also
+times reindexing one cause, which every cause create/edit does in its transaction.
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func
+
+from common import make_bench_app, seed_sample
+from app.config import Config
+from app.extensions import db
+from app.models.donation import DonationRequest
+from app.utils.search import rebuild_search_index, index_causes
+
+VOCABULARY = ('water school children health clinic shelter food books medicine village rescue animals '
+              'forest clean flood relief teachers library vaccine winter blankets orphanage wells solar '
+              'garden nutrition hospital ambulance scholarship laptops refugees elderly mangrove coral '
+              'wildlife beekeeping prosthetics braille midwife dialysis').split()
+QUERIES = ['water', 'school children', 'medic', 'mangrove coral', 'braille', 'zzzunmatched']
+
+
+def words(rng, count):
+    # Zipf-like: word i is picked with weight 1/(i+1)
+    return ' '.join(rng.choices(VOCABULARY, weights=[1 / (i + 1) for i in range(len(VOCABULARY))], k=count))
+
+
+def insert_causes(app, data, count, rng, batch=20000):
+    now = datetime.utcnow()
+    ngo_ids = [n['id'] for n in data['ngos']]
+    category_ids = [c['id'] for c in data['categories']]
+    with app.app_context():
+        for start in range(0, count, batch):
+            rows = [dict(id=str(uuid.UUID(int=rng.getrandbits(128), version=4)), ngo_id=rng.choice(ngo_ids),
+                         category_id=rng.choice(category_ids), title=words(rng, 4).capitalize(),
+                         description=words(rng, 30), amount_needed=Decimal(1000), amount_received=Decimal(0),
+                         status='Approved', created_at=now - timedelta(seconds=rng.randint(0, 10 ** 7)),
+                         updated_at=now)
+                    for _ in range(min(batch, count - start))]
+            db.session.execute(DonationRequest.__table__.insert(), rows)
+        db.session.commit()
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[min(len(samples) - 1, int(len(samples) * 0.95))], result
+
+
+def run(size, args):
+    app = make_bench_app(RESPONSE_CACHE_ENABLED=False, SEARCH_MAX_CANDIDATES=args.max_candidates)
+    data = seed_sample(app, ngos=50, donors=1, causes=0, donations=0)
+    rng = random.Random(13)
+    started = time.perf_counter()
+    insert_causes(app, data, size, rng)
+    load_time = time.perf_counter() - started
+    with app.app_context():
+        started = time.perf_counter()
+        rebuild_search_index()
+        db.session.commit()
+        index_time = time.perf_counter() - started
+        cause_ids = [row[0] for row in db.session.query(DonationRequest.id).limit(args.repeat)]
+
+        def reindex_one():
+            index_causes([cause_ids.pop()])
+            db.session.commit()
+        reindex_50, _, _ = timed(reindex_one, len(cause_ids))
+    print(f'\n{size} causes: loaded in {load_time:.1f}s, indexed in {index_time:.1f}s, '
+          f'reindex one cause p50 {reindex_50:.1f}ms')
+    print(f'{"query":<18} {"rows":>5} {"page1 p50":>10} {"p95":>8} {"5pg p50":>10} {"p95":>8} {"LIKE p50":>10}')
+
+    client = app.test_client()
+
+    def page(q, number):
+        cursor, body = None, []
+        for _ in range(number):
+            params = {'q': q, 'limit': args.limit}
+            if cursor:
+                params['cursor'] = cursor
+            response = client.get('/api/causes/search', query_string=params)
+            body, cursor = response.get_json(), response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+        return body
+
+    def like_scan(q):
+        with app.app_context():
+            terms = [DonationRequest.title.like(f'%{t}%') | DonationRequest.description.like(f'%{t}%') for t in q.split()]
+            return db.session.query(func.count()).filter(DonationRequest.status == 'Approved', *terms).scalar()
+
+    for q in QUERIES:
+        p1_50, p1_95, rows = timed(lambda: page(q, 1), args.repeat)
+        # Walk five pages and report the cost per page
+        p5_50, p5_95, _ = timed(lambda: page(q, 5), max(2, args.repeat // 5))
+        like_50, _, _ = timed(lambda: like_scan(q), max(2, args.repeat // 5))
+        print(f'{q:<18} {len(rows):>5} {p1_50:>8.1f}ms {p1_95:>6.1f}ms {p5_50 / 5:>8.1f}ms {p5_95 / 5:>6.1f}ms '
+              f'{like_50:>8.1f}ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--causes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--max-candidates', type=int, default=Config.SEARCH_MAX_CANDIDATES)
+    args = parser.parse_args()
+    for size in args.causes:
+        run(size, args)
+
+
+if __name__ == '__main__':
+    main()
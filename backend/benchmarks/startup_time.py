@@ -0,0 +1,127 @@
+"""
+Measures how long a fresh process takes to import the app, build it with
+create_app() and answer its first request, with the route modules loaded
+eagerly and with LAZY_BLUEPRINTS, and how long a worker forked from a
+preloaded app (gunicorn preload_app, see gunicorn.conf.py) takes to answer.
+
+    python benchmarks/startup_time.py --runs 10
+    python benchmarks/startup_time.py --importtime --top 15
+    python benchmarks/startup_time.py --target-ms 600   # exits 1 if slower
+
+Each run is a new interpreter, so nothing is shared between runs but the
+operating system's file cache. --importtime adds a per-package breakdown from
+`python -X importtime`. This script itself never imports the app.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Timed in the child process; prints one JSON line
+_PROBE = r"""
+import json, os, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {backend!r})
+from app import create_app, warm_up, after_fork
+imported = time.perf_counter()
+app = create_app()
+created = time.perf_counter()
+timings = {{'import': imported - started, 'create_app': created - imported}}
+if {fork}:
+    warm_up(app)
+    read, write = os.pipe()
+    forked = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        after_fork(app)
+        status = app.test_client().get('/health').status_code
+        os.write(write, json.dumps([time.perf_counter() - forked, status]).encode())
+        os._exit(0)
+    os.waitpid(pid, 0)
+    timings['first_request'], status = json.loads(os.read(read, 1024))
+    timings['total'] = timings['first_request']
+else:
+    status = app.test_client().get('/health').status_code
+    timings['first_request'] = time.perf_counter() - created
+    timings['total'] = time.perf_counter() - started
+assert status == 200, status
+print(json.dumps(timings))
+"""
+
+
+def child_env(database_url, lazy):
+    env = dict(os.environ, FLASK_ENV='production', DATABASE_URL=database_url,
+               EMAIL_SENDER_WORKERS='0', UPLOAD_WORKERS='0')
+    env['LAZY_BLUEPRINTS'] = '1' if lazy else '0'
+    return env
+
+
+def run_probe(database_url, lazy=False, fork=False):
+    code = _PROBE.format(backend=BACKEND, fork=fork)
+    output = subprocess.run([sys.executable, '-c', code], env=child_env(database_url, lazy), cwd=BACKEND,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_profile(database_url, lazy=False):
+    """Import time in ms spent in each top-level package's own modules, from `python -X importtime`."""
+    code = f"import sys; sys.path.insert(0, {BACKEND!r}); from app import create_app; create_app()"
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=child_env(database_url, lazy),
+                            cwd=BACKEND, capture_output=True, text=True, check=True).stderr
+    totals = defaultdict(float)
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+\d+ \|\s+(\S+)', line)
+        if match:
+            totals[match.group(2).split('.')[0]] += int(match.group(1)) / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def report(name, runs):
+    row = {key: statistics.median(run[key] for run in runs) * 1000 for key in runs[0]}
+    print(f"{name:<20} {row['import']:>9.1f} {row['create_app']:>11.1f} {row['first_request']:>14.1f} "
+          f"{row['total']:>9.1f}")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--importtime', action='store_true', help='print an import time breakdown by package')
+    parser.add_argument('--top', type=int, default=12, help='packages to list with --importtime')
+    parser.add_argument('--target-ms', type=float,
+                        help='exit with status 1 if the median eager time to first request is above this')
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(prefix='bench-', suffix='.db')
+    os.close(fd)
+    database_url = 'sqlite:///' + path
+    try:
+        print(f"median of {args.runs} runs, ms")
+        print(f"{'mode':<20} {'import':>9} {'create_app':>11} {'first request':>14} {'total':>9}")
+        eager = report('eager', [run_probe(database_url) for _ in range(args.runs)])
+        report('lazy blueprints', [run_probe(database_url, lazy=True) for _ in range(args.runs)])
+        if hasattr(os, 'fork'):
+            report('forked (preload)', [run_probe(database_url, fork=True) for _ in range(args.runs)])
+
+        if args.importtime:
+            for lazy in (False, True):
+                print(f"\nimport time by package ({'lazy blueprints' if lazy else 'eager'}), ms")
+                for package, ms in import_profile(database_url, lazy)[:args.top]:
+                    print(f"  {package:<28} {ms:>8.1f}")
+    finally:
+        os.remove(path)
+
+    if args.target_ms is not None and eager['total'] > args.target_ms:
+        print(f"\nFAIL: time to first request {eager['total']:.1f}ms is above the {args.target_ms:.0f}ms target")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
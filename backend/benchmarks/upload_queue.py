@@ -0,0 +1,84 @@
+"""
+Measures the image upload path: how long POST /api/ngo/causes/<id>/image holds
+a request thread, and how long the queue takes to drain, against an uploader
+that takes --delay seconds per file (a stand-in for Cloudinary latency).
+
+    python benchmarks/upload_queue.py --uploads 200 --delay 0.5 --workers 1 4 8
+
+For comparison it also times calling the uploader inline, which is what the
+request thread used to pay for every upload.
+"""
+import argparse
+import io
+import statistics
+import tempfile
+import time
+
+from common import make_bench_app, seed_sample, auth_headers
+from app.models.upload import UploadJob
+from app.utils.uploaders import LocalUploader
+
+
+class SlowUploader(LocalUploader):
+    def __init__(self, directory, delay):
+        super().__init__(directory)
+        self.delay = delay
+
+    def upload(self, path, key):
+        time.sleep(self.delay)
+        return super().upload(path, key)
+
+
+def run(workers, args, image):
+    directory = tempfile.mkdtemp(prefix='bench-uploads-')
+    app = make_bench_app(UPLOAD_BACKEND='local', LOCAL_UPLOAD_DIR=directory, UPLOAD_STAGING_DIR=directory + '/staging',
+                         UPLOAD_WORKERS=workers, UPLOAD_POLL_INTERVAL=0.2)
+    app.extensions['uploader'] = SlowUploader(directory, args.delay)
+    data = seed_sample(app, ngos=5, donors=1, causes=50, donations=0)
+    users = {u['id']: u for u in data['users']}
+    ngo_ids = {n['id']: n for n in data['ngos'] if users[n['user_id']]['is_approved']}
+    causes = [c for c in data['causes'] if c['ngo_id'] in ngo_ids]
+    headers = {ngo_id: auth_headers(app, users[ngo['user_id']]) for ngo_id, ngo in ngo_ids.items()}
+
+    client = app.test_client()
+    latencies = []
+    started = time.perf_counter()
+    for i in range(args.uploads):
+        cause = causes[i % len(causes)]
+        before = time.perf_counter()
+        response = client.post(f"/api/ngo/causes/{cause['id']}/image", headers=headers[cause['ngo_id']],
+                               data={'image': (io.BytesIO(image), 'photo.jpg')}, content_type='multipart/form-data')
+        latencies.append((time.perf_counter() - before) * 1000)
+        assert response.status_code == 202, response.get_json()
+    accepted = time.perf_counter() - started
+
+    with app.app_context():
+        while UploadJob.query.filter(UploadJob.status.in_(('Queued', 'Running'))).count():
+            time.sleep(0.05)
+        succeeded = UploadJob.query.filter_by(status='Succeeded').count()
+    drained = time.perf_counter() - started
+    app.extensions['upload_workers'].stop(timeout=5)
+
+    latencies.sort()
+    print(f'{workers:>7} {statistics.median(latencies):>9.1f}ms {latencies[int(len(latencies) * 0.99)]:>8.1f}ms '
+          f'{accepted:>9.2f}s {drained:>9.2f}s {succeeded:>9}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--uploads', type=int, default=100)
+    parser.add_argument('--delay', type=float, default=0.2, help='seconds the stand-in uploader takes per file')
+    parser.add_argument('--size', type=int, default=200 * 1024, help='image size in bytes')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8])
+    args = parser.parse_args()
+    image = b'\xff\xd8\xff' + b'\0' * (args.size - 3)
+
+    print(f'inline upload (old behaviour): ~{args.delay * 1000:.0f}ms per request, '
+          f'{args.uploads * args.delay:.1f}s of request-thread time for {args.uploads} uploads')
+    print(f'{"workers":>7} {"POST p50":>11} {"p99":>10} {"accepted":>10} {"drained":>10} {"succeeded":>9}')
+    for workers in args.workers:
+        run(workers, args, image)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+# Gunicorn settings for the API: gunicorn -c gunicorn.conf.py run:app
+#
+# The app is created once in the master (preload_app) and workers are forked from
+# it, so a new worker starts with every module imported, the ORM configured and
+# the URL map compiled, sharing that memory copy-on-write with its siblings.
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+
+
+def when_ready(server):
+    if preload_app:
+        from app import warm_up
+        warm_up(server.app.wsgi())
+
+
+def pre_fork(server, worker):
+    # Keep the garbage collector from touching (and so copying) the preloaded objects
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from app import after_fork
+        after_fork(server.app.wsgi())
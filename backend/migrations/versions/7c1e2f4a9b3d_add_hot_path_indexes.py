@@ -0,0 +1,42 @@
+"""Add indexes for hot filter and sort columns
+
+Revision ID: 7c1e2f4a9b3d
+Revises: 506f3252f530
+Create Date: 2026-10-18 09:45:12.301944
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e2f4a9b3d'
+down_revision = '506f3252f530'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # donation_requests: every list endpoint pages on (created_at, id) after its filter
+    op.create_index('ix_donation_requests_status_created_at', 'donation_requests', ['status', 'created_at', 'id'])
+    op.create_index('ix_donation_requests_category_status_created_at', 'donation_requests',
+                    ['category_id', 'status', 'created_at', 'id'])
+    op.create_index('ix_donation_requests_ngo_created_at', 'donation_requests', ['ngo_id', 'created_at', 'id'])
+    op.create_index('ix_donation_requests_created_at', 'donation_requests', ['created_at', 'id'])
+
+    # donations: donor history and per-request lookups
+    op.create_index('ix_donations_donor_created_at', 'donations', ['donor_id', 'created_at', 'id'])
+    op.create_index('ix_donations_donation_request_id', 'donations', ['donation_request_id'])
+
+    # users: admin pending-NGO queue and NGO counts
+    op.create_index('ix_users_role_approved_created_at', 'users', ['role', 'is_approved', 'created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_users_role_approved_created_at', table_name='users')
+    op.drop_index('ix_donations_donation_request_id', table_name='donations')
+    op.drop_index('ix_donations_donor_created_at', table_name='donations')
+    op.drop_index('ix_donation_requests_created_at', table_name='donation_requests')
+    op.drop_index('ix_donation_requests_ngo_created_at', table_name='donation_requests')
+    op.drop_index('ix_donation_requests_category_status_created_at', table_name='donation_requests')
+    op.drop_index('ix_donation_requests_status_created_at', table_name='donation_requests')
@@ -0,0 +1,43 @@
+"""Add dashboard_stats counters table
+
+Revision ID: 9d4b6a1c2e58
+Revises: 7c1e2f4a9b3d
+Create Date: 2026-10-18 10:20:41.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4b6a1c2e58'
+down_revision = '7c1e2f4a9b3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'dashboard_stats',
+        sa.Column('name', sa.String(50), primary_key=True),
+        sa.Column('value', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime, default=sa.func.now(), nullable=False),
+    )
+
+    # Seed the counters from the existing data; the app keeps them current from here on.
+    op.execute("""
+        INSERT INTO dashboard_stats (name, value, updated_at)
+        SELECT 'total_ngos', COUNT(*), CURRENT_TIMESTAMP FROM users WHERE role = 'NGO'
+    """)
+    op.execute("""
+        INSERT INTO dashboard_stats (name, value, updated_at)
+        SELECT 'pending_approvals', COUNT(*), CURRENT_TIMESTAMP FROM users WHERE role = 'NGO' AND is_approved = false
+    """)
+    op.execute("""
+        INSERT INTO dashboard_stats (name, value, updated_at)
+        SELECT 'total_donations', COALESCE(SUM(amount_donated), 0), CURRENT_TIMESTAMP FROM donations
+    """)
+
+
+def downgrade():
+    op.drop_table('dashboard_stats')
@@ -0,0 +1,41 @@
+"""Add the email_outbox table for notification emails
+
+Revision ID: a8c2e6f4d193
+Revises: f3b7d2a6c481
+Create Date: 2026-10-18 17:02:44.183920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8c2e6f4d193'
+down_revision = 'f3b7d2a6c481'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column('kind', sa.String(40), nullable=False),
+        sa.Column('recipient', sa.String(120), nullable=False),
+        sa.Column('object_id', sa.String(36), nullable=True),
+        sa.Column('context', sa.JSON, nullable=True),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('attempts', sa.Integer, nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime, nullable=False),
+        sa.Column('locked_until', sa.DateTime, nullable=True),
+        sa.Column('claim_token', sa.String(36), nullable=True),
+        sa.Column('last_error', sa.Text, nullable=True),
+        sa.Column('created_at', sa.DateTime, nullable=False),
+        sa.Column('sent_at', sa.DateTime, nullable=True),
+    )
+    op.create_index('ix_email_outbox_status_next_attempt_at', 'email_outbox', ['status', 'next_attempt_at'])
+
+
+def downgrade():
+    op.drop_index('ix_email_outbox_status_next_attempt_at', table_name='email_outbox')
+    op.drop_table('email_outbox')
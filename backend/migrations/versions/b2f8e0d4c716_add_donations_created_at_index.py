@@ -0,0 +1,24 @@
+"""Add donations created_at index for date-range exports
+
+Revision ID: b2f8e0d4c716
+Revises: 9d4b6a1c2e58
+Create Date: 2026-10-18 10:58:03.542117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2f8e0d4c716'
+down_revision = '9d4b6a1c2e58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_donations_created_at', 'donations', ['created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_donations_created_at', table_name='donations')
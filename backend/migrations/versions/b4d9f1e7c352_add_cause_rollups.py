@@ -0,0 +1,57 @@
+"""Add the cause_daily_stats and cause_donors rollups for the NGO dashboard
+
+Revision ID: b4d9f1e7c352
+Revises: a8c2e6f4d193
+Create Date: 2026-10-18 18:21:07.514306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d9f1e7c352'
+down_revision = 'a8c2e6f4d193'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cause_daily_stats',
+        sa.Column('donation_request_id', sa.String(36),
+                  sa.ForeignKey('donation_requests.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('day', sa.Date, primary_key=True),
+        sa.Column('total_donated', sa.Numeric(14, 2), nullable=False),
+        sa.Column('gift_count', sa.Integer, nullable=False),
+        sa.Column('new_donor_count', sa.Integer, nullable=False),
+    )
+    op.create_table(
+        'cause_donors',
+        sa.Column('donation_request_id', sa.String(36),
+                  sa.ForeignKey('donation_requests.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('donor_id', sa.String(36),
+                  sa.ForeignKey('donor_profiles.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('first_gift_at', sa.DateTime, nullable=False),
+    )
+
+    # Backfill from the existing donations (same as `flask stats rollups`)
+    op.execute(
+        "INSERT INTO cause_donors (donation_request_id, donor_id, first_gift_at) "
+        "SELECT donation_request_id, donor_id, MIN(created_at) FROM donations "
+        "GROUP BY donation_request_id, donor_id"
+    )
+    op.execute(
+        "INSERT INTO cause_daily_stats (donation_request_id, day, total_donated, gift_count, new_donor_count) "
+        "SELECT d.donation_request_id, d.day, d.total_donated, d.gift_count, COALESCE(n.new_donor_count, 0) "
+        "FROM (SELECT donation_request_id, DATE(created_at) AS day, SUM(amount_donated) AS total_donated, "
+        "      COUNT(*) AS gift_count FROM donations GROUP BY donation_request_id, DATE(created_at)) AS d "
+        "LEFT OUTER JOIN (SELECT donation_request_id, DATE(first_gift_at) AS day, COUNT(*) AS new_donor_count "
+        "      FROM cause_donors GROUP BY donation_request_id, DATE(first_gift_at)) AS n "
+        "ON n.donation_request_id = d.donation_request_id AND n.day = d.day"
+    )
+
+
+def downgrade():
+    op.drop_table('cause_donors')
+    op.drop_table('cause_daily_stats')
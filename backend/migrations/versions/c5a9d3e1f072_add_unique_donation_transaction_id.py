@@ -0,0 +1,25 @@
+"""Make donations.transaction_id unique for idempotent bulk ingestion
+
+Revision ID: c5a9d3e1f072
+Revises: b2f8e0d4c716
+Create Date: 2026-10-18 11:31:47.906215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a9d3e1f072'
+down_revision = 'b2f8e0d4c716'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # NULLs are not considered equal, so donations without a transaction id are unaffected
+    op.create_index('uq_donations_transaction_id', 'donations', ['transaction_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_donations_transaction_id', table_name='donations')
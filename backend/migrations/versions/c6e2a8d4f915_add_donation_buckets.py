@@ -0,0 +1,60 @@
+"""Add the donation_buckets table for admin donation analytics
+
+Revision ID: c6e2a8d4f915
+Revises: b4d9f1e7c352
+Create Date: 2026-10-18 19:36:52.208471
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e2a8d4f915'
+down_revision = 'b4d9f1e7c352'
+branch_labels = None
+depends_on = None
+
+# First day of each bucket, per dialect (same as analytics_helpers.period_start)
+_BUCKET_SQL = {
+    'sqlite': {
+        'day': "DATE(d.created_at)",
+        'week': "DATE(d.created_at, 'weekday 0', '-6 days')",
+        'month': "DATE(d.created_at, 'start of month')",
+    },
+    'postgresql': {
+        'day': "DATE(d.created_at)",
+        'week': "DATE(DATE_TRUNC('week', d.created_at))",
+        'month': "DATE(DATE_TRUNC('month', d.created_at))",
+    },
+}
+
+
+def upgrade():
+    op.create_table(
+        'donation_buckets',
+        sa.Column('granularity', sa.String(5), primary_key=True),
+        sa.Column('bucket_start', sa.Date, primary_key=True),
+        sa.Column('category_id', sa.String(36),
+                  sa.ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('ngo_id', sa.String(36),
+                  sa.ForeignKey('ngo_profiles.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('total_donated', sa.Numeric(14, 2), nullable=False),
+        sa.Column('gift_count', sa.Integer, nullable=False),
+    )
+
+    # Backfill from the existing donations (same as `flask analytics backfill`)
+    buckets = _BUCKET_SQL.get(op.get_bind().dialect.name)
+    if not buckets:
+        return
+    for granularity, bucket in buckets.items():
+        op.execute(
+            "INSERT INTO donation_buckets (granularity, bucket_start, category_id, ngo_id, total_donated, gift_count) "
+            f"SELECT '{granularity}', {bucket}, r.category_id, r.ngo_id, SUM(d.amount_donated), COUNT(*) "
+            "FROM donations AS d JOIN donation_requests AS r ON r.id = d.donation_request_id "
+            f"GROUP BY {bucket}, r.category_id, r.ngo_id"
+        )
+
+
+def downgrade():
+    op.drop_table('donation_buckets')
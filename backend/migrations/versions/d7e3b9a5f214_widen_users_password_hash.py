@@ -0,0 +1,33 @@
+"""Widen users.password_hash for configurable hash cost profiles
+
+Revision ID: d7e3b9a5f214
+Revises: c5a9d3e1f072
+Create Date: 2026-10-18 12:05:13.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e3b9a5f214'
+down_revision = 'c5a9d3e1f072'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # scrypt and pbkdf2:sha512 hashes are longer than 128 characters
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=128),
+               type_=sa.String(length=255),
+               existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('password_hash',
+               existing_type=sa.String(length=255),
+               type_=sa.String(length=128),
+               existing_nullable=False)
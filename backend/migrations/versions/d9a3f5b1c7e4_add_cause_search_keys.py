@@ -0,0 +1,39 @@
+"""Key the SQLite cause search index by rowid
+
+Revision ID: d9a3f5b1c7e4
+Revises: c6e2a8d4f915
+Create Date: 2026-10-18 21:14:06.512739
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a3f5b1c7e4'
+down_revision = 'c6e2a8d4f915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres keys cause_search by its request_id primary key already
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("CREATE TABLE cause_search_keys (id INTEGER PRIMARY KEY, request_id VARCHAR(36) NOT NULL UNIQUE)")
+    op.execute(
+        "INSERT INTO cause_search_keys (request_id) "
+        "SELECT dr.id FROM donation_requests dr ORDER BY dr.created_at, dr.id"
+    )
+    op.execute("DELETE FROM cause_search")
+    op.execute(
+        "INSERT INTO cause_search (rowid, request_id, title, description, organization_name) "
+        "SELECT k.id, dr.id, dr.title, dr.description, np.organization_name "
+        "FROM donation_requests dr JOIN ngo_profiles np ON np.id = dr.ngo_id "
+        "JOIN cause_search_keys k ON k.request_id = dr.id ORDER BY k.id"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS cause_search_keys")
@@ -0,0 +1,50 @@
+"""Add the cause full-text search index
+
+Revision ID: e1a4c8f2b937
+Revises: d7e3b9a5f214
+Create Date: 2026-10-18 13:02:44.170351
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1a4c8f2b937'
+down_revision = 'd7e3b9a5f214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE cause_search USING fts5("
+            "request_id UNINDEXED, title, description, organization_name, tokenize='porter unicode61')"
+        )
+        op.execute(
+            "INSERT INTO cause_search (request_id, title, description, organization_name) "
+            "SELECT dr.id, dr.title, dr.description, np.organization_name "
+            "FROM donation_requests dr JOIN ngo_profiles np ON np.id = dr.ngo_id"
+        )
+    elif dialect == 'postgresql':
+        op.execute(
+            "CREATE TABLE cause_search ("
+            "request_id VARCHAR(36) PRIMARY KEY REFERENCES donation_requests(id) ON DELETE CASCADE, "
+            "document TSVECTOR NOT NULL)"
+        )
+        op.execute(
+            "INSERT INTO cause_search (request_id, document) "
+            "SELECT dr.id, "
+            "setweight(to_tsvector('english', coalesce(dr.title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(np.organization_name, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(dr.description, '')), 'C') "
+            "FROM donation_requests dr JOIN ngo_profiles np ON np.id = dr.ngo_id"
+        )
+        op.execute("CREATE INDEX ix_cause_search_document ON cause_search USING GIN (document)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name in ('sqlite', 'postgresql'):
+        op.execute("DROP TABLE IF EXISTS cause_search")
@@ -0,0 +1,55 @@
+"""Split the dashboard counters and donation buckets into shards
+
+Revision ID: e4c7a1d9b2f6
+Revises: d9a3f5b1c7e4
+Create Date: 2026-10-18 23:12:07.541830
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4c7a1d9b2f6'
+down_revision = 'd9a3f5b1c7e4'
+branch_labels = None
+depends_on = None
+
+_KEYS = {
+    'dashboard_stats': ['name'],
+    'donation_buckets': ['granularity', 'bucket_start', 'category_id', 'ngo_id'],
+}
+
+
+def _rekey(table, columns, shard):
+    """Makes `columns` (plus the new shard column when `shard`) the table's primary key, or drops shard again."""
+    with op.batch_alter_table(table) as batch_op:
+        if shard:
+            batch_op.add_column(sa.Column('shard', sa.Integer, nullable=False, server_default='0'))
+        if op.get_bind().dialect.name != 'sqlite':
+            batch_op.drop_constraint(f'{table}_pkey', type_='primary')
+        batch_op.create_primary_key(f'{table}_pkey', columns + (['shard'] if shard else []))
+        if not shard:
+            batch_op.drop_column('shard')
+
+
+def upgrade():
+    # Existing rows become shard 0
+    for table, keys in _KEYS.items():
+        _rekey(table, keys, shard=True)
+
+
+def downgrade():
+    # Fold every counter's and bucket's shards into one row before dropping the column
+    op.execute(
+        "INSERT INTO dashboard_stats (name, shard, value, updated_at) "
+        "SELECT name, -1, SUM(value), MAX(updated_at) FROM dashboard_stats GROUP BY name"
+    )
+    op.execute(
+        "INSERT INTO donation_buckets (granularity, bucket_start, category_id, ngo_id, shard, total_donated, gift_count) "
+        "SELECT granularity, bucket_start, category_id, ngo_id, -1, SUM(total_donated), SUM(gift_count) "
+        "FROM donation_buckets GROUP BY granularity, bucket_start, category_id, ngo_id"
+    )
+    for table, keys in _KEYS.items():
+        op.execute(f"DELETE FROM {table} WHERE shard <> -1")
+        _rekey(table, keys, shard=False)
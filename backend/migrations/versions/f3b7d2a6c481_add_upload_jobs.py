@@ -0,0 +1,45 @@
+"""Add the upload_jobs queue for cause images
+
+Revision ID: f3b7d2a6c481
+Revises: e1a4c8f2b937
+Create Date: 2026-10-18 15:41:09.527314
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b7d2a6c481'
+down_revision = 'e1a4c8f2b937'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'upload_jobs',
+        sa.Column('id', sa.String(36), primary_key=True),
+        sa.Column('donation_request_id', sa.String(36),
+                  sa.ForeignKey('donation_requests.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('staged_path', sa.String(500), nullable=False),
+        sa.Column('filename', sa.String(255), nullable=True),
+        sa.Column('attempts', sa.Integer, nullable=False),
+        sa.Column('max_attempts', sa.Integer, nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime, nullable=False),
+        sa.Column('locked_until', sa.DateTime, nullable=True),
+        sa.Column('last_error', sa.Text, nullable=True),
+        sa.Column('result_url', sa.String(255), nullable=True),
+        sa.Column('created_at', sa.DateTime, nullable=False),
+        sa.Column('updated_at', sa.DateTime, nullable=False),
+        sa.Column('finished_at', sa.DateTime, nullable=True),
+    )
+    op.create_index('ix_upload_jobs_donation_request_id', 'upload_jobs', ['donation_request_id'])
+    op.create_index('ix_upload_jobs_status_next_attempt_at', 'upload_jobs', ['status', 'next_attempt_at'])
+
+
+def downgrade():
+    op.drop_index('ix_upload_jobs_status_next_attempt_at', table_name='upload_jobs')
+    op.drop_index('ix_upload_jobs_donation_request_id', table_name='upload_jobs')
+    op.drop_table('upload_jobs')
@@ -1,8 +1,9 @@
 from app import create_app
-from seed import seed_data
+from app.commands import LazyCommand
 # Create the Flask application instance
 app = create_app()
-app.cli.add_command(seed_data)
+# seed.py is only imported when `flask seed` runs
+app.cli.add_command(LazyCommand('seed', 'seed:seed_data', help='Seeds the database with sample data.'))
 if __name__ == '__main__':
     # Run the Flask development server
     # In a production environment, use a WSGI server like Gunicorn or uWSGI
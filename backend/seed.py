@@ -2,22 +2,26 @@ import os
 import click
 from datetime import datetime, timedelta
 from flask.cli import with_appcontext
+from sqlalchemy import text
 from app.extensions import db
 from app.models.user import User
 from app.models.ngo import NGOProfile
 from app.models.donor import DonorProfile
 from app.models.cause import Category
 from app.models.donation import DonationRequest, Donation
+from app.models.cause_stats import CauseDailyStat, CauseDonor
+from app.models.analytics import DonationBucket
+from app.utils.stats_helpers import rebuild_stats
+from app.utils.search import rebuild_search_index
+from app.utils.rollup_helpers import rebuild_cause_rollups
+from app.utils.analytics_helpers import backfill_buckets
+from app.utils.seeding import generate_dataset, SEED_PASSWORD
 from decimal import Decimal
 
-@click.command(name='seed')
-@with_appcontext
-def seed_data():
-    """Clears existing data and seeds the database with sample data."""
-    print("Starting database seed...")
-
-    # --- 1. Clear Existing Data ---
-    print("Clearing existing data...")
+def clear_data():
+    CauseDailyStat.query.delete()
+    CauseDonor.query.delete()
+    DonationBucket.query.delete()
     Donation.query.delete()
     DonationRequest.query.delete()
     Category.query.delete()
@@ -26,6 +30,57 @@ def seed_data():
     User.query.delete()
     db.session.commit()
 
+
+def seed_scaled(scale, seed, batch_size):
+    """Replaces all data with a synthetic dataset of the given scale (see app/utils/seeding.py)."""
+    sqlite = db.engine.dialect.name == 'sqlite'
+    if sqlite:
+        # Nothing here needs to survive a crash before the final commit
+        previous_synchronous = db.session.execute(text("PRAGMA synchronous")).scalar()
+        db.session.execute(text("PRAGMA synchronous=OFF"))
+    try:
+        counts = generate_dataset(scale=scale, seed=seed, batch_size=batch_size)
+        print("Rebuilding dashboard stats, cause rollups, analytics buckets and search index...")
+        rebuild_stats()
+        rebuild_cause_rollups()
+        backfill_buckets()
+        rebuild_search_index()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        if sqlite:
+            db.session.execute(text(f"PRAGMA synchronous={int(previous_synchronous)}"))
+            db.session.commit()
+
+    seconds, donation_seconds = counts.pop('seconds'), counts.pop('donation_seconds')
+    print(', '.join(f"{count} {name}" for name, count in counts.items()) + f" inserted in {seconds:.1f}s; "
+          f"donations at {counts['donations'] / max(donation_seconds, 0.001):,.0f}/s including index builds.")
+    print(f"All accounts use the password '{SEED_PASSWORD}' (admin@example.com, ngo0@example.com, donor0@example.com, ...).")
+
+
+@click.command(name='seed')
+@click.option('--scale', type=float, default=None,
+              help='Generate a synthetic dataset instead of the demo data; scale 1 is 5,000 donors, '
+                   '2,000 causes and 100,000 donations.')
+@click.option('--seed', 'random_seed', type=int, default=1, show_default=True,
+              help='Random seed for --scale; the same seed gives the same data.')
+@click.option('--batch-size', type=int, default=50000, show_default=True, help='Rows per insert batch for --scale.')
+@with_appcontext
+def seed_data(scale, random_seed, batch_size):
+    """Clears existing data and seeds the database with sample data."""
+    print("Starting database seed...")
+
+    # --- 1. Clear Existing Data ---
+    print("Clearing existing data...")
+    clear_data()
+
+    if scale:
+        print(f"Generating a synthetic dataset at scale {scale:g}...")
+        seed_scaled(scale, random_seed, batch_size)
+        return
+
     try:
         # --- 2. Create Categories ---
         print("Creating categories...")
@@ -94,6 +149,22 @@ def seed_data():
         db.session.add_all([donation1, donation2, donation3])
         db.session.commit()
 
+        # --- 6. Rebuild Dashboard Counters ---
+        print("Rebuilding dashboard stats...")
+        rebuild_stats()
+        db.session.commit()
+
+        # --- 7. Rebuild Cause Rollups ---
+        print("Rebuilding cause rollups and analytics buckets...")
+        rebuild_cause_rollups()
+        backfill_buckets()
+        db.session.commit()
+
+        # --- 8. Rebuild Search Index ---
+        print("Rebuilding cause search index...")
+        rebuild_search_index()
+        db.session.commit()
+
         print("Database seed completed successfully!")
 
     except Exception as e:
@@ -0,0 +1,108 @@
+import itertools
+import os
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_jwt_extended import create_access_token
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models import User, NGOProfile, DonorProfile, Category
+from app.models.donation import DonationRequest, Donation
+
+
+@pytest.fixture
+def app(tmp_path):
+    """An app bound to a throwaway SQLite database with all tables created."""
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path / 'test.db')
+        RESPONSE_CACHE_ENABLED = False
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def sample_data(app):
+    """A small dataset covering the optional fields the schemas serialize (None and set)."""
+    base = datetime(2025, 1, 1, 12, 0, 0, 123456)
+
+    education = Category(name='Education', description='Causes related to educational support.')
+    health = Category(name='Health', description=None)
+    db.session.add_all([education, health])
+
+    ngo_user = User(username='Hope Foundation', email='ngo@example.com', role='NGO', is_approved=True)
+    donor_user = User(username='Alice', email='alice@example.com', role='Donor', is_approved=True)
+    for user in (ngo_user, donor_user):
+        user.password_hash = 'not-a-real-hash'
+    db.session.add_all([ngo_user, donor_user])
+    db.session.flush()
+
+    ngo = NGOProfile(user_id=ngo_user.id, organization_name='Hope Foundation', contact_person='John Doe',
+                     phone_number='123-456-7890', website_url='https://hope.example.org', description=None)
+    donor = DonorProfile(user_id=donor_user.id, first_name='Alice', last_name='Wonder')
+    db.session.add_all([ngo, donor])
+    db.session.flush()
+
+    causes = []
+    for i in range(12):
+        causes.append(DonationRequest(
+            ngo_id=ngo.id,
+            category_id=(education if i % 2 else health).id,
+            title=f'Cause number {i}',
+            description='A description that is comfortably longer than twenty characters.',
+            amount_needed=Decimal('1000.00') + i,
+            amount_received=Decimal('12.50') * i,
+            image_url='https://img.example.org/%d.png' % i if i % 3 else None,
+            status='Approved' if i % 4 else 'Pending',
+            created_at=base + timedelta(hours=i),
+        ))
+    db.session.add_all(causes)
+    db.session.flush()
+
+    for i, cause in enumerate(causes[:6]):
+        db.session.add(Donation(donor_id=donor.id, donation_request_id=cause.id,
+                                amount_donated=Decimal('10.05') * (i + 1), created_at=base + timedelta(days=i)))
+    db.session.commit()
+    return {'ngo_user': ngo_user, 'donor_user': donor_user, 'ngo': ngo, 'donor': donor, 'causes': causes}
+
+
+@pytest.fixture
+def admin_user(app):
+    admin = User(username='Admin', email='admin@example.com', role='Admin', is_approved=True)
+    admin.password_hash = 'not-a-real-hash'
+    db.session.add(admin)
+    db.session.commit()
+    return admin
+
+
+@pytest.fixture
+def auth_headers(app):
+    def make(user):
+        token = create_access_token(identity={'id': user.id}, additional_claims={'role': user.role})
+        return {'Authorization': f'Bearer {token}'}
+    return make
+
+
+@pytest.fixture
+def rotating_shards(app, monkeypatch):
+    """Sends the dashboard counter and donation bucket writes each to shards 0-3 in turn instead of at random."""
+    from app.utils import analytics_helpers, stats_helpers
+    app.config['COUNTER_SHARDS'] = 4
+    for module in (stats_helpers, analytics_helpers):
+        monkeypatch.setattr(module, 'pick_shard', itertools.cycle(range(4)).__next__)
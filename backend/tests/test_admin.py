@@ -0,0 +1,90 @@
+import csv
+import io
+
+from app.extensions import db
+from app.models import User
+from app.models.stats import DashboardStat
+from app.models.outbox import OutboxEmail
+from app.utils.donation_helpers import ingest_donations
+from app.utils.stats_helpers import get_stats, rebuild_stats, PENDING_APPROVALS, TOTAL_DONATIONS
+
+
+def _pending_ngo():
+    ngo = User(username='Pending Org', email='pending@example.com', role='NGO', is_approved=False)
+    ngo.password_hash = 'not-a-real-hash'
+    db.session.add(ngo)
+    db.session.commit()
+    return ngo
+
+
+def _synced_stats():
+    rebuild_stats()
+    db.session.commit()
+
+
+def test_approving_twice_counts_the_approval_once(client, sample_data, admin_user, auth_headers):
+    ngo = _pending_ngo()
+    _synced_stats()
+    pending = get_stats()[PENDING_APPROVALS]
+
+    for _ in range(2):
+        response = client.post(f'/api/admin/ngos/{ngo.id}/approve', headers=auth_headers(admin_user))
+        assert response.status_code == 200
+
+    assert get_stats()[PENDING_APPROVALS] == pending - 1
+    assert rebuild_stats() == {}
+    assert OutboxEmail.query.filter_by(kind='ngo_approved').count() == 1
+
+
+def test_rejecting_an_ngo_takes_its_donations_out_of_the_counters(client, sample_data, admin_user, auth_headers):
+    _synced_stats()
+    headers = auth_headers(admin_user)
+
+    response = client.post(f"/api/admin/ngos/{sample_data['ngo_user'].id}/reject", headers=headers)
+
+    assert response.status_code == 200
+    assert rebuild_stats() == {}
+    assert client.post(f"/api/admin/ngos/{sample_data['ngo_user'].id}/reject", headers=headers).status_code == 404
+
+
+def test_deleting_a_cause_takes_its_donations_out_of_the_counters(client, sample_data, auth_headers):
+    _synced_stats()
+
+    response = client.delete(f"/api/ngo/causes/{sample_data['causes'][2].id}",
+                             headers=auth_headers(sample_data['ngo_user']))
+
+    assert response.status_code == 200
+    assert rebuild_stats() == {}
+
+
+def test_donation_total_is_spread_over_shards_and_summed(sample_data, rotating_shards):
+    _synced_stats()
+    total = get_stats()[TOTAL_DONATIONS]
+    row = {'donor_id': sample_data['donor'].id, 'donation_request_id': sample_data['causes'][1].id,
+           'amount_donated': '2.50'}
+    for i in range(4):
+        ingest_donations([dict(row, transaction_id=f't{i}')])
+        db.session.commit()
+
+    assert DashboardStat.query.filter_by(name=TOTAL_DONATIONS).count() == 4
+    assert get_stats()[TOTAL_DONATIONS] == total + 10
+    assert rebuild_stats() == {}
+    assert DashboardStat.query.filter_by(name=TOTAL_DONATIONS).count() == 1
+
+
+def test_csv_export_quotes_cells_that_would_run_as_formulas(client, sample_data, admin_user, auth_headers):
+    sample_data['causes'][1].title = '=HYPERLINK("https://evil.example","Click")'
+    sample_data['ngo'].organization_name = '@SUM(A1:A9)'
+    db.session.commit()
+
+    response = client.get('/api/admin/export/donation-requests?format=csv', headers=auth_headers(admin_user))
+
+    assert response.status_code == 200
+    rows = {row['donation_request_id']: row for row in csv.DictReader(io.StringIO(response.get_data(as_text=True)))}
+    cause = rows[sample_data['causes'][1].id]
+    assert cause['title'] == '\'=HYPERLINK("https://evil.example","Click")'
+    assert cause['ngo_name'] == "'@SUM(A1:A9)"
+    assert cause['amount_needed'] == '1001.00'
+    assert rows[sample_data['causes'][2].id]['title'] == 'Cause number 2'
+    ndjson = client.get('/api/admin/export/donation-requests?format=ndjson', headers=auth_headers(admin_user))
+    assert '"title":"=HYPERLINK' in ndjson.get_data(as_text=True)
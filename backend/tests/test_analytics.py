@@ -0,0 +1,90 @@
+from datetime import date
+from decimal import Decimal
+
+from app.extensions import db
+from app.models.analytics import DonationBucket
+from app.utils.analytics_helpers import backfill_buckets
+from app.utils.donation_helpers import ingest_donations
+
+
+def _buckets():
+    """{bucket key: (total, gifts)} with each bucket's shards summed."""
+    buckets = {}
+    for b in DonationBucket.query:
+        total, gifts = buckets.get((b.granularity, b.bucket_start, b.category_id, b.ngo_id), (Decimal('0'), 0))
+        buckets[(b.granularity, b.bucket_start, b.category_id, b.ngo_id)] = \
+            (total + Decimal(str(b.total_donated)), gifts + b.gift_count)
+    return buckets
+
+
+def _assert_buckets_match_backfill():
+    incremental = _buckets()
+    backfill_buckets()
+    assert incremental == _buckets()
+
+
+def _backfilled(sample_data):
+    backfill_buckets()
+    db.session.commit()
+    return sample_data
+
+
+def test_recorded_donations_land_in_their_buckets(app, sample_data):
+    _backfilled(sample_data)
+    row = {'donor_id': sample_data['donor'].id, 'donation_request_id': sample_data['causes'][1].id,
+           'amount_donated': '7.25'}
+    ingest_donations([dict(row, transaction_id='a', created_at='2025-01-01T09:00:00'),
+                      dict(row, transaction_id='b', created_at='2025-02-14T23:59:59')])
+    db.session.commit()
+
+    _assert_buckets_match_backfill()
+
+
+def test_deleting_a_cause_takes_it_out_of_the_buckets(client, sample_data, auth_headers):
+    _backfilled(sample_data)
+
+    response = client.delete(f"/api/ngo/causes/{sample_data['causes'][3].id}",
+                             headers=auth_headers(sample_data['ngo_user']))
+
+    assert response.status_code == 200
+    _assert_buckets_match_backfill()
+
+
+def test_rejecting_an_ngo_empties_its_buckets(client, sample_data, admin_user, auth_headers):
+    _backfilled(sample_data)
+
+    response = client.post(f"/api/admin/ngos/{sample_data['ngo_user'].id}/reject", headers=auth_headers(admin_user))
+
+    assert response.status_code == 200
+    assert _buckets() == {}
+
+
+def test_changing_a_cause_category_moves_its_buckets(client, sample_data, auth_headers):
+    _backfilled(sample_data)
+    cause = sample_data['causes'][1]
+    other = next(c.category_id for c in sample_data['causes'] if c.category_id != cause.category_id)
+
+    response = client.put(f'/api/ngo/causes/{cause.id}', json={'category_id': other},
+                          headers=auth_headers(sample_data['ngo_user']))
+
+    assert response.status_code == 200
+    _assert_buckets_match_backfill()
+
+
+def test_sharded_buckets_sum_to_the_backfill_and_empty_together(client, sample_data, auth_headers, rotating_shards):
+    _backfilled(sample_data)
+    cause = sample_data['causes'][1]
+    row = {'donor_id': sample_data['donor'].id, 'donation_request_id': cause.id, 'amount_donated': '3.00'}
+    for i in range(3):
+        ingest_donations([dict(row, transaction_id=f's{i}', created_at='2025-03-03T10:00:00')])
+        db.session.commit()
+
+    day = DonationBucket.query.filter_by(granularity='day', bucket_start=date(2025, 3, 3)).all()
+    assert len(day) == 3
+    _assert_buckets_match_backfill()
+
+    response = client.delete(f'/api/ngo/causes/{cause.id}', headers=auth_headers(sample_data['ngo_user']))
+
+    assert response.status_code == 200
+    assert DonationBucket.query.filter_by(granularity='day', bucket_start=date(2025, 3, 3)).count() == 0
+    _assert_buckets_match_backfill()
@@ -0,0 +1,28 @@
+from flask_jwt_extended import create_access_token
+
+from app.utils.identity import identity_claims
+
+
+def _token_headers(user, **claims):
+    token = create_access_token(identity={'id': user.id}, additional_claims=claims)
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_token_claims_carry_the_profile_id(client, sample_data):
+    donor_user = sample_data['donor_user']
+    headers = _token_headers(donor_user, **identity_claims(donor_user))
+
+    response = client.get('/api/donors/my-donations', headers=headers)
+
+    assert identity_claims(donor_user)['profile_id'] == sample_data['donor'].id
+    assert response.status_code == 200
+    assert len(response.get_json()) == 6
+
+
+def test_null_profile_id_claim_falls_back_to_a_lookup(client, sample_data):
+    headers = _token_headers(sample_data['donor_user'], role='Donor', profile_id=None)
+
+    response = client.get('/api/donors/my-donations', headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 6
@@ -0,0 +1,68 @@
+import pytest
+
+from app.extensions import db
+from app.models import User
+from app.utils.cache import init_response_cache
+
+
+@pytest.fixture
+def response_cache(app):
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    init_response_cache(app)
+    return app.extensions['response_cache']
+
+
+def _get_twice(client, url):
+    client.get(url)
+    return client.get(url)
+
+
+def test_cause_detail_is_cached_until_a_donation_changes_it(client, sample_data, auth_headers, response_cache):
+    url = f"/api/causes/{sample_data['causes'][1].id}"
+    first = _get_twice(client, url)
+    assert first.headers['X-Cache'] == 'HIT'
+    assert client.get(url, headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    response = client.post(f"/api/donors/donate/{sample_data['causes'][1].id}", json={'amount_donated': '5.00'},
+                           headers=auth_headers(sample_data['donor_user']))
+    assert response.status_code == 201
+
+    second = client.get(url)
+    assert second.headers['X-Cache'] == 'MISS'
+    assert second.headers['ETag'] != first.headers['ETag']
+
+
+def test_ngo_profile_edit_drops_cached_cause_details(client, sample_data, auth_headers, response_cache):
+    url = f"/api/causes/{sample_data['causes'][1].id}"
+    assert _get_twice(client, url).headers['X-Cache'] == 'HIT'
+
+    response = client.put('/api/users/me', json={'ngo_profile': {'organization_name': 'Hope Worldwide'}},
+                          headers=auth_headers(sample_data['ngo_user']))
+    assert response.status_code == 200
+
+    assert client.get(url).headers['X-Cache'] == 'MISS'
+
+
+def test_rejecting_an_ngo_drops_its_cached_cause_details(client, sample_data, admin_user, auth_headers,
+                                                         response_cache):
+    url = f"/api/causes/{sample_data['causes'][1].id}"
+    assert _get_twice(client, url).status_code == 200
+
+    response = client.post(f"/api/admin/ngos/{sample_data['ngo_user'].id}/reject", headers=auth_headers(admin_user))
+    assert response.status_code == 200
+
+    assert client.get(url).status_code == 404
+
+
+def test_approval_takes_effect_on_the_next_ngo_request(client, sample_data, admin_user, auth_headers):
+    ngo = sample_data['ngo_user']
+    ngo.is_approved = False
+    db.session.commit()
+    headers = auth_headers(ngo)
+    assert client.get('/api/ngo/dashboard', headers=headers).status_code == 403
+
+    response = client.post(f'/api/admin/ngos/{ngo.id}/approve', headers=auth_headers(admin_user))
+    assert response.status_code == 200
+
+    assert client.get('/api/ngo/dashboard', headers=headers).status_code == 200
+    assert db.session.get(User, ngo.id).is_approved
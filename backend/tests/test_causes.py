@@ -0,0 +1,118 @@
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models.cause import Category
+from app.models.donation import DonationRequest, Donation
+from app.schemas.cause_schema import CategorySchema
+from app.schemas.donation_schema import DonationRequestSchema, DonationSchema
+from app.schemas.fast_serializers import RowSerializer
+from app.utils.search import rebuild_search_index
+
+
+def _json(payload):
+    return json.dumps(payload, sort_keys=True).encode()
+
+
+@pytest.mark.parametrize('schema, model', [
+    (DonationRequestSchema(many=True), DonationRequest),
+    (DonationSchema(many=True), Donation),
+    (CategorySchema(many=True), Category),
+])
+def test_fast_serializer_matches_marshmallow(app, sample_data, schema, model):
+    orm_rows = model.query.order_by(model.id).all()
+    fast = RowSerializer(schema, model)
+    fast_rows = fast.query().order_by(model.id).all()
+
+    assert len(fast_rows) == len(orm_rows)
+    assert _json(fast.dump(fast_rows)) == _json(schema.dump(orm_rows))
+
+
+@pytest.mark.parametrize('url', ['/api/causes/approved?limit=5', '/api/causes/categories'])
+def test_public_list_responses_identical_with_fast_serializer(app, client, sample_data, url):
+    app.config['FAST_SERIALIZER_ENABLED'] = False
+    slow = client.get(url)
+    app.config['FAST_SERIALIZER_ENABLED'] = True
+    fast = client.get(url)
+
+    assert slow.status_code == fast.status_code == 200
+    assert fast.data == slow.data
+    assert fast.headers.get('X-Next-Cursor') == slow.headers.get('X-Next-Cursor')
+
+
+@pytest.mark.parametrize('user_key, url', [
+    ('donor_user', '/api/donors/my-donations'),
+    ('donor_user', '/api/donors/approved-requests?category=Education'),
+    ('ngo_user', '/api/ngo/causes?limit=4'),
+])
+def test_authenticated_list_responses_identical_with_fast_serializer(app, client, sample_data, auth_headers,
+                                                                     user_key, url):
+    headers = auth_headers(sample_data[user_key])
+    app.config['FAST_SERIALIZER_ENABLED'] = False
+    slow = client.get(url, headers=headers)
+    app.config['FAST_SERIALIZER_ENABLED'] = True
+    fast = client.get(url, headers=headers)
+
+    assert slow.status_code == fast.status_code == 200
+    assert fast.data == slow.data
+
+
+def test_approved_causes_pages_cover_every_row_once(client, sample_data):
+    seen, cursor = [], None
+    while True:
+        response = client.get('/api/causes/approved?limit=4' + (f'&cursor={cursor}' if cursor else ''))
+        seen.extend(item['id'] for item in response.get_json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+
+    approved = [c.id for c in sorted(sample_data['causes'], key=lambda c: c.created_at, reverse=True)
+                if c.status == 'Approved']
+    assert seen == approved
+
+
+def _capped_search_index(app, sample_data, max_candidates):
+    rebuild_search_index()
+    db.session.commit()
+    app.config['SEARCH_MAX_CANDIDATES'] = max_candidates
+    return sample_data['causes']
+
+
+def test_search_candidates_are_approved_causes_only(app, client, sample_data):
+    # The newest causes are the first ones a capped search walks
+    for cause in sample_data['causes'][-3:]:
+        cause.status = 'Pending'
+    _capped_search_index(app, sample_data, 3)
+
+    response = client.get('/api/causes/search?q=cause')
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 3
+    assert {item['status'] for item in response.get_json()} == {'Approved'}
+
+
+def test_filtered_search_finds_matches_beyond_the_cap(app, client, sample_data):
+    causes = _capped_search_index(app, sample_data, 3)
+    health = [c.id for c in causes if c.status == 'Approved' and c.category.name == 'Health']
+
+    response = client.get('/api/causes/search?q=cause&category=Health')
+
+    assert sorted(item['id'] for item in response.get_json()) == sorted(health)
+    assert client.get('/api/causes/facets?q=cause').get_json()['total'] == \
+        len([c for c in causes if c.status == 'Approved'])
+
+
+def test_search_index_follows_cause_edits_and_deletes(app, client, sample_data, auth_headers):
+    causes = _capped_search_index(app, sample_data, 100)
+    headers = auth_headers(sample_data['ngo_user'])
+
+    client.put(f'/api/ngo/causes/{causes[1].id}', json={'title': 'Clean water for villages'}, headers=headers)
+    client.delete(f'/api/ngo/causes/{causes[2].id}', headers=headers)
+
+    assert [item['id'] for item in client.get('/api/causes/search?q=water').get_json()] == [causes[1].id]
+    assert causes[2].id not in {item['id'] for item in client.get('/api/causes/search?q=cause').get_json()}
+    indexed = db.session.execute(text("SELECT count(*) FROM cause_search")).scalar()
+    keys = db.session.execute(text("SELECT count(*) FROM cause_search_keys")).scalar()
+    assert indexed == keys == len(causes) - 1
@@ -0,0 +1,140 @@
+from datetime import datetime
+from decimal import Decimal
+
+from app.extensions import db
+from app.models.donation import Donation
+from app.models.outbox import OutboxEmail
+from app.utils.donation_helpers import ingest_donations
+from app.utils.stats_helpers import rebuild_stats
+
+
+def _ingest_row(sample_data, transaction_id, **fields):
+    row = {'donor_id': sample_data['donor'].id, 'donation_request_id': sample_data['causes'][1].id,
+           'amount_donated': '5.00', 'transaction_id': transaction_id}
+    row.update(fields)
+    return row
+
+
+def test_bulk_ingest_stores_aware_created_at_as_naive_utc(client, sample_data, admin_user, auth_headers):
+    rows = [
+        _ingest_row(sample_data, 'tz-1', created_at='2025-03-01T10:00:00Z'),
+        _ingest_row(sample_data, 'tz-2', created_at='2025-03-01T12:30:00+02:00'),
+    ]
+    response = client.post('/api/admin/donations/bulk', json={'donations': rows}, headers=auth_headers(admin_user))
+
+    assert response.status_code == 200
+    assert response.get_json()['summary']['accepted'] == 2
+    stored = {d.transaction_id: d.created_at for d in Donation.query.filter(Donation.transaction_id.isnot(None))}
+    assert stored == {'tz-1': datetime(2025, 3, 1, 10, 0), 'tz-2': datetime(2025, 3, 1, 10, 30)}
+
+
+def test_bulk_ingest_reports_zero_amount_as_invalid_not_missing(app, sample_data):
+    results = ingest_donations([_ingest_row(sample_data, 'zero', amount_donated=0),
+                                _ingest_row(sample_data, 'blank', amount_donated='')])
+
+    assert results[0]['error'] == "Amount donated must be a positive number"
+    assert results[1]['error'] == "Missing required fields: amount_donated"
+
+
+def test_bulk_ingest_rejects_duplicates_and_over_funding(app, sample_data):
+    cause = sample_data['causes'][1]
+    remaining = cause.amount_needed - cause.amount_received
+    results = ingest_donations([
+        _ingest_row(sample_data, 'a', amount_donated=str(remaining - 1)),
+        _ingest_row(sample_data, 'a'),
+        _ingest_row(sample_data, 'b', amount_donated='2.00'),
+        _ingest_row(sample_data, 'c', amount_donated='1.00'),
+    ])
+    db.session.commit()
+
+    assert [r['status'] for r in results] == ['accepted', 'rejected', 'rejected', 'accepted']
+    db.session.refresh(cause)
+    assert cause.amount_received == cause.amount_needed
+    assert cause.status == 'Completed'
+    assert ingest_donations([_ingest_row(sample_data, 'a')])[0]['error'] == \
+        "Duplicate transaction_id; already recorded"
+
+
+def _donate(client, sample_data, auth_headers, cause, amount):
+    return client.post(f'/api/donors/donate/{cause.id}', json={'amount_donated': str(amount)},
+                       headers=auth_headers(sample_data['donor_user']))
+
+
+def test_donation_that_would_over_fund_a_cause_changes_nothing(client, sample_data, auth_headers):
+    cause = sample_data['causes'][1]
+    received = cause.amount_received
+    over = cause.amount_needed - received + Decimal('0.01')
+
+    response = _donate(client, sample_data, auth_headers, cause, over)
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == "Donation amount exceeds remaining amount needed"
+    db.session.refresh(cause)
+    assert (cause.amount_received, cause.status) == (received, 'Approved')
+    assert Donation.query.filter_by(donation_request_id=cause.id).count() == 1
+
+
+def test_donation_that_funds_a_cause_completes_it(client, sample_data, auth_headers):
+    rebuild_stats()
+    db.session.commit()
+    cause = sample_data['causes'][1]
+
+    response = _donate(client, sample_data, auth_headers, cause, cause.amount_needed - cause.amount_received)
+
+    assert response.status_code == 201
+    db.session.refresh(cause)
+    assert (cause.amount_received, cause.status) == (cause.amount_needed, 'Completed')
+    assert rebuild_stats() == {}
+    assert OutboxEmail.query.filter_by(kind='cause_completed', object_id=cause.id).count() == 1
+    # A completed cause takes no more donations
+    assert _donate(client, sample_data, auth_headers, cause, '1.00').status_code == 404
+
+
+def test_donation_to_a_pending_cause_is_rejected(client, sample_data, auth_headers):
+    response = _donate(client, sample_data, auth_headers, sample_data['causes'][0], '1.00')
+
+    assert response.status_code == 404
+    assert response.get_json()['message'] == "Donation request not found or not approved"
+
+
+def _gifts_across_years(sample_data):
+    # On top of the sample's six 2025 gifts (10.05 * n on Jan 1-6, one per cause)
+    ingest_donations([
+        _ingest_row(sample_data, 'y-1', amount_donated='5.00', created_at='2024-12-31T10:00:00'),
+        _ingest_row(sample_data, 'y-2', amount_donated='2.50', created_at='2025-03-01T10:00:00'),
+    ])
+    db.session.commit()
+
+
+def test_giving_summary_totals_gifts_per_cause_and_per_year(client, sample_data, auth_headers):
+    _gifts_across_years(sample_data)
+    causes = sample_data['causes']
+
+    response = client.get('/api/donors/my-donations/summary', headers=auth_headers(sample_data['donor_user']))
+
+    assert response.status_code == 200
+    summary = response.get_json()
+    assert (summary['total_given'], summary['gift_count']) == (218.55, 8)
+    assert [c['cause_id'] for c in summary['causes']] == [causes[i].id for i in (1, 5, 4, 3, 2, 0)]
+    top = summary['causes'][0]
+    assert (top['total_given'], top['gift_count'], top['last_gift_at']) == (27.6, 3, '2025-03-01T10:00:00')
+    assert (top['title'], top['organization_name']) == (causes[1].title, 'Hope Foundation')
+    assert summary['causes'][-1]['last_gift_at'].startswith('2025-01-01T12:00:00')
+    assert summary['years'] == [
+        {'year': 2025, 'total_given': 213.55, 'gift_count': 7, 'cause_count': 6},
+        {'year': 2024, 'total_given': 5.0, 'gift_count': 1, 'cause_count': 1},
+    ]
+
+
+def test_donation_history_filters_by_cause(client, sample_data, auth_headers):
+    _gifts_across_years(sample_data)
+    cause = sample_data['causes'][1]
+    headers = auth_headers(sample_data['donor_user'])
+
+    response = client.get(f'/api/donors/my-donations?cause_id={cause.id}', headers=headers)
+
+    assert response.status_code == 200
+    expected = Donation.query.filter_by(donation_request_id=cause.id).order_by(Donation.created_at.desc()).all()
+    assert [row['id'] for row in response.get_json()] == [d.id for d in expected]
+    assert len(expected) == 3
+    assert client.get('/api/donors/my-donations?cause_id=missing', headers=headers).get_json() == []
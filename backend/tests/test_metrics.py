@@ -0,0 +1,24 @@
+REMOTE = {'REMOTE_ADDR': '203.0.113.5'}
+
+
+def test_metrics_are_served_to_loopback_only_by_default(client):
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/metrics', environ_base=REMOTE).status_code == 403
+
+
+def test_metrics_token_admits_remote_scrapers(app, client):
+    app.config['METRICS_TOKEN'] = 'scrape-secret'
+
+    response = client.get('/metrics', environ_base=REMOTE, headers={'Authorization': 'Bearer scrape-secret'})
+
+    assert response.status_code == 200
+    assert 'http_requests_total' in response.get_data(as_text=True)
+    wrong = client.get('/metrics', environ_base=REMOTE, headers={'Authorization': 'Bearer guess'})
+    assert wrong.status_code == 403
+
+
+def test_metrics_allowlist_is_configurable(app, client):
+    app.config['METRICS_ALLOWED_IPS'] = ['203.0.113.5']
+
+    assert client.get('/metrics', environ_base=REMOTE).status_code == 200
+    assert client.get('/metrics').status_code == 403
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.outbox import OutboxEmail
+from app.utils.email_transports import Transport, TransportError
+from app.utils.sendgrid_helpers import claim_batch, queue_email, send_due_batch, _mark_failed, _mark_sent
+
+
+class RecordingTransport(Transport):
+    def __init__(self, error=None):
+        self.sent = []
+        self.error = error
+
+    def send(self, message):
+        if self.error:
+            raise self.error
+        self.sent.append(message)
+
+
+@pytest.fixture
+def transport(app):
+    app.config['EMAIL_COALESCE_SECONDS'] = 0
+    app.extensions['email_transport'] = RecordingTransport()
+    return app.extensions['email_transport']
+
+
+def _queue(recipient, name, due_in=0):
+    queue_email('ngo_approved', recipient, context={'name': name})
+    db.session.flush()
+    if due_in:
+        row = OutboxEmail.query.order_by(OutboxEmail.id.desc()).first()
+        row.next_attempt_at = datetime.utcnow() + timedelta(seconds=due_in)
+    db.session.commit()
+
+
+def test_claim_takes_every_pending_row_of_the_recipient_once(app, transport):
+    _queue('a@example.com', 'A')
+    _queue('a@example.com', 'A again', due_in=3600)
+    _queue('b@example.com', 'B', due_in=3600)
+
+    claimed = claim_batch(1)
+
+    assert [row.context['name'] for row in claimed] == ['A', 'A again']
+    assert claim_batch(10) == []
+    assert OutboxEmail.query.filter_by(recipient='b@example.com').one().status == 'Pending'
+
+
+def test_claim_retakes_rows_whose_lease_ran_out(app, transport):
+    _queue('a@example.com', 'A')
+    first = claim_batch(10)
+    OutboxEmail.query.one().locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+    second = claim_batch(10)
+
+    assert [row.id for row in second] == [row.id for row in first]
+    assert second[0].attempts == 2
+
+
+def test_sender_whose_lease_ran_out_cannot_record_an_outcome(app, transport):
+    _queue('a@example.com', 'A')
+    stale = claim_batch(10)
+    OutboxEmail.query.one().locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    current = claim_batch(10)
+
+    _mark_sent(stale)
+    _mark_failed(stale, 'timed out')
+    db.session.commit()
+
+    row = OutboxEmail.query.one()
+    assert (row.status, row.claim_token, row.last_error) == ('Sending', current[0].claim_token, None)
+    _mark_sent(current)
+    db.session.commit()
+    assert OutboxEmail.query.one().status == 'Sent'
+
+
+def test_claim_leaves_a_recipients_rows_in_backoff_alone(app, transport):
+    transport.error = TransportError('mailbox unavailable')
+    _queue('a@example.com', 'A')
+    send_due_batch()
+    transport.error = None
+    _queue('a@example.com', 'A again')
+
+    claimed = claim_batch(10)
+
+    assert [row.context['name'] for row in claimed] == ['A again']
+    retry = OutboxEmail.query.filter_by(status='Pending').one()
+    assert (retry.context['name'], retry.attempts) == ('A', 1)
+
+
+def test_send_combines_a_recipients_emails_into_one_message(app, transport):
+    _queue('a@example.com', 'A')
+    _queue('a@example.com', 'A again')
+    _queue('b@example.com', 'B')
+
+    assert send_due_batch() == 3
+
+    assert sorted(message['To'] for message in transport.sent) == ['a@example.com', 'b@example.com']
+    digest = next(message for message in transport.sent if message['To'] == 'a@example.com')
+    assert digest['Subject'] == '2 updates on your account'
+    assert {row.status for row in OutboxEmail.query} == {'Sent'}
+
+
+@pytest.mark.parametrize('permanent, status', [(False, 'Pending'), (True, 'Failed')])
+def test_failed_send_is_retried_later_or_given_up(app, transport, permanent, status):
+    transport.error = TransportError('mailbox unavailable', permanent=permanent)
+    _queue('a@example.com', 'A')
+
+    send_due_batch()
+
+    row = OutboxEmail.query.one()
+    assert (row.status, row.attempts, row.claim_token) == (status, 1, None)
+    if not permanent:
+        assert row.next_attempt_at > datetime.utcnow()
+        assert claim_batch(10) == []
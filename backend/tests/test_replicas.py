@@ -0,0 +1,93 @@
+import time
+
+import pytest
+from flask import g
+from sqlalchemy import select, update
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models.donation import DonationRequest
+from app.utils.replicas import sync_sqlite_replicas
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Overrides conftest's app: a primary and one replica, both throwaway SQLite files."""
+    class ReplicaConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path / 'primary.db')
+        SQLALCHEMY_REPLICA_URIS = ['sqlite:///' + str(tmp_path / 'replica.db')]
+        RESPONSE_CACHE_ENABLED = False
+
+    app = create_app(ReplicaConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def replicated(app, sample_data):
+    """sample_data, copied to the replica; later writes reach only the primary."""
+    sync_sqlite_replicas(app)
+    return sample_data
+
+
+def _request(app, client, method, url, **kwargs):
+    """Runs one request in its own app context (own session and g), as a worker would."""
+    with app.app_context():
+        return client.open(url, method=method, **kwargs)
+
+
+def _rename_on_primary(cause, title):
+    cause.title = title
+    db.session.commit()
+
+
+def test_replica_views_read_the_replica(app, client, replicated):
+    cause = replicated['causes'][1]
+    _rename_on_primary(cause, 'Renamed on the primary')
+
+    assert _request(app, client, 'GET', f'/api/causes/{cause.id}').get_json()['title'] == 'Cause number 1'
+    sync_sqlite_replicas(app)
+    assert _request(app, client, 'GET', f'/api/causes/{cause.id}').get_json()['title'] == 'Renamed on the primary'
+
+
+def test_dml_pins_the_rest_of_the_request_to_the_primary(app, replicated):
+    replica, primary = app.extensions['replica_engines'][0], db.engine
+    with app.test_request_context():
+        g.replica_engine = replica
+        assert db.session.get_bind(clause=select(DonationRequest)) is replica
+
+        assert db.session.get_bind(clause=update(DonationRequest)) is primary
+        assert db.session.get_bind(clause=select(DonationRequest)) is primary
+
+
+def test_writer_reads_its_own_write_on_any_worker(app, replicated, auth_headers):
+    # No cookie jar: the pin has to travel in the header, as for a cross-site browser client
+    client = app.test_client(use_cookies=False)
+    headers = auth_headers(replicated['donor_user'])
+    response = _request(app, client, 'POST', f"/api/donors/donate/{replicated['causes'][1].id}",
+                        json={'amount_donated': '5.00'}, headers=headers)
+    assert response.status_code == 201
+    pin = response.headers['X-DB-Pin']
+    # Another worker process has no in-process pin for this user
+    app.extensions['replica_pins'].clear()
+
+    pinned = _request(app, client, 'GET', '/api/donors/my-donations', headers={**headers, 'X-DB-Pin': pin})
+    unpinned = _request(app, client, 'GET', '/api/donors/my-donations', headers=headers)
+
+    assert len(pinned.get_json()) == 7
+    assert len(unpinned.get_json()) == 6
+
+
+def test_pins_beyond_the_window_are_ignored(app, replicated, auth_headers):
+    client = app.test_client(use_cookies=False)
+    headers = auth_headers(replicated['donor_user'])
+    _rename_on_primary(replicated['causes'][1], 'Renamed on the primary')
+
+    for pin in (time.time() + 3600, time.time() - 1, 'not-a-time'):
+        response = _request(app, client, 'GET', f"/api/causes/{replicated['causes'][1].id}",
+                            headers={**headers, 'X-DB-Pin': str(pin)})
+        assert response.get_json()['title'] == 'Cause number 1'
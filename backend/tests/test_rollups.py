@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+from app.extensions import db
+from app.models.cause_stats import CauseDailyStat, CauseDonor
+from app.utils.donation_helpers import ingest_donations
+from app.utils.rollup_helpers import rebuild_cause_rollups
+
+
+def _rollups():
+    days = {(s.donation_request_id, s.day): (Decimal(str(s.total_donated)), s.gift_count, s.new_donor_count)
+            for s in CauseDailyStat.query}
+    donors = {(d.donation_request_id, d.donor_id): d.first_gift_at for d in CauseDonor.query}
+    return days, donors
+
+
+def _assert_rollups_match_rebuild():
+    incremental = _rollups()
+    rebuild_cause_rollups()
+    assert incremental == _rollups()
+
+
+def _rebuilt(sample_data):
+    rebuild_cause_rollups()
+    db.session.commit()
+    return sample_data
+
+
+def test_backdated_donations_keep_rollups_consistent(app, sample_data):
+    _rebuilt(sample_data)
+    row = {'donor_id': sample_data['donor'].id, 'donation_request_id': sample_data['causes'][1].id,
+           'amount_donated': '3.00'}
+    ingest_donations([dict(row, transaction_id='later', created_at='2025-03-01T08:00:00'),
+                      dict(row, transaction_id='earlier', created_at='2024-12-31T08:00:00')])
+    db.session.commit()
+
+    _assert_rollups_match_rebuild()
+
+
+def test_deleting_a_cause_removes_its_rollups(client, sample_data, auth_headers):
+    _rebuilt(sample_data)
+
+    response = client.delete(f"/api/ngo/causes/{sample_data['causes'][2].id}",
+                             headers=auth_headers(sample_data['ngo_user']))
+
+    assert response.status_code == 200
+    _assert_rollups_match_rebuild()
+
+
+def test_rejecting_an_ngo_removes_its_rollups(client, sample_data, admin_user, auth_headers):
+    _rebuilt(sample_data)
+
+    response = client.post(f"/api/admin/ngos/{sample_data['ngo_user'].id}/reject", headers=auth_headers(admin_user))
+
+    assert response.status_code == 200
+    assert _rollups() == ({}, {})
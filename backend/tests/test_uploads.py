@@ -0,0 +1,102 @@
+import io
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.donation import DonationRequest
+from app.models.upload import UploadJob
+from app.utils.upload_queue import claim_next_job, process_job, run_due_jobs
+from app.utils.uploaders import LocalUploader, UploadError
+
+
+class FailingUploader(LocalUploader):
+    def upload(self, path, key):
+        raise UploadError('service unavailable')
+
+
+@pytest.fixture
+def uploads(app, tmp_path):
+    app.config['UPLOAD_STAGING_DIR'] = str(tmp_path / 'staging')
+    app.config['UPLOAD_MAX_ATTEMPTS'] = 2
+    app.extensions['uploader'] = LocalUploader(str(tmp_path / 'uploads'))
+    return tmp_path / 'uploads'
+
+
+def _queue_image(client, sample_data, auth_headers, cause):
+    response = client.post(f'/api/ngo/causes/{cause.id}/image',
+                           data={'image': (io.BytesIO(b'not really a png'), 'photo.png')},
+                           headers=auth_headers(sample_data['ngo_user']))
+    assert response.status_code == 202
+    return db.session.get(UploadJob, response.get_json()['id'])
+
+
+def test_queued_image_is_uploaded_and_set_on_the_cause(client, sample_data, auth_headers, uploads):
+    cause = sample_data['causes'][1]
+    job = _queue_image(client, sample_data, auth_headers, cause)
+
+    assert run_due_jobs() == 1
+
+    db.session.refresh(job)
+    db.session.refresh(cause)
+    assert (job.status, job.attempts) == ('Succeeded', 1)
+    assert cause.image_url == job.result_url == f'/uploads/{cause.id}/{job.id}.png'
+    assert (uploads / cause.id / f'{job.id}.png').read_bytes() == b'not really a png'
+    assert not os.path.exists(job.staged_path)
+    assert run_due_jobs() == 0
+
+
+def test_worker_whose_lease_ran_out_cannot_record_its_result(client, sample_data, auth_headers, uploads):
+    cause = sample_data['causes'][1]
+    job = _queue_image(client, sample_data, auth_headers, cause)
+    stale = claim_next_job()
+    UploadJob.query.filter_by(id=job.id).update({'locked_until': datetime.utcnow() - timedelta(seconds=1)})
+    db.session.commit()
+
+    current = claim_next_job()
+    assert current[3] == stale[3] + 1
+
+    assert process_job(*stale) is False
+    db.session.refresh(job)
+    db.session.refresh(cause)
+    assert (job.status, job.attempts, job.result_url) == ('Running', 2, None)
+    assert cause.image_url != f'/uploads/{cause.id}/{job.id}.png'
+
+    assert process_job(*current) is True
+    db.session.refresh(job)
+    assert job.status == 'Succeeded'
+
+
+def test_failed_upload_is_retried_after_a_backoff_then_fails(app, client, sample_data, auth_headers, uploads):
+    app.extensions['uploader'] = FailingUploader(str(uploads))
+    job = _queue_image(client, sample_data, auth_headers, sample_data['causes'][1])
+
+    assert run_due_jobs() == 1
+    db.session.refresh(job)
+    assert (job.status, job.attempts, job.locked_until) == ('Queued', 1, None)
+    assert job.next_attempt_at > datetime.utcnow()
+    assert 'service unavailable' in job.last_error
+    assert claim_next_job() is None
+
+    job.next_attempt_at = datetime.utcnow()
+    db.session.commit()
+    assert run_due_jobs() == 1
+    db.session.refresh(job)
+    assert (job.status, job.attempts) == ('Failed', 2)
+    assert not os.path.exists(job.staged_path)
+
+
+def test_deleting_the_cause_cancels_a_running_upload(client, sample_data, auth_headers, uploads):
+    cause = sample_data['causes'][1]
+    job = _queue_image(client, sample_data, auth_headers, cause)
+    staged_path = job.staged_path
+    claimed = claim_next_job()
+
+    response = client.delete(f'/api/ngo/causes/{cause.id}', headers=auth_headers(sample_data['ngo_user']))
+
+    assert response.status_code == 200
+    assert not os.path.exists(staged_path)
+    assert process_job(*claimed) is False
+    assert UploadJob.query.count() == 0
+    assert db.session.get(DonationRequest, claimed[1]) is None
@@ -8,6 +8,29 @@ const api = axios.create({
   baseURL: API_BASE_URL,
 });
 
+// Read-your-writes: after a write the backend returns X-DB-Pin (an expiry time).
+// Echoing it back keeps this client's reads on the primary database until then,
+// whichever server process handles them, so it never reads data older than its own write.
+const PIN_HEADER = 'X-DB-Pin';
+const PIN_KEY = 'dbPin';
+
+api.interceptors.request.use((config) => {
+  // The server ignores expired pins, so client clock skew does not matter
+  const pin = sessionStorage.getItem(PIN_KEY);
+  if (pin) {
+    config.headers[PIN_HEADER] = pin;
+  }
+  return config;
+});
+
+api.interceptors.response.use((response) => {
+  const pin = response.headers[PIN_HEADER.toLowerCase()];
+  if (pin) {
+    sessionStorage.setItem(PIN_KEY, pin);
+  }
+  return response;
+});
+
 /*
   This setup will now correctly send requests to your local backend.
   For example, api.post('/auth/login', ...) will go to:
@@ -0,0 +1,83 @@
+import { useState, useEffect, useCallback, useRef } from 'react';
+import api from './axios';
+
+// Rows per request; the backend caps this with PAGINATION_MAX_LIMIT
+const PAGE_SIZE = 20;
+
+/*
+  Fetches one page of a list endpoint. Resolves to the rows and the cursor for
+  the next page (null on the last one), taken from the X-Next-Cursor header.
+*/
+export async function fetchPage(path, { token, params, cursor, limit = PAGE_SIZE } = {}) {
+  const config = { params: { ...params, limit, ...(cursor ? { cursor } : {}) } };
+  if (token) {
+    config.headers = { Authorization: `Bearer ${token}` };
+  }
+  const response = await api.get(path, config);
+  return { rows: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+}
+
+/*
+  Loads the first page of `path` and keeps the next-page cursor in state, so the
+  component renders what it has and asks for more only when the user does.
+  Changing `path`, `token` or `params` starts over from the first page; `reload`
+  does the same after a mutation. Nothing is fetched while `enabled` is false.
+*/
+export function usePagedList(path, { token, params, limit = PAGE_SIZE, enabled = true } = {}) {
+  const [rows, setRows] = useState([]);
+  const [cursor, setCursor] = useState(null);
+  const [loading, setLoading] = useState(enabled);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [error, setError] = useState(null);
+  // Bumped on every reload so late responses for an older list are dropped
+  const generation = useRef(0);
+  const paramsKey = JSON.stringify(params || {});
+
+  const load = useCallback(
+    (nextCursor) => fetchPage(path, { token, params: JSON.parse(paramsKey), cursor: nextCursor, limit }),
+    [path, token, paramsKey, limit]
+  );
+
+  const reload = useCallback(async () => {
+    if (!enabled) return;
+    const current = ++generation.current;
+    setLoading(true);
+    setLoadingMore(false);
+    setError(null);
+    try {
+      const page = await load(null);
+      if (current !== generation.current) return;
+      setRows(page.rows);
+      setCursor(page.nextCursor);
+    } catch (err) {
+      if (current !== generation.current) return;
+      setRows([]);
+      setCursor(null);
+      setError(err);
+    } finally {
+      if (current === generation.current) setLoading(false);
+    }
+  }, [load, enabled]);
+
+  const loadMore = useCallback(async () => {
+    if (!cursor || loadingMore) return;
+    const current = generation.current;
+    setLoadingMore(true);
+    try {
+      const page = await load(cursor);
+      if (current !== generation.current) return;
+      setRows((previous) => [...previous, ...page.rows]);
+      setCursor(page.nextCursor);
+    } catch (err) {
+      if (current === generation.current) setError(err);
+    } finally {
+      if (current === generation.current) setLoadingMore(false);
+    }
+  }, [cursor, loadingMore, load]);
+
+  useEffect(() => {
+    reload();
+  }, [reload]);
+
+  return { rows, hasMore: Boolean(cursor), loading, loadingMore, error, loadMore, reload };
+}
@@ -0,0 +1,19 @@
+import React from 'react';
+
+// "Load more" control for lists paged with usePagedList; hidden on the last page
+const LoadMoreButton = ({ hasMore, loading, onClick }) => {
+  if (!hasMore) return null;
+  return (
+    <div className="flex justify-center mt-6">
+      <button
+        onClick={onClick}
+        disabled={loading}
+        className="bg-white border border-gray-300 text-gray-700 font-semibold py-2 px-6 rounded-lg hover:bg-gray-50 transition-colors disabled:opacity-50"
+      >
+        {loading ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  );
+};
+
+export default LoadMoreButton;
@@ -3,6 +3,8 @@ import { Link } from 'react-router-dom';
 import { LayoutDashboard, ShieldCheck, HelpingHand, List, Settings, LogOut, Bell, ChevronDown, CheckCircle, XCircle } from 'lucide-react';
 import { useAuth } from '../../context/AuthContext';
 import api from '../../api/axios';
+import { usePagedList } from '../../api/pagination';
+import LoadMoreButton from '../common/LoadMoreButton';
 
 // --- Helper Components ---
 
@@ -34,36 +36,42 @@ const getStatusChip = (status) => {
 export default function AdminDashboard() {
     const { user, logout } = useAuth();
     const [stats, setStats] = useState({ totalNgos: 0, pendingApprovals: 0, totalDonations: 0 });
-    const [pendingNgos, setPendingNgos] = useState([]);
-    const [donationRequests, setDonationRequests] = useState([]);
-    const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [activeView, setActiveView] = useState('dashboard'); // 'dashboard', 'ngoApprovals', 'donations'
+    const listOptions = { token: user?.token, enabled: Boolean(user?.token) };
+    const pendingNgos = usePagedList('/admin/ngos/pending', listOptions);
+    const donationRequests = usePagedList('/admin/donation-requests', listOptions);
+    const { reload: reloadPendingNgos } = pendingNgos;
+    const { reload: reloadDonationRequests } = donationRequests;
 
-    const fetchData = useCallback(async () => {
+    const fetchStats = useCallback(async () => {
         if (!user?.token) return;
         try {
-            setLoading(true);
-            setError('');
-            const [statsRes, ngosRes, requestsRes] = await Promise.all([
-                api.get('/admin/stats', { headers: { Authorization: `Bearer ${user.token}` } }),
-                api.get('/admin/ngos/pending', { headers: { Authorization: `Bearer ${user.token}` } }),
-                api.get('/admin/donation-requests', { headers: { Authorization: `Bearer ${user.token}` } })
-            ]);
+            const statsRes = await api.get('/admin/stats', { headers: { Authorization: `Bearer ${user.token}` } });
             setStats(statsRes.data);
-            setPendingNgos(ngosRes.data);
-            setDonationRequests(requestsRes.data);
         } catch (err) {
             setError('Failed to fetch dashboard data.');
             console.error(err);
-        } finally {
-            setLoading(false);
         }
     }, [user]);
 
     useEffect(() => {
-        fetchData();
-    }, [fetchData]);
+        fetchStats();
+    }, [fetchStats]);
+
+    useEffect(() => {
+        if (pendingNgos.error || donationRequests.error) {
+            setError('Failed to fetch dashboard data.');
+        }
+    }, [pendingNgos.error, donationRequests.error]);
+
+    // Refresh the counters and start both lists over from their first page
+    const fetchData = useCallback(() => {
+        setError('');
+        fetchStats();
+        reloadPendingNgos();
+        reloadDonationRequests();
+    }, [fetchStats, reloadPendingNgos, reloadDonationRequests]);
 
     const handleNgoApproval = async (ngoId, action) => {
         try {
@@ -85,16 +93,16 @@ export default function AdminDashboard() {
 
     const renderContent = () => {
         if (activeView === 'ngoApprovals') {
-            return <NgoApprovalsTable loading={loading} pendingNgos={pendingNgos} handleNgoApproval={handleNgoApproval} />;
+            return <NgoApprovalsTable pendingNgos={pendingNgos} handleNgoApproval={handleNgoApproval} />;
         }
         if (activeView === 'donations') {
-            return <DonationRequestsTable loading={loading} donationRequests={donationRequests} handleDonationRequestApproval={handleDonationRequestApproval} />;
+            return <DonationRequestsTable donationRequests={donationRequests} handleDonationRequestApproval={handleDonationRequestApproval} />;
         }
         // Default 'dashboard' view
         return (
             <>
-                <NgoApprovalsTable loading={loading} pendingNgos={pendingNgos} handleNgoApproval={handleNgoApproval} />
-                <DonationRequestsTable loading={loading} donationRequests={donationRequests} handleDonationRequestApproval={handleDonationRequestApproval} />
+                <NgoApprovalsTable pendingNgos={pendingNgos} handleNgoApproval={handleNgoApproval} />
+                <DonationRequestsTable donationRequests={donationRequests} handleDonationRequestApproval={handleDonationRequestApproval} />
             </>
         );
     };
@@ -153,7 +161,7 @@ export default function AdminDashboard() {
 
 // --- Sub-components for clarity ---
 
-const NgoApprovalsTable = ({ loading, pendingNgos, handleNgoApproval }) => (
+const NgoApprovalsTable = ({ pendingNgos, handleNgoApproval }) => (
     <div className="bg-white p-6 rounded-2xl shadow-sm border mb-8">
         <h3 className="text-xl font-bold text-gray-800 mb-4">Pending NGO Approvals</h3>
         <div className="overflow-x-auto">
@@ -167,8 +175,8 @@ const NgoApprovalsTable = ({ loading, pendingNgos, handleNgoApproval }) => (
                     </tr>
                 </thead>
                 <tbody>
-                    {loading ? ( <tr><td colSpan="4" className="text-center py-8">Loading...</td></tr> ) : 
-                    pendingNgos.length > 0 ? pendingNgos.map(ngo => (
+                    {pendingNgos.loading ? ( <tr><td colSpan="4" className="text-center py-8">Loading...</td></tr> ) : 
+                    pendingNgos.rows.length > 0 ? pendingNgos.rows.map(ngo => (
                         <tr key={ngo.id} className="bg-white border-b hover:bg-gray-50">
                             <td className="px-6 py-4 font-medium text-gray-900">{ngo.name}</td>
                             <td className="px-6 py-4">{ngo.email}</td>
@@ -184,10 +192,11 @@ const NgoApprovalsTable = ({ loading, pendingNgos, handleNgoApproval }) => (
                 </tbody>
             </table>
         </div>
+        <LoadMoreButton hasMore={pendingNgos.hasMore} loading={pendingNgos.loadingMore} onClick={pendingNgos.loadMore} />
     </div>
 );
 
-const DonationRequestsTable = ({ loading, donationRequests, handleDonationRequestApproval }) => (
+const DonationRequestsTable = ({ donationRequests, handleDonationRequestApproval }) => (
     <div className="bg-white p-6 rounded-2xl shadow-sm border">
         <h3 className="text-xl font-bold text-gray-800 mb-4">Donation Request Approvals</h3>
         <div className="overflow-x-auto">
@@ -202,8 +211,8 @@ const DonationRequestsTable = ({ loading, donationRequests, handleDonationReques
                     </tr>
                 </thead>
                 <tbody>
-                    {loading ? ( <tr><td colSpan="5" className="text-center py-8">Loading...</td></tr> ) : 
-                    donationRequests.length > 0 ? donationRequests.map(req => (
+                    {donationRequests.loading ? ( <tr><td colSpan="5" className="text-center py-8">Loading...</td></tr> ) : 
+                    donationRequests.rows.length > 0 ? donationRequests.rows.map(req => (
                         <tr key={req.id} className="bg-white border-b hover:bg-gray-50">
                             <td className="px-6 py-4 font-medium text-gray-900">{req.title}</td>
                             <td className="px-6 py-4">{req.ngo?.organization_name || 'N/A'}</td>
@@ -226,5 +235,6 @@ const DonationRequestsTable = ({ loading, donationRequests, handleDonationReques
                 </tbody>
             </table>
         </div>
+        <LoadMoreButton hasMore={donationRequests.hasMore} loading={donationRequests.loadingMore} onClick={donationRequests.loadMore} />
     </div>
 );
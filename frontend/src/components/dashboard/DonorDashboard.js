@@ -32,18 +32,16 @@ export default function DonorDashboard() {
             try {
                 setLoading(true);
                 setError('');
-                const response = await api.get('/donors/my-donations', {
-                    headers: { Authorization: `Bearer ${user.token}` }
-                });
-                
-                const donations = response.data;
-                // Get the 5 most recent donations for the dashboard
-                setRecentDonations(donations.slice(0, 5));
+                const headers = { Authorization: `Bearer ${user.token}` };
+                // The donation list is paginated, so the totals come from the summary endpoint
+                const [recentRes, summaryRes] = await Promise.all([
+                    api.get('/donors/my-donations', { headers, params: { limit: 5 } }),
+                    api.get('/donors/my-donations/summary', { headers })
+                ]);
+                setRecentDonations(recentRes.data);
 
-                const totalDonated = donations.reduce((acc, donation) => acc + (donation.amount_donated || 0), 0);
-                const causesSupported = new Set(donations.map(d => d.donation_request?.id).filter(id => id)).size;
-                
-                setStats({ totalDonated, causesSupported });
+                const summary = summaryRes.data;
+                setStats({ totalDonated: summary.total_given, causesSupported: summary.causes.length });
 
             } catch (err) {
                 setError('Failed to load your donation data.');
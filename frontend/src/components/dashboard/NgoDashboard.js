@@ -3,6 +3,8 @@ import { Link } from 'react-router-dom';
 import { LayoutDashboard, Megaphone, BarChart2, Building, LogOut, Bell, ChevronDown, PlusCircle, MoreVertical, X, Edit, Trash2 } from 'lucide-react';
 import { useAuth } from '../../context/AuthContext';
 import api from '../../api/axios';
+import { usePagedList } from '../../api/pagination';
+import LoadMoreButton from '../common/LoadMoreButton';
 
 // --- Helper Components ---
 
@@ -31,40 +33,46 @@ const SidebarLink = ({ icon, text, active, onClick }) => {
 
 export default function NgoDashboard() {
     const { user, logout } = useAuth();
-    const [causes, setCauses] = useState([]);
     const [stats, setStats] = useState({ totalRaised: 0, activeCauses: 0, donors: 0 });
     const [isModalOpen, setIsModalOpen] = useState(false);
     const [editingCause, setEditingCause] = useState(null);
-    const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [activeView, setActiveView] = useState('dashboard');
+    const causes = usePagedList('/ngo/causes', { token: user?.token, enabled: Boolean(user?.token) });
+    const { reload: reloadCauses } = causes;
 
-    const fetchNgoData = useCallback(async () => {
+    // The stat cards come from the rollup-backed dashboard, not from paging through every cause
+    const fetchStats = useCallback(async () => {
         if (!user?.token) return;
         try {
-            setLoading(true);
-            setError('');
-            const response = await api.get('/ngo/causes', {
+            const response = await api.get('/ngo/dashboard', {
                 headers: { Authorization: `Bearer ${user.token}` }
             });
-            const causesData = response.data;
-            setCauses(causesData);
-
-            const totalRaised = causesData.reduce((acc, cause) => acc + cause.amount_received, 0);
-            const activeCauses = causesData.filter(c => c.status === 'Approved' || c.status === 'Active').length;
+            const performance = response.data.causes;
+            const totalRaised = performance.reduce((acc, cause) => acc + cause.amount_received, 0);
+            const activeCauses = performance.filter(c => c.status === 'Approved' || c.status === 'Active').length;
             setStats({ totalRaised, activeCauses, donors: 480 });
-
         } catch (err) {
             setError('Failed to load your dashboard data.');
             console.error(err);
-        } finally {
-            setLoading(false);
         }
     }, [user]);
 
     useEffect(() => {
-        fetchNgoData();
-    }, [fetchNgoData]);
+        fetchStats();
+    }, [fetchStats]);
+
+    useEffect(() => {
+        if (causes.error) {
+            setError('Failed to load your dashboard data.');
+        }
+    }, [causes.error]);
+
+    const fetchNgoData = useCallback(() => {
+        setError('');
+        fetchStats();
+        reloadCauses();
+    }, [fetchStats, reloadCauses]);
 
     const handleCreateClick = () => {
         setEditingCause(null);
@@ -93,7 +101,7 @@ export default function NgoDashboard() {
     const renderContent = () => {
         switch(activeView) {
             case 'myCauses':
-                return <MyCausesView loading={loading} causes={causes} openModal={handleCreateClick} onEdit={handleEditClick} onDelete={handleDeleteClick} />;
+                return <MyCausesView loading={causes.loading} causes={causes.rows} openModal={handleCreateClick} onEdit={handleEditClick} onDelete={handleDeleteClick} loadMore={causes} />;
             case 'reports':
                 return <ReportsView />;
             case 'dashboard':
@@ -101,7 +109,7 @@ export default function NgoDashboard() {
                 return (
                     <>
                         <StatsCards stats={stats} />
-                        <MyCausesView loading={loading} causes={causes.slice(0, 5)} openModal={handleCreateClick} onEdit={handleEditClick} onDelete={handleDeleteClick} isSummary={true} />
+                        <MyCausesView loading={causes.loading} causes={causes.rows.slice(0, 5)} openModal={handleCreateClick} onEdit={handleEditClick} onDelete={handleDeleteClick} isSummary={true} />
                     </>
                 );
         }
@@ -171,7 +179,7 @@ const StatsCards = ({ stats }) => (
     </div>
 );
 
-const MyCausesView = ({ loading, causes, openModal, onEdit, onDelete, isSummary = false }) => {
+const MyCausesView = ({ loading, causes, openModal, onEdit, onDelete, isSummary = false, loadMore = null }) => {
     const [openMenuId, setOpenMenuId] = useState(null);
     const menuRef = useRef(null);
 
@@ -228,6 +236,7 @@ const MyCausesView = ({ loading, causes, openModal, onEdit, onDelete, isSummary
                     </tbody>
                 </table>
             </div>
+            {loadMore && <LoadMoreButton hasMore={loadMore.hasMore} loading={loadMore.loadingMore} onClick={loadMore.loadMore} />}
         </div>
     );
 };
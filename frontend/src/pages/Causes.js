@@ -2,7 +2,9 @@ import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { Search } from 'lucide-react';
 import api from '../api/axios';
+import { usePagedList } from '../api/pagination';
 import { useAuth } from '../context/AuthContext';
+import LoadMoreButton from '../components/common/LoadMoreButton';
 
 // --- Reusable CauseCard component (Updated to match HomePage version) ---
 const CauseCard = ({ cause }) => {
@@ -53,41 +55,33 @@ const CauseCard = ({ cause }) => {
 
 // --- Main Causes Page Component ---
 export default function CausesPage() {
-    const [allCauses, setAllCauses] = useState([]);
     const [categories, setCategories] = useState([]);
     const [activeCategory, setActiveCategory] = useState('All');
     const [searchTerm, setSearchTerm] = useState('');
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState('');
+    const [query, setQuery] = useState('');
     const { user } = useAuth();
 
     useEffect(() => {
-        const fetchData = async () => {
-            try {
-                setLoading(true);
-                setError('');
-                const [causesRes, categoriesRes] = await Promise.all([
-                    api.get('/causes/approved'),
-                    api.get('/causes/categories')
-                ]);
-                setAllCauses(causesRes.data);
-                setCategories(['All', ...categoriesRes.data.map(c => c.name)]);
-            } catch (err) {
-                setError('Failed to load causes. Please try again later.');
-                console.error(err);
-            } finally {
-                setLoading(false);
-            }
-        };
-        fetchData();
+        api.get('/causes/categories')
+            .then(res => setCategories(['All', ...res.data.map(c => c.name)]))
+            .catch(err => console.error(err));
     }, []);
 
-    const filteredCauses = allCauses.filter(cause => {
-        const categoryMatch = activeCategory === 'All' || (cause.category && cause.category.name === activeCategory);
-        const searchMatch = (cause.title && cause.title.toLowerCase().includes(searchTerm.toLowerCase())) || 
-                              (cause.description && cause.description.toLowerCase().includes(searchTerm.toLowerCase()));
-        return categoryMatch && searchMatch;
-    });
+    // Wait for a pause in typing before asking the server to search
+    useEffect(() => {
+        const timer = setTimeout(() => setQuery(searchTerm.trim()), 300);
+        return () => clearTimeout(timer);
+    }, [searchTerm]);
+
+    // Filtering happens on the server so only the page being shown is downloaded
+    const params = {
+        ...(activeCategory !== 'All' ? { category: activeCategory } : {}),
+        ...(query ? { q: query } : {})
+    };
+    const { rows: causes, hasMore, loading, loadingMore, error, loadMore } = usePagedList(
+        query ? '/causes/search' : '/causes/approved',
+        { params }
+    );
 
     return (
         <div className="bg-slate-50 font-sans">
@@ -130,15 +124,18 @@ export default function CausesPage() {
                 </div>
                 
                 {loading && <div className="text-center py-20">Loading Causes...</div>}
-                {error && <div className="text-center py-20 text-red-600">{error}</div>}
+                {error && <div className="text-center py-20 text-red-600">Failed to load causes. Please try again later.</div>}
                 
                 {!loading && !error && (
-                    filteredCauses.length > 0 ? (
-                        <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
-                            {filteredCauses.map((cause) => (
-                                <CauseCard key={cause.id} cause={cause} />
-                            ))}
-                        </div>
+                    causes.length > 0 ? (
+                        <>
+                            <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8">
+                                {causes.map((cause) => (
+                                    <CauseCard key={cause.id} cause={cause} />
+                                ))}
+                            </div>
+                            <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
+                        </>
                     ) : (
                         <div className="text-center py-20">
                             <h3 className="text-2xl font-semibold text-gray-700">No Causes Found</h3>
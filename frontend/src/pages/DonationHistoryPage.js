@@ -1,31 +1,14 @@
-import React, { useState, useEffect } from 'react';
+import React from 'react';
 import { useAuth } from '../context/AuthContext';
-import api from '../api/axios';
+import { usePagedList } from '../api/pagination';
+import LoadMoreButton from '../components/common/LoadMoreButton';
 
 export default function DonationHistoryPage() {
     const { user } = useAuth();
-    const [donations, setDonations] = useState([]);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState('');
-
-    useEffect(() => {
-        const fetchDonations = async () => {
-            if (!user?.token) return;
-            try {
-                setLoading(true);
-                const response = await api.get('/donors/my-donations', {
-                    headers: { Authorization: `Bearer ${user.token}` }
-                });
-                setDonations(response.data);
-            } catch (err) {
-                setError('Failed to load donation history.');
-                console.error(err);
-            } finally {
-                setLoading(false);
-            }
-        };
-        fetchDonations();
-    }, [user]);
+    const { rows: donations, hasMore, loading, loadingMore, error, loadMore } = usePagedList('/donors/my-donations', {
+        token: user?.token,
+        enabled: Boolean(user?.token)
+    });
 
     return (
         <div className="bg-slate-50 font-sans min-h-screen">
@@ -42,7 +25,7 @@ export default function DonationHistoryPage() {
 
             <main className="container mx-auto px-4 sm:px-6 lg:px-8 py-12">
                 <div className="bg-white p-6 rounded-2xl shadow-lg border">
-                    {error && <div className="text-red-500 text-center mb-4">{error}</div>}
+                    {error && <div className="text-red-500 text-center mb-4">Failed to load donation history.</div>}
                     <div className="overflow-x-auto">
                         <table className="w-full text-sm text-left text-gray-500">
                             <thead className="text-xs text-gray-700 uppercase bg-gray-50">
@@ -69,6 +52,7 @@ export default function DonationHistoryPage() {
                             </tbody>
                         </table>
                     </div>
+                    <LoadMoreButton hasMore={hasMore} loading={loadingMore} onClick={loadMore} />
                 </div>
             </main>
         </div>
@@ -73,8 +73,8 @@ export default function HomePage() {
         const fetchCauses = async () => {
             try {
                 setLoading(true);
-                const response = await api.get('/causes/approved');
-                setFeaturedCauses(response.data.slice(0, 3)); // Get first 3 for featured section
+                const response = await api.get('/causes/approved', { params: { limit: 3 } });
+                setFeaturedCauses(response.data); // First 3 for featured section
             } catch (err) {
                 setError('Failed to load featured causes.');
                 console.error(err);